@@ -0,0 +1,86 @@
+"""
+Benchmark for the adaptive limit on requests in flight.
+
+Runs Order.place_orders, sent concurrently with ordered_nonces=False,
+against a LocalRestServer that can process a fixed number of requests
+at once. Requests beyond that queue up, and when the queue is full the
+server answers with a 429. Compares fixed
+worker counts with an AdaptiveLimiter, which should settle near the
+server's capacity: most of the throughput of the best fixed setting
+with few 429s.
+
+Usage:
+    python benchmarks/bench_adaptive_limiter.py
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+from gemini_api.rate_limit import AdaptiveLimiter, RateLimiter
+from gemini_api.testing import LocalRestServer
+
+ORDERS = 1000
+CAPACITY = 8
+QUEUE = 8
+SERVICE_TIME = 0.005
+
+
+class Capacity:
+    def __init__(self) -> None:
+        self.slots = threading.Semaphore(CAPACITY)
+        self.lock = threading.Lock()
+        self.waiting = 0
+
+    def __call__(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        with self.lock:
+            if self.waiting >= CAPACITY + QUEUE:
+                return 429, {"result": "error", "reason": "RateLimited"}
+            self.waiting += 1
+        try:
+            with self.slots:
+                time.sleep(SERVICE_TIME)
+        finally:
+            with self.lock:
+                self.waiting -= 1
+        return 200, {"order_id": "1", "is_live": True}
+
+
+def run(
+    server: LocalRestServer,
+    workers: int,
+    limiter: Optional[AdaptiveLimiter] = None,
+) -> None:
+    auth = Authentication(
+        "key",
+        "secret",
+        url=server.url,
+        millisecond_nonce=True,
+        ordered_nonces=False,
+        rate_limiter=RateLimiter(rate=1e6),
+        concurrency=limiter,
+    )
+    spec = {"symbol": "btcusd", "amount": "1", "price": "1", "side": "buy"}
+    start = time.perf_counter()
+    results = Order.place_orders(auth, [spec] * ORDERS, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    failed = sum(result.error is not None for result in results)
+    name = f"fixed {workers}" if limiter is None else "adaptive"
+    extra = "" if limiter is None else f" final limit={limiter.limit}"
+    print(
+        f"{name:<10} {ORDERS / elapsed:8.0f} orders/s "
+        f"429s={failed:4d}{extra}"
+    )
+
+
+def main() -> None:
+    with LocalRestServer({"/v1/order/new": Capacity()}) as server:
+        for workers in (2, CAPACITY, 32, 64):
+            run(server, workers)
+        run(server, 64, AdaptiveLimiter(max_limit=64))
+
+
+if __name__ == "__main__":
+    main()
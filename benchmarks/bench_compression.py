@@ -0,0 +1,172 @@
+"""
+Benchmark for compressed response encodings.
+
+Fetches large /v1/book, /v1/trades, /v2/candles and /v1/mytrades
+responses from a LocalRestServer compressing its bodies with each
+supported encoding, on loopback and over a simulated 40 Mbit/s link.
+Reports the bytes on the wire and after decompression, as counted in
+the instrumentation, and the time per request, which includes the
+server compressing every body.
+
+Usage:
+    python benchmarks/bench_compression.py
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from gemini_api.authentication import Authentication
+from gemini_api.compression import (
+    ENCODING_IDENTITY,
+    payload_sizes,
+    supported_encodings,
+)
+from gemini_api.endpoints.order import Order
+from gemini_api.endpoints.public import Public
+from gemini_api.instrumentation import Instrumentation
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.testing import LocalRestServer
+
+ROUNDS = 20
+BANDWIDTHS = [None, 5e6]
+
+
+def levels(count: int, start: float, step: float) -> List[Dict[str, str]]:
+    return [
+        {
+            "price": f"{start + i * step:.2f}",
+            "amount": f"{random.uniform(0, 5):.8f}",
+            "timestamp": "1547232911",
+        }
+        for i in range(count)
+    ]
+
+
+def trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "timestamp": 1547232911 + i,
+            "timestampms": 1547232911021 + i * 1000,
+            "tid": 107317526 + i,
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "exchange": "gemini",
+            "type": random.choice(["buy", "sell"]),
+        }
+        for i in range(count)
+    ]
+
+
+def candles(count: int) -> List[List[float]]:
+    return [
+        [
+            1559755800000 + i * 60000,
+            round(random.uniform(20000, 30000), 2),
+            round(random.uniform(20000, 30000), 2),
+            round(random.uniform(20000, 30000), 2),
+            round(random.uniform(20000, 30000), 2),
+            round(random.uniform(0, 100), 8),
+        ]
+        for i in range(count)
+    ]
+
+
+def my_trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "timestamp": 1547232911 + i,
+            "timestampms": 1547232911021 + i * 1000,
+            "type": random.choice(["Buy", "Sell"]),
+            "aggressor": random.random() < 0.5,
+            "fee_currency": "USD",
+            "fee_amount": f"{random.uniform(0, 5):.8f}",
+            "tid": 107317526 + i,
+            "order_id": str(107317524 + i),
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": "BTCUSD",
+        }
+        for i in range(count)
+    ]
+
+
+def routes() -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    book = {
+        "bids": levels(500, 25000, -0.01),
+        "asks": levels(500, 25000.01, 0.01),
+    }
+    history = trades(500)
+    minutes = candles(1440)
+    fills = my_trades(500)
+    return {
+        "/v1/book/btcusd": lambda request: book,
+        "/v1/trades/btcusd": lambda request: history,
+        "/v2/candles/btcusd/1m": lambda request: minutes,
+        "/v1/mytrades": lambda request: fills,
+    }
+
+
+def run(encoding: str, bandwidth: Optional[float]) -> None:
+    compression = [] if encoding == ENCODING_IDENTITY else [encoding]
+    with LocalRestServer(
+        routes(), compression=compression, bandwidth=bandwidth
+    ) as server:
+        instrumentation = Instrumentation()
+        public = Public(
+            url=server.url + "/v1",
+            compression=compression,
+            instrumentation=instrumentation,
+        )
+        auth = Authentication(
+            "key",
+            "secret",
+            url=server.url,
+            millisecond_nonce=True,
+            rate_limiter=RateLimiter(rate=1e6),
+            compression=compression,
+            instrumentation=instrumentation,
+        )
+        calls = {
+            "/v1/book": lambda: public.get_order_book("btcusd"),
+            "/v1/trades": lambda: public.get_trades_history("btcusd"),
+            "/v2/candles": lambda: public.get_candles("btcusd", "1m"),
+            "/v1/mytrades": lambda: Order.get_past_trades(
+                auth, "btcusd", raw=True
+            ),
+        }
+        elapsed = {}
+        for endpoint, call in calls.items():
+            call()
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                call()
+            elapsed[endpoint] = (time.perf_counter() - start) / ROUNDS
+        sizes = payload_sizes(instrumentation)
+        for endpoint in calls:
+            size = sizes[endpoint]
+            print(
+                f"  {endpoint:<14} {encoding:<9}"
+                f" {size.wire_bytes / size.responses / 1e3:8.1f}kB wire"
+                f" {size.decoded_bytes / size.responses / 1e3:8.1f}kB"
+                f" decoded {size.ratio:5.1f}x"
+                f" {elapsed[endpoint] * 1000:8.2f}ms"
+            )
+
+
+def main() -> None:
+    encodings = [ENCODING_IDENTITY] + list(supported_encodings())
+    for bandwidth in BANDWIDTHS:
+        if bandwidth is None:
+            print("loopback")
+        else:
+            print(f"{bandwidth * 8 / 1e6:.0f} Mbit/s")
+        for encoding in encodings:
+            run(encoding, bandwidth)
+
+
+if __name__ == "__main__":
+    main()
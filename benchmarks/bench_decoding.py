@@ -0,0 +1,104 @@
+"""
+Benchmark for decoding response bodies.
+
+Decodes a 500 trade /v1/mytrades page and a 5000 level order book with
+requests' Response.json() and every Decoder mode, and reports the
+throughput of each.
+
+Usage:
+    python benchmarks/bench_decoding.py
+"""
+
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Any, Callable
+
+import requests
+
+from gemini_api.decoding import (
+    BACKEND_JSON,
+    BACKEND_ORJSON,
+    Decoder,
+    orjson,
+    scaled_integer,
+)
+
+ROUNDS = 50
+
+
+def trades_page() -> bytes:
+    trades = [
+        {
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "timestamp": 1547232911,
+            "timestampms": 1547232911021,
+            "type": random.choice(["Buy", "Sell"]),
+            "aggressor": random.random() < 0.5,
+            "fee_currency": "USD",
+            "fee_amount": f"{random.uniform(0, 5):.8f}",
+            "tid": 107317526 + i,
+            "order_id": "107317524",
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": "BTCUSD",
+        }
+        for i in range(500)
+    ]
+    return json.dumps(trades).encode()
+
+
+def order_book() -> bytes:
+    def levels(start: float, step: float) -> Any:
+        return [
+            {
+                "price": f"{start + i * step:.2f}",
+                "amount": f"{random.uniform(0, 5):.8f}",
+                "timestamp": "1547147541",
+            }
+            for i in range(2500)
+        ]
+
+    book = {"bids": levels(25000, -0.01), "asks": levels(25000.01, 0.01)}
+    return json.dumps(book).encode()
+
+
+def response_json(body: bytes) -> Callable[[], Any]:
+    response = requests.Response()
+    response._content = body
+    response.encoding = "utf-8"
+    return response.json
+
+
+def report(name: str, body: bytes, decode: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decode()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(
+        f"  {name:<28} {elapsed * 1000:7.2f}ms "
+        f"{len(body) / elapsed / 1e6:7.1f}MB/s"
+    )
+
+
+def main() -> None:
+    decoders = {
+        "Decoder(json)": Decoder(backend=BACKEND_JSON),
+        "Decoder(Decimal)": Decoder(Decimal),
+        "Decoder(scaled_integer(8))": Decoder(scaled_integer(8)),
+    }
+    if orjson is not None:
+        decoders["Decoder(orjson)"] = Decoder(backend=BACKEND_ORJSON)
+
+    for name, body in (("mytrades", trades_page()), ("book", order_book())):
+        print(f"{name} ({len(body) / 1e3:.0f}kB)")
+        report("Response.json()", body, response_json(body))
+        for decoder_name, decoder in decoders.items():
+            report(decoder_name, body, lambda: decoder.decode(body))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for hedged public requests.
+
+Polls Public.get_ticker against a LocalRestServer whose latency is
+usually short with an occasional long stall, with and without a
+HedgePolicy, and reports the latency percentiles and the extra requests
+the hedges cost.
+
+Usage:
+    python benchmarks/bench_hedging.py
+"""
+
+import random
+import statistics
+import time
+from typing import List, Optional
+
+from gemini_api.endpoints.public import Public
+from gemini_api.hedging import HedgePolicy
+from gemini_api.testing import LocalRestServer
+
+ROUNDS = 1000
+FAST = 0.002
+SLOW = 0.050
+SLOW_SHARE = 0.03
+
+
+def jitter() -> float:
+    if random.random() < SLOW_SHARE:
+        return SLOW
+    return random.uniform(FAST, FAST * 1.5)
+
+
+def percentile(latencies: List[float], share: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * share))]
+
+
+def run(server: LocalRestServer, hedge: Optional[HedgePolicy]) -> None:
+    public = Public(url=server.url + "/v1", hedge=hedge)
+    sent = len(server.requests)
+    latencies = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        public.get_ticker("btcusd")
+        latencies.append(time.perf_counter() - start)
+    extra = (len(server.requests) - sent) / ROUNDS - 1
+    latencies.sort()
+    print(
+        f"{'hedged' if hedge else 'plain':<8} "
+        f"p50={statistics.median(latencies) * 1000:6.2f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:6.2f}ms "
+        f"p99.9={percentile(latencies, 0.999) * 1000:6.2f}ms "
+        f"extra requests={extra:.1%}"
+    )
+
+
+def main() -> None:
+    routes = {"/v1/pubticker/btcusd": lambda request: {"bid": "1"}}
+    with LocalRestServer(routes, latency=jitter) as server:
+        run(server, None)
+        hedge = HedgePolicy(percentile=0.95, budget=0.1)
+        run(server, hedge)
+        hedge.shutdown()
+
+
+if __name__ == "__main__":
+    main()
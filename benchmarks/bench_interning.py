@@ -0,0 +1,108 @@
+"""
+Benchmark for interning repeated strings in large result lists.
+
+Decodes 100k-record /v1/mytrades and /v1/transfers histories, builds
+Order and FundManagement objects from them and drops the decoded
+records, with and without interning the low-cardinality fields of
+gemini_api.models.INTERNED_KEYS. Reports the memory the objects hold,
+measured with tracemalloc, and the time to build them.
+
+Usage:
+    python benchmarks/bench_interning.py
+"""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from gemini_api.decoding import Decoder
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.endpoints.order import Order
+from gemini_api.models import INTERNED_KEYS, set_interned_keys
+
+RECORDS = 100000
+SYMBOLS = ["BTCUSD", "ETHUSD", "SOLUSD", "ETHBTC", "LTCUSD"]
+CURRENCIES = ["USD", "BTC", "ETH", "SOL", "GUSD"]
+
+
+def trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "timestamp": 1547232911 + i,
+            "timestampms": 1547232911021 + i * 1000,
+            "type": random.choice(["Buy", "Sell"]),
+            "aggressor": random.random() < 0.5,
+            "fee_currency": "USD",
+            "fee_amount": f"{random.uniform(0, 5):.8f}",
+            "tid": 107317526 + i,
+            "order_id": str(107317524 + i),
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": random.choice(SYMBOLS),
+        }
+        for i in range(count)
+    ]
+
+
+def transfers(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": random.choice(["Deposit", "Withdrawal"]),
+            "status": random.choice(["Advanced", "Complete"]),
+            "timestampms": 1507913541275 + i * 1000,
+            "eid": 320013281 + i,
+            "currency": random.choice(CURRENCIES),
+            "amount": f"{random.uniform(0, 1000):.2f}",
+            "method": random.choice(["ACH", "Wire", "CreditCard"]),
+        }
+        for i in range(count)
+    ]
+
+
+def measure(body: bytes, build: Callable[[Any], List[Any]]) -> None:
+    decoder = Decoder()
+    records = decoder.decode(body)
+    start = time.perf_counter()
+    build(records)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    records = decoder.decode(body)
+    objects = build(records)
+    del records
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    print(f"    {size / 1e6:7.2f}MB held, built in {elapsed * 1000:6.1f}ms")
+
+
+def main() -> None:
+    histories = {
+        "/v1/mytrades": (
+            json.dumps(trades(RECORDS)).encode(),
+            lambda page: [Order(None, row) for row in page],
+        ),
+        "/v1/transfers": (
+            json.dumps(transfers(RECORDS)).encode(),
+            lambda page: [FundManagement(None, row) for row in page],
+        ),
+    }
+    for path, (body, build) in histories.items():
+        print(f"{path} ({RECORDS} records)")
+        for name, keys in (("not interned", ()), ("interned", INTERNED_KEYS)):
+            set_interned_keys(keys)
+            print(f"  {name}")
+            measure(body, build)
+    set_interned_keys(INTERNED_KEYS)
+
+
+if __name__ == "__main__":
+    main()
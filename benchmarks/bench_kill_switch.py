@@ -0,0 +1,96 @@
+"""
+Benchmark for the end-to-end latency of cancelling every active order.
+
+Runs against a LocalRestServer and compares:
+- Order.cancel_active_orders on a new Authentication object (cold
+  connection)
+- Order.cancel_active_orders while reporting traffic has drained the
+  rate limiter (queued behind other requests)
+- KillSwitch.fire on a warm dedicated connection
+
+The local server speaks plain HTTP, so the cold case does not include
+the TLS handshake it would pay against Gemini.
+
+Usage:
+    python benchmarks/bench_kill_switch.py
+"""
+
+import statistics
+import threading
+import time
+from typing import Callable, List
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+from gemini_api.kill_switch import KillSwitch
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.testing import LocalRestServer
+
+ROUNDS = 50
+CANCELLED = {"result": "ok", "details": {"cancelledOrders": [1, 2, 3]}}
+
+
+def measure(call: Callable[[], object], rounds: int = ROUNDS) -> List[float]:
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<28} p50={statistics.median(latencies) * 1000:7.2f}ms "
+        f"p99={p99 * 1000:7.2f}ms"
+    )
+
+
+def main() -> None:
+    routes = {
+        "/v1/order/cancel/all": lambda request: CANCELLED,
+        "/v1/pubticker/btcusd": lambda request: {"bid": "1", "ask": "2"},
+        "/v1/mytrades": lambda request: [],
+    }
+    with LocalRestServer(routes, latency=0.002) as server:
+
+        def cold() -> None:
+            auth = Authentication("key", "secret", url=server.url)
+            Order.cancel_active_orders(auth)
+
+        report("cold cancel_active_orders", measure(cold))
+
+        auth = Authentication(
+            "key",
+            "secret",
+            url=server.url,
+            millisecond_nonce=True,
+            rate_limiter=RateLimiter(rate=200, burst=1),
+        )
+        stop = threading.Event()
+
+        def reporting() -> None:
+            while not stop.is_set():
+                auth.make_request("/v1/mytrades", {"symbol": "btcusd"})
+
+        workers = [threading.Thread(target=reporting) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        report(
+            "queued cancel_active_orders",
+            measure(lambda: Order.cancel_active_orders(auth)),
+        )
+
+        switch = KillSwitch(auth, health_interval=1.0)
+        switch.start()
+        report("warm KillSwitch.fire", measure(switch.fire))
+        stop.set()
+        for worker in workers:
+            worker.join()
+        switch.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Benchmark for the constructors of model classes.
+
+Builds Order objects from a page of /v1/mytrades records and
+FundManagement objects from a page of /v1/transfers records with the
+constructors generated by gemini_api.models.model_init, and with the
+hand-written constructors they replaced, and reports the best time
+per page.
+
+Usage:
+    python benchmarks/bench_model_init.py
+"""
+
+import gc
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.endpoints.order import Order
+
+ROUNDS = 20
+RECORDS = 50000
+
+
+class HandWrittenOrder(Order):
+    __slots__ = ()
+
+    def __init__(
+        self, auth: Optional[Authentication], order_data: Dict[Any, Any]
+    ) -> None:
+        """
+        Initialise Order with the constructor replaced by model_init
+        """
+        if "order_id" in order_data:
+            if isinstance(order_data["order_id"], str):
+                self._order_id: Union[str, Dict[int, bool]] = order_data[
+                    "order_id"
+                ]
+            else:
+                if isinstance(order_data["order_id"], dict):
+                    self._order_id = list(order_data["order_id"].keys())[0]
+                    self._is_cancelled: bool = list(
+                        order_data["order_id"].values()
+                    )[0]
+        if "orderId" in order_data:
+            self._order_id = order_data["orderId"]
+        if "id" in order_data:
+            self._id: str = order_data["id"]
+        if "client_order_id" in order_data:
+            self._client_order_id: str = order_data["client_order_id"]
+        if "symbol" in order_data:
+            self._symbol: str = order_data["symbol"]
+        if "exchange" in order_data:
+            self._exchange: str = order_data["exchange"]
+        if "avg_execution_price" in order_data:
+            self._avg_execution_price: str = order_data["avg_execution_price"]
+        if "side" in order_data:
+            self._side: str = order_data["side"]
+        if "type" in order_data:
+            self._order_type: str = order_data["type"]
+        if "timestamp" in order_data:
+            self._timestamp: str = order_data["timestamp"]
+        if "timestampms" in order_data:
+            self._timestampms: int = order_data["timestampms"]
+        if "trades" in order_data:
+            self._trades: List[Dict[str, Union[str, Any]]] = order_data[
+                "trades"
+            ]
+        if "is_live" in order_data:
+            self._is_live: bool = order_data["is_live"]
+        if "is_cancelled" in order_data:
+            self._is_cancelled = order_data["is_cancelled"]
+        if "is_hidden" in order_data:
+            self._is_hidden: bool = order_data["is_hidden"]
+        if "was_forced" in order_data:
+            self._was_forced: bool = order_data["was_forced"]
+        if "executed_amount" in order_data:
+            self._executed_amount: float = order_data["executed_amount"]
+        if "remaining_amount" in order_data:
+            self._remaining_amount: str = order_data["remaining_amount"]
+        if "options" in order_data:
+            self._options: List[str] = order_data["options"]
+        if "price" in order_data:
+            self._price: str = order_data["price"]
+        if "original_amount" in order_data:
+            self._original_amount: str = order_data["original_amount"]
+        if "pair" in order_data:
+            self._pair: str = order_data["pair"]
+        if "priceCurrency" in order_data:
+            self._price_currency: str = order_data["priceCurrency"]
+        if "quantity" in order_data:
+            self._quantity: str = order_data["quantity"]
+        if "quantityCurrency" in order_data:
+            self._quantity_currency: str = order_data["quantityCurrency"]
+        if "totalSpend" in order_data:
+            self._total_spend: str = order_data["totalSpend"]
+        if "totalSpendCurrency" in order_data:
+            self._total_spend_currency: str = order_data["totalSpendCurrency"]
+        if "fee" in order_data:
+            self._fee: str = order_data["fee"]
+        if "feeCurrency" in order_data:
+            self._fee_currency: str = order_data["feeCurrency"]
+        if "fee_currency" in order_data:
+            self._fee_currency = order_data["fee_currency"]
+        if "depositFee" in order_data:
+            self._deposit_fee: str = order_data["depositFee"]
+        if "depositFeeCurrency" in order_data:
+            self._deposit_fee_currency: str = order_data["depositFeeCurrency"]
+        if "amount" in order_data:
+            self._amount: float = order_data["amount"]
+        if "aggressor" in order_data:
+            self._aggressor: bool = order_data["aggressor"]
+        if "fee_amount" in order_data:
+            self._fee_amount: str = order_data["fee_amount"]
+        if "tid" in order_data:
+            self._trade_id: int = order_data["tid"]
+        if "is_auction_fill" in order_data:
+            self._is_auction_fill: bool = order_data["is_auction_fill"]
+        if "is_clearing_fill" in order_data:
+            self._is_clearing_fill: bool = order_data["is_clearing_fill"]
+        if "break" in order_data:
+            self._break_type: str = order_data["break"]
+        if "result" in order_data:
+            self._result: str = order_data["result"]
+        if "reason" in order_data:
+            self._reason: str = order_data["reason"]
+        if "message" in order_data:
+            self._message: str = order_data["message"]
+
+
+class HandWrittenFundManagement(FundManagement):
+    __slots__ = ()
+
+    def __init__(
+        self, auth: Authentication, fund_data: Union[Dict[str, Any], Any]
+    ) -> None:
+        """
+        Initialise FundManagement with the constructor replaced by
+        model_init
+        """
+        if "currency" in fund_data:
+            self._currency: str = fund_data["currency"]
+        if "amount" in fund_data:
+            self._amount: float = fund_data["amount"]
+        if "available" in fund_data:
+            self._available: float = fund_data["available"]
+        if "availableForWithdrawal" in fund_data:
+            self._availableForWithdrawal: float = fund_data[
+                "availableForWithdrawal"
+            ]
+        if "type" in fund_data:
+            self._type: str = fund_data["type"]
+        if "amountNotional" in fund_data:
+            self._amountNotional: float = fund_data["amountNotional"]
+        if "availableNotional" in fund_data:
+            self._availableNotional: float = fund_data["availableNotional"]
+        if "availableForWithdrawalNotional" in fund_data:
+            self._availableForWithdrawalNotional: float = fund_data[
+                "availableForWithdrawalNotional"
+            ]
+        if "status" in fund_data:
+            self._status: str = fund_data["status"]
+        if "timestampms" in fund_data:
+            self._timestampms: int = fund_data["timestampms"]
+        if "eid" in fund_data:
+            self._eid: int = fund_data["eid"]
+        if "advanceEid" in fund_data:
+            self._advanceEid: int = fund_data["advanceEid"]
+        if "feeAmount" in fund_data:
+            self._feeAmount: int = fund_data["feeAmount"]
+        if "feeCurrency" in fund_data:
+            self._feeCurrency: str = fund_data["feeCurrency"]
+        if "method" in fund_data:
+            self._method: str = fund_data["method"]
+        if "txHash" in fund_data:
+            self._txHash: str = fund_data["txHash"]
+        if "outputIdx" in fund_data:
+            self._outputidx: int = fund_data["outputidx"]
+        if "destination" in fund_data:
+            self._destination: str = fund_data["destination"]
+        if "purpose" in fund_data:
+            self._purpose: str = fund_data["purpose"]
+        if "txTime" in fund_data:
+            self._txTime: str = fund_data["txTime"]
+        if "eventType" in fund_data:
+            self._eventType: str = fund_data["eventType"]
+        if "address" in fund_data:
+            self._address: str = fund_data["address"]
+        if "label" in fund_data:
+            self._label: str = fund_data["label"]
+        if "network" in fund_data:
+            self._network: str = fund_data["network"]
+        if "fee" in fund_data:
+            if isinstance(fund_data["fee"], dict):
+                self._fee: Dict[str, str] = fund_data["fee"]["value"]
+            else:
+                self._fee = fund_data["fee"]
+        if "withdrawalID" in fund_data:
+            self._withdrawalID: str = fund_data["withdrawalID"]
+        if "isOverride" in fund_data:
+            self._isOverride: bool = fund_data["isOverride"]
+        if "monthlyLimit" in fund_data:
+            self._monthlyLimit: int = fund_data["monthlyLimit"]
+        if "montlyRemaining" in fund_data:
+            self._monthlyRemaining: int = fund_data["montlyRemaining"]
+        if "referenceId" in fund_data:
+            self._referenceId: str = fund_data["referenceId"]
+        if "balances" in fund_data:
+            self._balances: List[Dict[str, str]] = fund_data["balances"]
+        if "banks" in fund_data:
+            self._banks: List[Dict[str, str]] = fund_data["banks"]
+        if "result" in fund_data:
+            self._result: str = fund_data["result"]
+        if "reason" in fund_data:
+            self._reason: str = fund_data["reason"]
+        if "message" in fund_data:
+            self._message: str = fund_data["message"]
+        if "fromAccount" in fund_data:
+            self._fromAccount: str = fund_data["fromAccount"]
+        if "toAccount" in fund_data:
+            self._toAccount: str = fund_data["toAccount"]
+        if "uuid" in fund_data:
+            self._uuid: str = fund_data["uuid"]
+
+
+def trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "price": "3633.00",
+            "amount": "0.00001",
+            "timestamp": 1547232911,
+            "timestampms": 1547232911021,
+            "type": "Buy",
+            "aggressor": True,
+            "fee_currency": "USD",
+            "fee_amount": "0.00181650",
+            "tid": 107317526 + i,
+            "order_id": "107317524",
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": "BTCUSD",
+        }
+        for i in range(count)
+    ]
+
+
+def transfers(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "Deposit",
+            "status": "Advanced",
+            "timestampms": 1507913541275,
+            "eid": 320013281 + i,
+            "currency": "USD",
+            "amount": "36.00",
+            "method": "ACH",
+        }
+        for i in range(count)
+    ]
+
+
+def report(name: str, build: Callable[[], Any]) -> float:
+    times = []
+    for _ in range(ROUNDS):
+        gc.collect()
+        start = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start)
+    elapsed = min(times)
+    print(f"  {name:<28} {elapsed * 1000:7.2f}ms")
+    return elapsed
+
+
+def main() -> None:
+    page = trades(RECORDS)
+    print(f"Order ({RECORDS} trades)")
+    before = report(
+        "hand-written", lambda: [HandWrittenOrder(None, r) for r in page]
+    )
+    after = report("model_init", lambda: [Order(None, r) for r in page])
+    print(f"  {before / after:.2f}x faster")
+
+    page = transfers(RECORDS)
+    print(f"FundManagement ({RECORDS} transfers)")
+    before = report(
+        "hand-written",
+        lambda: [HandWrittenFundManagement(None, r) for r in page],
+    )
+    after = report(
+        "model_init", lambda: [FundManagement(None, r) for r in page]
+    )
+    print(f"  {before / after:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark for diffing successive order book polls.
+
+Compares SnapshotDiffer against rebuilding price -> amount dictionaries
+for every poll, on books of increasing depth with a small fraction of
+levels changing between polls.
+
+Usage:
+    python benchmarks/bench_order_book_diff.py
+"""
+
+import random
+import timeit
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from gemini_api.order_book import OrderBook, SnapshotDiffer
+
+Snapshot = Dict[str, List[Dict[str, str]]]
+
+
+def make_snapshot(depth: int, seed: int) -> Snapshot:
+    rng = random.Random(seed)
+    bids = [
+        {"price": f"{20000 - i * 0.01:.2f}", "amount": f"{rng.random():.8f}"}
+        for i in range(depth)
+    ]
+    asks = [
+        {
+            "price": f"{20000.01 + i * 0.01:.2f}",
+            "amount": f"{rng.random():.8f}",
+        }
+        for i in range(depth)
+    ]
+    return {"bids": bids, "asks": asks}
+
+
+def mutate(snapshot: Snapshot, fraction: float, seed: int) -> Snapshot:
+    rng = random.Random(seed)
+    new = {
+        side: [dict(level) for level in snapshot[side]] for side in snapshot
+    }
+    for side in new:
+        levels = new[side]
+        for _ in range(max(1, int(len(levels) * fraction))):
+            idx = rng.randrange(len(levels))
+            if rng.random() < 0.2:
+                del levels[idx]
+            else:
+                levels[idx]["amount"] = f"{rng.random():.8f}"
+    return new
+
+
+def dict_rebuild_diff(old: Snapshot, new: Snapshot) -> List[Tuple[Any, ...]]:
+    changes = []
+    for side in ("bids", "asks"):
+        before = {
+            Decimal(level["price"]): Decimal(level["amount"])
+            for level in old[side]
+        }
+        after = {
+            Decimal(level["price"]): Decimal(level["amount"])
+            for level in new[side]
+        }
+        for price, amount in after.items():
+            if before.get(price) != amount:
+                changes.append((side, price, amount))
+        for price in before.keys() - after.keys():
+            changes.append((side, price, Decimal(0)))
+    return changes
+
+
+def main() -> None:
+    for depth in (500, 5000, 50000):
+        old = make_snapshot(depth, seed=1)
+        new = mutate(old, fraction=0.01, seed=2)
+        number = 20 if depth < 50000 else 3
+
+        differ = SnapshotDiffer()
+        differ.diff(old)
+        book = OrderBook.from_snapshot("btcusd", old)
+
+        def merge() -> None:
+            # two polls per call, alternating between the snapshots
+            book.apply_changes(differ.diff(new))
+            book.apply_changes(differ.diff(old))
+
+        rebuild = timeit.timeit(
+            lambda: dict_rebuild_diff(old, new), number=number
+        )
+        merged = timeit.timeit(merge, number=number)
+        changes = len(differ.diff(new))
+        differ.diff(old)
+
+        print(
+            f"depth={depth:>6} changes/poll={changes:>5} "
+            f"dict rebuild={rebuild / number * 1000:8.2f}ms "
+            f"sorted merge+apply={merged / number / 2 * 1000:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for field projection of large responses.
+
+Builds Order objects from a page of /v1/mytrades records and
+FundManagement objects from a page of /v1/transfers records, and named
+tuples holding three or four of their fields, and reports the time to
+build each and the memory they hold, measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_projection.py
+"""
+
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.endpoints.order import Order
+from gemini_api.projection import project
+
+ROUNDS = 20
+RECORDS = 50000
+
+
+def trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "timestamp": 1547232911,
+            "timestampms": 1547232911021,
+            "type": random.choice(["Buy", "Sell"]),
+            "aggressor": random.random() < 0.5,
+            "fee_currency": "USD",
+            "fee_amount": f"{random.uniform(0, 5):.8f}",
+            "tid": 107317526 + i,
+            "order_id": "107317524",
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": "BTCUSD",
+        }
+        for i in range(count)
+    ]
+
+
+def transfers(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": random.choice(["Deposit", "Withdrawal"]),
+            "status": "Complete",
+            "timestampms": 1507913541275,
+            "eid": 320013281 + i,
+            "currency": "USD",
+            "amount": f"{random.uniform(0, 1000):.2f}",
+            "method": "ACH",
+            "destination": "0x0",
+            "purpose": "Transfer",
+        }
+        for i in range(count)
+    ]
+
+
+def report(name: str, build: Callable[[], List[Any]]) -> None:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        build()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+    print(f"  {name:<40} {elapsed * 1000:7.2f}ms {size / 1e6:7.2f}MB")
+
+
+def main() -> None:
+    page = trades(RECORDS)
+    print(f"/v1/mytrades ({RECORDS} records)")
+    report("Order objects", lambda: [Order(None, row) for row in page])
+    report(
+        'fields=["price", "amount", "timestamp"]',
+        lambda: project(page, ["price", "amount", "timestamp"]),
+    )
+
+    page = transfers(RECORDS)
+    print(f"/v1/transfers ({RECORDS} records)")
+    report(
+        "FundManagement objects",
+        lambda: [FundManagement(None, row) for row in page],
+    )
+    report(
+        'fields=["currency", "amount", ...]',
+        lambda: project(page, ["currency", "amount", "type", "timestampms"]),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark for raw mode endpoint calls.
+
+Calls Order.get_past_trades and FundManagement.get_transfers for large
+pages served by a LocalRestServer, building objects, in raw mode and
+as undecoded bytes, and reports the time per call. Building objects
+from already decoded pages is timed on its own, without the network.
+
+Usage:
+    python benchmarks/bench_raw_mode.py
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.endpoints.order import Order
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.testing import LocalRestServer
+
+ROUNDS = 50
+RECORDS = 5000
+
+
+def trades(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "price": f"{random.uniform(20000, 30000):.2f}",
+            "amount": f"{random.uniform(0, 2):.8f}",
+            "timestamp": 1547232911,
+            "timestampms": 1547232911021,
+            "type": random.choice(["Buy", "Sell"]),
+            "aggressor": random.random() < 0.5,
+            "fee_currency": "USD",
+            "fee_amount": f"{random.uniform(0, 5):.8f}",
+            "tid": 107317526 + i,
+            "order_id": "107317524",
+            "exchange": "gemini",
+            "is_auction_fill": False,
+            "is_clearing_fill": False,
+            "symbol": "BTCUSD",
+        }
+        for i in range(count)
+    ]
+
+
+def transfers(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": random.choice(["Deposit", "Withdrawal"]),
+            "status": "Complete",
+            "timestampms": 1507913541275,
+            "eid": 320013281 + i,
+            "currency": "USD",
+            "amount": f"{random.uniform(0, 1000):.2f}",
+            "method": "ACH",
+            "destination": "0x0",
+            "purpose": "Transfer",
+        }
+        for i in range(count)
+    ]
+
+
+def report(name: str, call: Callable[[], Any]) -> float:
+    call()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        call()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"  {name:<24} {elapsed * 1000:7.2f}ms")
+    return elapsed
+
+
+def main() -> None:
+    pages = {
+        "/v1/mytrades": trades(RECORDS),
+        "/v1/transfers": transfers(RECORDS),
+    }
+    routes = {
+        "/v1/mytrades": lambda request: pages["/v1/mytrades"],
+        "/v1/transfers": lambda request: pages["/v1/transfers"],
+    }
+
+    with LocalRestServer(routes) as server:
+        auth = Authentication(
+            "key",
+            "secret",
+            url=server.url,
+            millisecond_nonce=True,
+            rate_limiter=RateLimiter(rate=1e6),
+        )
+        calls = {
+            "/v1/mytrades": lambda **kwargs: Order.get_past_trades(
+                auth, "btcusd", **kwargs
+            ),
+            "/v1/transfers": lambda **kwargs: FundManagement.get_transfers(
+                auth, **kwargs
+            ),
+        }
+        builders = {
+            "/v1/mytrades": lambda page: [
+                Order(auth=auth, order_data=row) for row in page
+            ],
+            "/v1/transfers": lambda page: [
+                FundManagement(auth=auth, fund_data=row) for row in page
+            ],
+        }
+
+        for path, call in calls.items():
+            print(f"{path} ({RECORDS} records)")
+            objects = report("objects", call)
+            raw = report("raw=True", lambda: call(raw=True))
+            report(
+                "bytes",
+                lambda: auth.make_request(
+                    path, {"account": ["primary"]}, False
+                ),
+            )
+            page = pages[path]
+            report("building objects only", lambda: builders[path](page))
+            print(f"  raw mode saves {(1 - raw / objects) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for coalescing identical concurrent read requests.
+
+Bursts of threads call Public.get_ticker and
+FundManagement.get_available_balances at the same moment against a
+LocalRestServer, with and without a SingleFlight, and report the
+requests the server received and the time per burst.
+
+Usage:
+    python benchmarks/bench_single_flight.py
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.endpoints.public import Public
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.single_flight import SingleFlight
+from gemini_api.testing import LocalRestServer
+
+THREADS = 50
+BURSTS = 20
+BALANCES = [
+    {
+        "type": "exchange",
+        "currency": "BTC",
+        "amount": "1",
+        "available": "1",
+        "availableForWithdrawal": "1",
+    }
+]
+
+
+def burst(calls: List[Callable[[], object]]) -> None:
+    barrier = threading.Barrier(len(calls))
+
+    def run(call: Callable[[], object]) -> None:
+        barrier.wait()
+        call()
+
+    threads = [threading.Thread(target=run, args=(call,)) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run(
+    server: LocalRestServer, single_flight: Optional[SingleFlight]
+) -> None:
+    public = Public(url=server.url + "/v1", single_flight=single_flight)
+    auth = Authentication(
+        "key",
+        "secret",
+        url=server.url,
+        millisecond_nonce=True,
+        rate_limiter=RateLimiter(rate=1e6),
+        single_flight=single_flight,
+    )
+    calls: List[Callable[[], object]] = []
+    for i in range(THREADS):
+        if i % 2:
+            calls.append(lambda: public.get_ticker("btcusd"))
+        else:
+            calls.append(lambda: FundManagement.get_available_balances(auth))
+
+    sent = len(server.requests)
+    start = time.perf_counter()
+    for _ in range(BURSTS):
+        burst(calls)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'coalesced' if single_flight else 'plain':<10} "
+        f"requests={len(server.requests) - sent:5d} "
+        f"calls={THREADS * BURSTS} "
+        f"per burst={elapsed / BURSTS * 1000:6.1f}ms"
+    )
+
+
+def main() -> None:
+    routes = {
+        "/v1/pubticker/btcusd": lambda request: {"bid": "1", "ask": "2"},
+        "/v1/balances": lambda request: BALANCES,
+    }
+    with LocalRestServer(routes, latency=0.01) as server:
+        run(server, None)
+        run(server, SingleFlight())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for streaming decoding of large list responses.
+
+Serves a 100k-record /v1/transfers history, encoded once up front, from
+a local server and iterates over it as FundManagement objects, once
+decoding the whole response with make_request and once streaming it
+with FundManagement.get_transfers(stream=True). Reports the time to the
+first record, the total time and the peak memory, measured with
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_streaming.py
+"""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.fund_management import FundManagement
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.testing import LocalRestServer
+
+RECORDS = 100000
+CURRENCIES = ["USD", "BTC", "ETH", "SOL", "GUSD"]
+
+
+def transfers(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": random.choice(["Deposit", "Withdrawal"]),
+            "status": random.choice(["Advanced", "Complete"]),
+            "timestampms": 1507913541275 + i * 1000,
+            "eid": 320013281 + i,
+            "currency": random.choice(CURRENCIES),
+            "amount": f"{random.uniform(0, 1000):.2f}",
+            "method": random.choice(["ACH", "Wire", "CreditCard"]),
+            "txHash": f"{i:064x}",
+        }
+        for i in range(count)
+    ]
+
+
+def measure(name: str, fetch: Callable[[], Iterable[Any]]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = iter(fetch())
+    next(records)
+    first = time.perf_counter() - start
+    for _ in records:
+        pass
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"  {name:<12} first record {first * 1000:8.1f}ms"
+        f"  total {total * 1000:8.1f}ms  peak {peak / 1e6:7.2f}MB"
+    )
+
+
+def main() -> None:
+    body = json.dumps(transfers(RECORDS)).encode()
+    with LocalRestServer({"/v1/transfers": lambda request: body}) as server:
+        auth = Authentication(
+            "key",
+            "secret",
+            url=server.url,
+            millisecond_nonce=True,
+            rate_limiter=RateLimiter(rate=1e6),
+        )
+        print(f"/v1/transfers ({RECORDS} records)")
+        measure("decoded", lambda: FundManagement.get_transfers(auth))
+        measure(
+            "streamed",
+            lambda: FundManagement.get_transfers(auth, stream=True),
+        )
+
+
+if __name__ == "__main__":
+    main()
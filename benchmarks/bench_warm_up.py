@@ -0,0 +1,86 @@
+"""
+Benchmark for warming up pooled connections before the first requests.
+
+Sends a burst of concurrent requests from a fresh Public client, once
+cold and once after warm_up, and reports the time of the burst and the
+connections opened for it. Against the LocalRestServer only TCP setup
+on loopback is saved; pass a base URL to include DNS and TLS setup.
+
+Usage:
+    python benchmarks/bench_warm_up.py
+    python benchmarks/bench_warm_up.py https://api.sandbox.gemini.com
+"""
+
+import sys
+import threading
+import time
+from typing import Optional
+
+from gemini_api.endpoints.public import Public
+from gemini_api.instrumentation import Instrumentation
+from gemini_api.testing import LocalRestServer
+
+ROUNDS = 10
+BURST = 4
+
+
+def burst(public: Public) -> float:
+    barrier = threading.Barrier(BURST)
+
+    def run() -> None:
+        barrier.wait()
+        public.get_ticker("btcusd")
+
+    threads = [threading.Thread(target=run) for _ in range(BURST)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def run(url: str, warm: bool, server: Optional[LocalRestServer]) -> None:
+    elapsed = 0.0
+    warm_up = 0.0
+    opened = 0
+    for _ in range(ROUNDS):
+        public = Public(url=url + "/v1", instrumentation=Instrumentation())
+        before = 0 if server is None else server.connections
+        if warm:
+            start = time.perf_counter()
+            public.warm_up(BURST)
+            warm_up += time.perf_counter() - start
+            before = 0 if server is None else server.connections
+        elapsed += burst(public)
+        if server is not None:
+            opened += server.connections - before
+        public.session.close()
+    name = "warmed" if warm else "cold"
+    print(
+        f"  {name:<7} first burst {elapsed / ROUNDS * 1000:8.2f}ms"
+        f"  warm_up {warm_up / ROUNDS * 1000:8.2f}ms"
+        + (
+            ""
+            if server is None
+            else f"  connections opened in burst {opened / ROUNDS:4.1f}"
+        )
+    )
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        url = sys.argv[1].rstrip("/")
+        print(f"{url} ({BURST} concurrent requests)")
+        for warm in (False, True):
+            run(url, warm, None)
+        return
+    routes = {"/v1/pubticker/btcusd": lambda request: {"bid": "1"}}
+    with LocalRestServer(routes) as server:
+        print(f"LocalRestServer ({BURST} concurrent requests)")
+        for warm in (False, True):
+            run(server.url, warm, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,46 @@
+from __future__ import annotations
+
 import base64
 import hashlib
 import hmac
 import json
+import threading
 import time
 from datetime import datetime
-from typing import Any, Dict, Union
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from gemini_api.circuit_breaker import CircuitBreakers
+from gemini_api.compression import accept_encoding, record_payload
+from gemini_api.decoding import Decoder, get_decoder
+from gemini_api.instrumentation import Instrumentation, get_instrumentation
+from gemini_api.rate_limit import AdaptiveLimiter, RateLimiter
+from gemini_api.scheduler import (
+    PriorityLock,
+    RequestScheduler,
+    endpoint_priority,
+)
+from gemini_api.single_flight import SingleFlight, is_read_only, request_key
+from gemini_api.warm_up import PING_PATH, KeepWarm, warm_up
+
+if TYPE_CHECKING:
+    from gemini_api.order_store import OrderStore
 
 GEMINI_SANDBOX_BASE_URL = "https://api.sandbox.gemini.com"
 GEMINI_REQUEST_BASE_URL = "https://api.gemini.com"
+# seconds a nonce in seconds may run ahead of the clock of the exchange
+NONCE_WINDOW = 30
 
 
 class Authentication(object):
@@ -23,52 +54,349 @@ class Authentication(object):
         _public_key: a public key for authentication
         _private_key: a private_key for authentication
         _url: base URL for Gemini API
+        _order_store: optional store updated from order responses
+        _session: pooled HTTP session shared by every request
+        _rate_limiter: token bucket every private request waits on
+        _scheduler: optional scheduler ordering requests by priority
+        _concurrency: optional adaptive limit on requests in flight
+        _circuit_breakers: optional circuit breakers per endpoint group
+        _timeout: seconds to wait for a response, None waits forever
+        _single_flight: optional coalescing of identical read requests
+        _decoder: decoder of response bodies
+        _raw: default of endpoint calls returning decoded responses
+        _instrumentation: instrumentation counting response bytes
+        _nonce_scale: 1 for nonces in seconds, 1000 for milliseconds
+        _last_nonce: last nonce signed
+        _nonce_lock: lock making nonces strictly increasing
+        _send_lock: optional lock sending requests one at a time
+        _last_request_at: monotonic time of the last private response
 
     Methods:
         make_request: makes a request to an endpoint URL
+        stream_request: makes a request decoding records as they arrive
+        signed_headers: creates the signed headers for an endpoint
+        warm_up: opens pooled connections ahead of the first request
+        keep_warm: keeps pooled connections open from a thread
     """
 
-    __slots__ = ["_public_key", "_private_key", "_url"]
+    __slots__ = [
+        "_public_key",
+        "_private_key",
+        "_url",
+        "_order_store",
+        "_session",
+        "_rate_limiter",
+        "_scheduler",
+        "_concurrency",
+        "_circuit_breakers",
+        "_timeout",
+        "_single_flight",
+        "_decoder",
+        "_raw",
+        "_instrumentation",
+        "_nonce_scale",
+        "_last_nonce",
+        "_nonce_lock",
+        "_send_lock",
+        "_last_request_at",
+    ]
 
     def __init__(
-        self, public_key: str, private_key: str, sandbox: bool = False
+        self,
+        public_key: str,
+        private_key: str,
+        sandbox: bool = False,
+        order_store: Optional[OrderStore] = None,
+        pool_size: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        millisecond_nonce: bool = False,
+        url: Optional[str] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        concurrency: Optional[AdaptiveLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        timeout: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+        decoder: Optional[Decoder] = None,
+        raw: bool = False,
+        compression: Optional[Iterable[str]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        ordered_nonces: bool = True,
     ) -> None:
         """
         Initialise authentication
 
         Args:
             sandbox: flag for connecting to Sandbox environment
+            order_store: OrderStore updated from every order response
+            pool_size: Maximum number of pooled connections to the API
+            rate_limiter: RateLimiter shared by private requests,
+                defaults to Gemini's limit of 600 requests per minute
+            millisecond_nonce: flag for signing nonces in milliseconds,
+                which leaves room for many requests per second. Only
+                use with keys that do not require a time-based nonce
+            url: Base URL overriding the sandbox flag, e.g. the URL of
+                a local stand-in server
+            scheduler: RequestScheduler handing out the tokens of its
+                rate limiter by endpoint priority, replaces rate_limiter
+            concurrency: AdaptiveLimiter bounding the private requests
+                in flight, adjusted from 429s and latency
+            circuit_breakers: CircuitBreakers failing requests fast
+                while their endpoint group is failing
+            timeout: Seconds to wait for the exchange to respond, None
+                waits forever
+            single_flight: SingleFlight letting concurrent identical
+                requests to read-only endpoints share one response
+            decoder: Decoder of response bodies, e.g. Decoder(Decimal)
+                for exact prices and amounts. Defaults to the fastest
+                installed JSON backend
+            raw: flag for endpoint calls returning the decoded response
+                instead of objects, unless the call overrides it
+            compression: Response encodings accepted in order of
+                preference, e.g. ["gzip"], or an empty list for
+                uncompressed responses. Defaults to gzip, deflate and
+                br when brotli is installed
+            instrumentation: Instrumentation counting the bytes of
+                every response per endpoint, defaults to the shared one
+            ordered_nonces: flag for sending requests one at a time, so
+                nonces reach Gemini in the order they are signed. False
+                sends them concurrently, and a request rejected because
+                a later nonce arrived first is sent once more
         """
 
         self._public_key: str = public_key
         self._private_key: str = private_key
+        self._order_store: Optional[OrderStore] = order_store
+        self._scheduler: Optional[RequestScheduler] = scheduler
+        self._concurrency: Optional[AdaptiveLimiter] = concurrency
+        self._circuit_breakers: Optional[CircuitBreakers] = circuit_breakers
+        self._timeout: Optional[float] = timeout
+        self._single_flight: Optional[SingleFlight] = single_flight
+        self._decoder: Decoder = decoder or get_decoder()
+        self._raw: bool = raw
+        self._instrumentation: Instrumentation = (
+            instrumentation or get_instrumentation()
+        )
+        if scheduler is not None:
+            rate_limiter = scheduler.rate_limiter
+        self._rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+        self._nonce_scale: int = 1000 if millisecond_nonce else 1
+        self._last_nonce: int = 0
+        self._nonce_lock = threading.Lock()
+        self._send_lock: Optional[PriorityLock] = (
+            PriorityLock() if ordered_nonces else None
+        )
+        self._last_request_at: Optional[float] = None
 
-        if sandbox:
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=pool_size),
+        )
+        self._session.headers["Accept-Encoding"] = accept_encoding(compression)
+
+        if url is not None:
+            self._url = url.rstrip("/")
+        elif sandbox:
             self._url = GEMINI_SANDBOX_BASE_URL
         else:
             self._url = GEMINI_REQUEST_BASE_URL
 
-    def make_request(
-        self, endpoint: str, payload: Dict[Any, Any] = None
-    ) -> Union[Dict[Any, Any], Any]:
+    @property
+    def public_key(self) -> str:
         """
-        Makes a request to an endpoint in the API
+        Property for the public key of the API key
+
+        Returns:
+            Public key
+        """
+        return self._public_key
+
+    @property
+    def url(self) -> str:
+        """
+        Property for the base URL of the API
+
+        Returns:
+            Base URL
+        """
+        return self._url
+
+    @property
+    def order_store(self) -> Optional[OrderStore]:
+        """
+        Property for the OrderStore kept up to date from order responses
+
+        Returns:
+            OrderStore or None if no store is attached
+        """
+        return self._order_store
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Property for the pooled HTTP session used for requests
+
+        Returns:
+            Session
+        """
+        return self._session
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        Property for the rate limiter shared by private requests
+
+        Returns:
+            RateLimiter
+        """
+        return self._rate_limiter
+
+    @property
+    def scheduler(self) -> Optional[RequestScheduler]:
+        """
+        Property for the scheduler ordering private requests by priority
+
+        Returns:
+            RequestScheduler or None if requests are sent first come,
+            first served
+        """
+        return self._scheduler
+
+    @property
+    def concurrency(self) -> Optional[AdaptiveLimiter]:
+        """
+        Property for the adaptive limit on private requests in flight
+
+        Returns:
+            AdaptiveLimiter or None if only the rate limit applies
+        """
+        return self._concurrency
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        """
+        Property for the circuit breakers guarding private requests
+
+        Returns:
+            CircuitBreakers or None if requests are always sent
+        """
+        return self._circuit_breakers
+
+    @property
+    def single_flight(self) -> Optional[SingleFlight]:
+        """
+        Property for the coalescing of identical read requests
+
+        Returns:
+            SingleFlight or None if every request is sent
+        """
+        return self._single_flight
+
+    @property
+    def decoder(self) -> Decoder:
+        """
+        Property for the decoder of response bodies
+
+        Returns:
+            Decoder
+        """
+        return self._decoder
+
+    @property
+    def raw(self) -> bool:
+        """
+        Property for the default of endpoint calls returning the decoded
+        response without building objects
+
+        Returns:
+            True if calls return decoded responses
+        """
+        return self._raw
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        """
+        Property for the instrumentation counting response bytes
+
+        Returns:
+            Instrumentation
+        """
+        return self._instrumentation
+
+    @property
+    def last_request_at(self) -> Optional[float]:
+        """
+        Property for the time the exchange last answered a private
+        request made with this object
+
+        Returns:
+            time.monotonic() value or None if no request was made
+        """
+        return self._last_request_at
+
+    def next_nonce(self) -> int:
+        """
+        Creates a nonce strictly greater than every nonce created before
+        by this object, even when called from several threads at once
+
+        Returns:
+            Nonce
+        """
+        with self._nonce_lock:
+            nonce = max(
+                int(time.time() * self._nonce_scale), self._last_nonce + 1
+            )
+            self._last_nonce = nonce
+        return nonce
+
+    def check_nonce_window(self, count: int) -> None:
+        """
+        Checks that a batch of requests can be signed without running
+        the nonce outside the window Gemini accepts
+
+        Nonces in seconds only advance by one per request, so a batch
+        sent faster than one request per second signs nonces ahead of
+        the clock. Nonces in milliseconds always pass.
+
+        Args:
+            count: Number of requests in the batch
+
+        Raises:
+            ValueError: The batch could sign a nonce more than
+                NONCE_WINDOW seconds ahead of the current time
+        """
+        if self._nonce_scale != 1:
+            return
+        with self._nonce_lock:
+            lead = max(self._last_nonce - int(time.time()), 0)
+        if lead + count > NONCE_WINDOW:
+            raise ValueError(
+                f"{count} requests would sign nonces up to "
+                f"{lead + count}s ahead of the clock, beyond the "
+                f"{NONCE_WINDOW}s window. Use millisecond_nonce or "
+                "smaller batches"
+            )
+
+    def signed_headers(
+        self, endpoint: str, payload: Optional[Dict[Any, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Creates the headers authenticating a request to an endpoint,
+        signing the payload with the private key
 
         Args:
             endpoint: String to add to base URL
             payload: Data to pass into encoded payload
 
         Returns:
-            Dictionary containing response data
+            Dictionary of request headers
         """
 
         if not payload:
             payload = {}
 
-        request_url = self._url + endpoint
-
         payload["request"] = endpoint
-        payload["nonce"] = str(int(time.time()))
+        payload["nonce"] = str(self.next_nonce())
 
         encoded_payload = json.dumps(payload).encode("utf-8")
         b64 = base64.b64encode(encoded_payload)
@@ -84,11 +412,265 @@ class Authentication(object):
             "X-GEMINI-SIGNATURE": signature,
             "Cache-Control": "no-cache",
         }
+        return request_headers
+
+    def warm_up(self, connections: int = 4) -> int:
+        """
+        Resolves the API host and opens pooled connections to it, so the
+        first requests, e.g. orders at the market open, skip DNS, TCP
+        and TLS setup
+
+        Args:
+            connections: Connections to open, at most pool_size
 
-        request = requests.post(
-            request_url, data=None, headers=request_headers
+        Returns:
+            Number of open connections in the pool
+        """
+        return warm_up(
+            self._session,
+            self._url + PING_PATH,
+            connections,
+            self._timeout,
+            self._instrumentation,
         )
+
+    def keep_warm(
+        self, interval: float = 30.0, connections: int = 4
+    ) -> KeepWarm:
+        """
+        Starts a background thread keeping pooled connections to the API
+        open through idle periods, with a public ticker request on each
+        idle connection every interval
+
+        Args:
+            interval: Seconds between pings of the idle connections
+            connections: Connections to keep open, at most pool_size
+
+        Returns:
+            Started KeepWarm, stopped with its stop method
+        """
+        return KeepWarm(
+            self._session,
+            self._url + PING_PATH,
+            connections,
+            interval,
+            self._timeout,
+            self._instrumentation,
+        ).start()
+
+    def make_request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        decode: bool = True,
+    ) -> Any:
+        """
+        Makes a request to an endpoint in the API
+
+        Args:
+            endpoint: String to add to base URL
+            payload: Data to pass into encoded payload
+            decode: False returns the response body as bytes, e.g. to
+                store or forward it without decoding
+
+        Returns:
+            Decoded response data, or the body as bytes when decode is
+            False
+        """
+
+        if self._single_flight is not None and is_read_only(endpoint):
+            key = (
+                self._public_key,
+                self._url,
+                request_key(endpoint, payload),
+                decode,
+            )
+            return self._single_flight.do(
+                key, partial(self._request, endpoint, payload, decode)
+            )
+        return self._request(endpoint, payload, decode)
+
+    def _request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        decode: bool = True,
+    ) -> Any:
+        request = retry_invalid_nonce(partial(self._post, endpoint, payload))
         if request.raise_for_status() is not None:
             raise Exception(request.raise_for_status())
-        data = request.json()
+        if not decode:
+            return request.content
+        data = self._decoder.decode(request.content)
         return data
+
+    def stream_request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[Any]:
+        """
+        Makes a request to an endpoint returning a JSON array, and
+        decodes the records incrementally as the body arrives
+
+        The request is sent before this returns, so errors are raised
+        here. Records are decoded with the decoder of this object and
+        yielded as soon as they are complete, so at most one record and
+        one chunk of the body are held at a time. The connection goes
+        back to the pool once the iterator is exhausted or closed.
+
+        Args:
+            endpoint: String to add to base URL, e.g. "/v1/transfers"
+            payload: Data to pass into encoded payload
+            chunk_size: Bytes read from the connection at a time
+
+        Returns:
+            Iterator of response records
+        """
+        response = retry_invalid_nonce(
+            partial(self._post, endpoint, payload, stream=True)
+        )
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+        return self._stream(endpoint, response, chunk_size)
+
+    def _stream(
+        self, endpoint: str, response: requests.Response, chunk_size: int
+    ) -> Iterator[Any]:
+        decoded_bytes = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal decoded_bytes
+            for chunk in response.iter_content(chunk_size):
+                decoded_bytes += len(chunk)
+                yield chunk
+
+        with response:
+            yield from self._decoder.decode_stream(chunks())
+        record_payload(
+            self._instrumentation, endpoint, response, decoded_bytes
+        )
+
+    def _post(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._circuit_breakers is None:
+            return self._schedule(endpoint, payload, stream)
+        breaker = self._circuit_breakers.for_endpoint(endpoint)
+        probe = breaker.acquire()
+        success = False
+        try:
+            response = self._schedule(endpoint, payload, stream)
+            success = response.status_code < 500
+            return response
+        finally:
+            breaker.release(success, probe)
+
+    def _schedule(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._scheduler is None:
+            self._rate_limiter.acquire()
+            return self._send(endpoint, payload, stream)
+        priority = endpoint_priority(endpoint)
+        self._scheduler.acquire(priority)
+        try:
+            return self._send(endpoint, payload, stream)
+        finally:
+            self._scheduler.release(priority)
+
+    def _send(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._send_lock is None:
+            return self._limit(endpoint, payload, stream)
+        # signed and answered before the next request is signed, as
+        # concurrent requests can arrive out of nonce order. Cancels
+        # waiting for the lock go ahead of other requests
+        self._send_lock.acquire(endpoint_priority(endpoint))
+        try:
+            return self._limit(endpoint, payload, stream)
+        finally:
+            self._send_lock.release()
+
+    def _limit(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        if self._concurrency is None:
+            return self._sign_and_post(endpoint, payload, stream)
+        self._concurrency.acquire(priority=endpoint_priority(endpoint))
+        start = time.monotonic()
+        response = None
+        try:
+            response = self._sign_and_post(endpoint, payload, stream)
+        finally:
+            self._concurrency.release(
+                None if response is None else time.monotonic() - start,
+                response is not None and response.status_code == 429,
+            )
+        return response
+
+    def _sign_and_post(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[Any, Any]],
+        stream: bool = False,
+    ) -> requests.Response:
+        request_url = self._url + endpoint
+        request_headers = self.signed_headers(endpoint, payload)
+
+        response = self._session.post(
+            request_url,
+            data=None,
+            headers=request_headers,
+            timeout=self._timeout,
+            stream=stream,
+        )
+        self._last_request_at = time.monotonic()
+        if not stream:
+            record_payload(self._instrumentation, endpoint, response)
+        return response
+
+
+def retry_invalid_nonce(
+    send: Callable[[], requests.Response],
+) -> requests.Response:
+    """
+    Sends a signed request, and sends it once more when it is rejected
+    with InvalidNonce
+
+    A concurrent request with a later nonce may arrive first, so the
+    rejected request is signed again with a fresh nonce.
+
+    Args:
+        send: Callable signing the request with a new nonce and
+            sending it
+
+    Returns:
+        Response of the last attempt
+    """
+    response = send()
+    if response.status_code == 400 and _is_invalid_nonce(response):
+        response = send()
+    return response
+
+
+def _is_invalid_nonce(response: requests.Response) -> bool:
+    try:
+        return response.json().get("reason") == "InvalidNonce"
+    except ValueError:
+        return False
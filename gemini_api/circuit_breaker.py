@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from gemini_api.instrumentation import Instrumentation, get_instrumentation
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+GROUP_ORDERS = "orders"
+GROUP_FUNDS = "funds"
+GROUP_PUBLIC = "public"
+
+_FUNDS_PREFIXES = (
+    "/v1/balances",
+    "/v1/notionalbalances/",
+    "/v1/transfers",
+    "/v1/custodyaccountfees",
+    "/v1/addresses/",
+    "/v1/deposit/",
+    "/v1/withdraw/",
+    "/v1/account/",
+    "/v1/payments/",
+)
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    Classifies a private endpoint into a circuit breaker group
+
+    Args:
+        endpoint: Endpoint path e.g. "/v1/order/new"
+
+    Returns:
+        GROUP_FUNDS for fund management endpoints, GROUP_ORDERS for the
+        rest
+    """
+    if endpoint.startswith(_FUNDS_PREFIXES):
+        return GROUP_FUNDS
+    return GROUP_ORDERS
+
+
+class CircuitOpenError(Exception):
+    """
+    Exception raised instead of sending a request while the circuit of
+    its endpoint group is open
+    """
+
+    def __init__(self, group: str, retry_after: float) -> None:
+        """
+        Initialise CircuitOpenError
+
+        Args:
+            group: Endpoint group of the circuit
+            retry_after: Seconds until the circuit lets probes through
+        """
+        super().__init__(
+            f"Circuit for {group} endpoints is open, "
+            f"retry in {retry_after:.1f}s"
+        )
+        self.group: str = group
+        self.retry_after: float = retry_after
+
+
+class CircuitBreaker:
+    """
+    Class for a thread-safe circuit breaker guarding one endpoint group.
+
+    The circuit opens when at least failure_threshold of the last
+    `window` requests failed, after at least min_requests. While open,
+    requests fail at once with CircuitOpenError instead of waiting on a
+    degraded exchange. After open_timeout the circuit is half open and
+    lets up to half_open_requests probes through at a time: that many
+    successes close it and any failure opens it again.
+
+    State changes are emitted as "circuit_breaker.state_change" events.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        failure_threshold: float = 0.5,
+        min_requests: int = 10,
+        window: int = 20,
+        open_timeout: float = 10.0,
+        half_open_requests: int = 1,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        Initialise CircuitBreaker
+
+        Args:
+            group: Name of the endpoint group
+            failure_threshold: Share of failed requests that opens the
+                circuit, between 0 and 1
+            min_requests: Requests needed in the window before the
+                circuit can open
+            window: Number of recent requests the share is taken from
+            open_timeout: Seconds the circuit stays open before probing
+            half_open_requests: Probes allowed at once while half open,
+                and successes needed to close the circuit
+            instrumentation: Instrumentation receiving state changes,
+                defaults to the shared one
+        """
+        self._group: str = group
+        self._threshold: float = failure_threshold
+        self._min_requests: int = min_requests
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._open_timeout: float = open_timeout
+        self._half_open_requests: int = half_open_requests
+        self._instrumentation: Instrumentation = (
+            instrumentation or get_instrumentation()
+        )
+        self._state: str = CLOSED
+        self._opened_at: float = 0.0
+        self._probes: int = 0
+        self._probe_successes: int = 0
+        self._rejected: int = 0
+        # reentrant so hooks receiving state changes can read the state
+        self._lock = threading.RLock()
+
+    @property
+    def group(self) -> str:
+        """
+        Property for the endpoint group guarded by the circuit
+
+        Returns:
+            Group name
+        """
+        return self._group
+
+    @property
+    def state(self) -> str:
+        """
+        Property for the state of the circuit
+
+        Returns:
+            CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            self._check_timeout()
+            return self._state
+
+    @property
+    def rejected(self) -> int:
+        """
+        Property for the number of requests failed fast
+
+        Returns:
+            Number of requests rejected while open
+        """
+        return self._rejected
+
+    def acquire(self) -> bool:
+        """
+        Method to check that a request may be sent
+
+        Returns:
+            True if the request is a probe of a half open circuit, to
+            be passed on to release
+
+        Raises:
+            CircuitOpenError: The circuit is open, or half open with
+                every probe slot taken
+        """
+        with self._lock:
+            self._check_timeout()
+            if self._state == CLOSED:
+                return False
+            if (
+                self._state == HALF_OPEN
+                and self._probes < self._half_open_requests
+            ):
+                self._probes += 1
+                return True
+            self._rejected += 1
+            retry_after = max(
+                0.0, self._opened_at + self._open_timeout - time.monotonic()
+            )
+        self._instrumentation.increment(
+            f"circuit_breaker.{self._group}.rejected"
+        )
+        raise CircuitOpenError(self._group, retry_after)
+
+    def release(self, success: bool, probe: bool = False) -> None:
+        """
+        Method to record the outcome of a request allowed by acquire
+
+        Args:
+            success: False if the request failed because of the exchange
+                or the network
+            probe: The value returned by acquire for the request
+        """
+        with self._lock:
+            if probe:
+                if self._state != HALF_OPEN:
+                    return
+                self._probes -= 1
+                if not success:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self._half_open_requests:
+                    self._transition(CLOSED)
+                return
+            if self._state != CLOSED:
+                # a request sent before the circuit opened
+                return
+            self._outcomes.append(success)
+            total = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            if total >= self._min_requests:
+                if failures >= self._threshold * total:
+                    self._transition(OPEN)
+
+    def reset(self) -> None:
+        """
+        Method to close the circuit and forget recent outcomes
+        """
+        with self._lock:
+            self._transition(CLOSED)
+
+    def _check_timeout(self) -> None:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self._open_timeout
+        ):
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state: str) -> None:
+        previous = self._state
+        self._state = state
+        self._outcomes.clear()
+        self._probes = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state != previous:
+            self._instrumentation.emit(
+                "circuit_breaker.state_change",
+                group=self._group,
+                previous=previous,
+                state=state,
+            )
+
+
+class CircuitBreakers:
+    """
+    Class holding one CircuitBreaker per endpoint group, created on first
+    use with the same settings.
+
+    Example:
+        breakers = CircuitBreakers(failure_threshold=0.3)
+        auth = Authentication(key, secret, circuit_breakers=breakers)
+        public = Public(circuit_breakers=breakers)
+    """
+
+    def __init__(self, **settings: object) -> None:
+        """
+        Initialise CircuitBreakers
+
+        Args:
+            settings: Keyword arguments of CircuitBreaker other than group
+        """
+        self._settings: Dict[str, object] = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, group: str) -> CircuitBreaker:
+        """
+        Method to get the circuit breaker of an endpoint group
+
+        Args:
+            group: Group name e.g. GROUP_ORDERS
+
+        Returns:
+            CircuitBreaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(group)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    group, **self._settings  # type: ignore[arg-type]
+                )
+                self._breakers[group] = breaker
+            return breaker
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        """
+        Method to get the circuit breaker of a private endpoint
+
+        Args:
+            endpoint: Endpoint path e.g. "/v1/balances"
+
+        Returns:
+            CircuitBreaker
+        """
+        return self.get(endpoint_group(endpoint))
+
+    def states(self) -> Dict[str, str]:
+        """
+        Method to get the state of every circuit created so far
+
+        Returns:
+            Dictionary of states keyed by group
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.group: breaker.state for breaker in breakers}
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import requests
+
+from gemini_api.instrumentation import Instrumentation, get_instrumentation
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+ENCODING_GZIP = "gzip"
+ENCODING_DEFLATE = "deflate"
+ENCODING_BROTLI = "br"
+ENCODING_IDENTITY = "identity"
+
+_PREFIX = "payload."
+
+
+class PayloadSize(NamedTuple):
+    """
+    Bytes received from an endpoint, as counted by record_payload
+
+    Attributes:
+        responses: Number of responses measured
+        wire_bytes: Bytes of the bodies as sent, compressed or not
+        decoded_bytes: Bytes of the bodies after decompression
+        unmeasured: Number of compressed responses whose size on the
+            wire was not reported, left out of the other counts
+    """
+
+    responses: int
+    wire_bytes: int
+    decoded_bytes: int
+    unmeasured: int
+
+    @property
+    def ratio(self) -> float:
+        """
+        Property for the compression ratio of the measured responses
+
+        Returns:
+            Decoded bytes per wire byte, 1.0 for uncompressed responses
+            or when nothing was measured
+        """
+        if not self.wire_bytes:
+            return 1.0
+        return self.decoded_bytes / self.wire_bytes
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """
+    Gets the response encodings the HTTP client can decompress
+
+    Returns:
+        ENCODING_GZIP and ENCODING_DEFLATE, and ENCODING_BROTLI when
+        brotli or brotlicffi is installed
+    """
+    if brotli is None:
+        return (ENCODING_GZIP, ENCODING_DEFLATE)
+    return (ENCODING_GZIP, ENCODING_DEFLATE, ENCODING_BROTLI)
+
+
+def accept_encoding(encodings: Optional[Iterable[str]] = None) -> str:
+    """
+    Creates the Accept-Encoding header negotiating response compression
+
+    Args:
+        encodings: Encodings accepted in order of preference, e.g.
+            ["br", "gzip"], or an empty list for uncompressed responses.
+            Defaults to every supported encoding
+
+    Returns:
+        Header value, e.g. "gzip, deflate"
+
+    Raises:
+        ValueError: An encoding is not supported
+    """
+    if encodings is None:
+        return ", ".join(supported_encodings())
+    accepted = list(encodings)
+    for encoding in accepted:
+        if encoding not in supported_encodings():
+            raise ValueError(f"Unsupported response encoding: {encoding}")
+    if not accepted:
+        return ENCODING_IDENTITY
+    return ", ".join(accepted)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compresses a body with a content encoding, e.g. for a local server
+    standing in for the exchange
+
+    Args:
+        data: Body
+        encoding: ENCODING_GZIP, ENCODING_DEFLATE, ENCODING_BROTLI or
+            ENCODING_IDENTITY
+
+    Returns:
+        Compressed body
+
+    Raises:
+        ValueError: The encoding is not supported
+    """
+    if encoding == ENCODING_GZIP:
+        return gzip.compress(data, compresslevel=6)
+    if encoding == ENCODING_DEFLATE:
+        return zlib.compress(data, 6)
+    if encoding == ENCODING_BROTLI and brotli is not None:
+        return brotli.compress(data, quality=4)
+    if encoding == ENCODING_IDENTITY:
+        return data
+    raise ValueError(f"Unsupported response encoding: {encoding}")
+
+
+def record_payload(
+    instrumentation: Instrumentation,
+    endpoint: str,
+    response: requests.Response,
+    decoded_bytes: Optional[int] = None,
+) -> None:
+    """
+    Counts the bytes of a response body on the wire and after
+    decompression, as "payload.<endpoint>.*" counters
+
+    The wire size is the number of body bytes urllib3 read from the
+    connection. Chunked responses are not counted by urllib3, so their
+    size falls back to Content-Length, or to the decoded size when they
+    are not compressed. Compressed chunked responses are only counted as
+    unmeasured.
+
+    Args:
+        instrumentation: Instrumentation holding the counters
+        endpoint: Endpoint name, e.g. "/v1/mytrades" or "/v1/book"
+        response: Response whose body was read
+        decoded_bytes: Size of the body after decompression, defaults
+            to the size of response.content
+    """
+    if decoded_bytes is None:
+        decoded_bytes = len(response.content)
+    wire_bytes = _wire_bytes(response, decoded_bytes)
+    prefix = _PREFIX + endpoint
+    if wire_bytes is None:
+        instrumentation.increment(prefix + ".unmeasured")
+        return
+    instrumentation.increment(prefix + ".responses")
+    instrumentation.increment(prefix + ".wire_bytes", wire_bytes)
+    instrumentation.increment(prefix + ".decoded_bytes", decoded_bytes)
+
+
+def payload_sizes(
+    instrumentation: Optional[Instrumentation] = None,
+) -> Dict[str, PayloadSize]:
+    """
+    Gets the bytes received per endpoint from the counters of
+    record_payload
+
+    Args:
+        instrumentation: Instrumentation holding the counters, defaults
+            to the shared one
+
+    Returns:
+        PayloadSize keyed by endpoint name
+    """
+    counts: Dict[str, Dict[str, float]] = {}
+    counters = (instrumentation or get_instrumentation()).counters()
+    for name, value in counters.items():
+        if name.startswith(_PREFIX):
+            endpoint, _, counter = name[len(_PREFIX) :].rpartition(".")
+            counts.setdefault(endpoint, {})[counter] = value
+    return {
+        endpoint: PayloadSize(
+            int(count.get("responses", 0)),
+            int(count.get("wire_bytes", 0)),
+            int(count.get("decoded_bytes", 0)),
+            int(count.get("unmeasured", 0)),
+        )
+        for endpoint, count in counts.items()
+    }
+
+
+def _wire_bytes(
+    response: requests.Response, decoded_bytes: int
+) -> Optional[int]:
+    tell = getattr(response.raw, "tell", None)
+    if tell is not None:
+        read = tell()
+        if read:
+            return read
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    encoding = response.headers.get("Content-Encoding", ENCODING_IDENTITY)
+    if encoding.strip().lower() == ENCODING_IDENTITY:
+        return decoded_bytes
+    return None
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import codecs
+import json
+from decimal import Decimal
+from functools import partial
+from types import ModuleType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+BACKEND_JSON = "json"
+BACKEND_ORJSON = "orjson"
+DEFAULT_BACKEND = BACKEND_JSON if orjson is None else BACKEND_ORJSON
+
+NUMERIC_FIELDS: FrozenSet[str] = frozenset(
+    [
+        "amount",
+        "available",
+        "availableForWithdrawal",
+        "availableNotional",
+        "amountNotional",
+        "avg_execution_price",
+        "executed_amount",
+        "fee_amount",
+        "original_amount",
+        "price",
+        "remaining_amount",
+        "stop_price",
+        "bid",
+        "ask",
+        "last",
+        "open",
+        "high",
+        "low",
+        "close",
+        "change",
+        "quote_increment",
+        "tick_size",
+        "min_order_size",
+    ]
+)
+
+
+class PrecisionError(ValueError):
+    """
+    Raised when a decimal number has more places than it is scaled by
+    """
+
+
+def parse_scaled(text: str, places: int) -> int:
+    """
+    Parses a decimal string into an integer scaled by 10 ** places, e.g.
+    "1.5" into 150000000 for 8 places
+
+    Args:
+        text: Decimal string
+        places: Number of decimal places kept
+
+    Returns:
+        Scaled integer
+
+    Raises:
+        PrecisionError: text has more significant places than places
+        ValueError: text is not a decimal number
+    """
+    dot = text.find(".")
+    fraction = 0 if dot < 0 else len(text) - dot - 1
+    if fraction <= places:
+        try:
+            if dot < 0:
+                return int(text) * 10**places
+            return int(text[:dot] + text[dot + 1 :]) * 10 ** (
+                places - fraction
+            )
+        except ValueError:
+            # exponent notation, e.g. 1e-08
+            pass
+    try:
+        value = Decimal(text).scaleb(places)
+    except ArithmeticError:
+        raise ValueError(f"Invalid decimal string: {text!r}") from None
+    if value != value.to_integral_value():
+        raise PrecisionError(f"{text} has more than {places} places")
+    return int(value)
+
+
+def scaled_integer(places: int) -> Callable[[str], int]:
+    """
+    Creates a parser turning decimal strings into integers scaled by
+    10 ** places, e.g. for the number argument of Decoder
+
+    A Decoder using it raises PrecisionError for a numeric field with
+    more decimal places, whether it holds a string or a JSON number,
+    rather than losing precision.
+
+    Args:
+        places: Number of decimal places kept
+
+    Returns:
+        Callable parsing a decimal string, raising PrecisionError if
+        the value has more decimal places
+    """
+    return partial(_parse_scaled_at, places)
+
+
+def _parse_scaled_at(places: int, text: str) -> int:
+    return parse_scaled(text, places)
+
+
+class Decoder:
+    """
+    Class decoding JSON response bodies.
+
+    By default bodies are decoded with the fastest available backend,
+    orjson when it is installed, with numbers as int and float like
+    requests.Response.json(). With a number parser, the values of price
+    and amount fields are parsed in the same pass, e.g. into Decimal for
+    exact arithmetic, whether they are strings or JSON numbers. Numbers
+    in other fields stay int and float. JSON numbers with a fraction
+    are parsed from their shortest float representation, which is exact
+    up to 15 significant digits. Values the parser rejects as invalid
+    are kept, while a PrecisionError is raised for them.
+
+    Example:
+        auth = Authentication(key, secret, decoder=Decoder(Decimal))
+        Order.get_active_orders(auth)[0].price  # Decimal("3633.00")
+    """
+
+    __slots__ = ["_number", "_fields", "_backend", "_hook", "_json"]
+
+    def __init__(
+        self,
+        number: Optional[Callable[[str], Any]] = None,
+        fields: Iterable[str] = NUMERIC_FIELDS,
+        backend: Optional[str] = None,
+    ) -> None:
+        """
+        Initialise Decoder
+
+        Args:
+            number: Callable parsing a decimal string, e.g. Decimal or
+                scaled_integer(8), None keeps floats and strings
+            fields: Keys whose values are parsed with number
+            backend: BACKEND_ORJSON or BACKEND_JSON, defaults to the
+                fastest installed. Parsing numbers always uses json
+        """
+        if backend == BACKEND_ORJSON and orjson is None:
+            raise ImportError("orjson is not installed")
+        self._number: Optional[Callable[[str], Any]] = number
+        self._fields: FrozenSet[str] = frozenset(fields)
+        self._backend: str = (
+            BACKEND_JSON if number is not None else backend or DEFAULT_BACKEND
+        )
+        self._hook = None if number is None else self._parse_fields
+        self._json = json.JSONDecoder(object_hook=self._hook)
+
+    @property
+    def backend(self) -> str:
+        """
+        Property for the JSON library used
+
+        Returns:
+            BACKEND_ORJSON or BACKEND_JSON
+        """
+        return self._backend
+
+    @property
+    def number(self) -> Optional[Callable[[str], Any]]:
+        """
+        Property for the parser of decimal numbers
+
+        Returns:
+            Callable or None if numbers are decoded as floats
+        """
+        return self._number
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """
+        Method to decode a JSON document
+
+        Args:
+            data: JSON text, UTF-8 encoded or str
+
+        Returns:
+            Decoded document
+        """
+        if self._backend == BACKEND_ORJSON and orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # e.g. integers beyond 64 bits, which json accepts
+                pass
+        if isinstance(data, bytes):
+            data = data.decode(json.detect_encoding(data), "surrogatepass")
+        return self._json.decode(data)
+
+    def decode_stream(self, chunks: Iterable[bytes]) -> Iterator[Any]:
+        """
+        Method to decode a JSON array incrementally, yielding each
+        element as soon as the chunks holding it have arrived
+
+        Only the element being parsed and the unparsed rest of the last
+        chunks are held in memory. Elements are decoded with json, with
+        the numbers of the decoder parsed as for decode.
+
+        Args:
+            chunks: UTF-8 encoded pieces of the document, e.g.
+                Response.iter_content()
+
+        Returns:
+            Iterator of the elements of the array
+
+        Raises:
+            ValueError: The document is not a JSON array or is cut off
+        """
+        raw_decode = self._json.raw_decode
+        text = codecs.getincrementaldecoder("utf-8")()
+        chunks = iter(chunks)
+        buffer = ""
+        position = 0
+        started = False
+        done = False
+
+        while True:
+            # skip whitespace, and separators once inside the array
+            skipped = _SEPARATORS if started else _WHITESPACE
+            while position < len(buffer) and buffer[position] in skipped:
+                position += 1
+            if position < len(buffer):
+                char = buffer[position]
+                if not started:
+                    if char != "[":
+                        raise ValueError("Expected a JSON array")
+                    started = True
+                    position += 1
+                    continue
+                if char == "]":
+                    return
+                try:
+                    value, end = raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if done:
+                        raise
+                else:
+                    # only complete once followed by a separator, e.g.
+                    # 2. may be the start of 2.5 in the next chunk
+                    following = end
+                    while (
+                        following < len(buffer)
+                        and buffer[following] in _WHITESPACE
+                    ):
+                        following += 1
+                    if following < len(buffer) and buffer[following] in ",]":
+                        yield value
+                        position = end
+                        continue
+            if done:
+                raise ValueError("JSON array is incomplete or invalid")
+            chunk = next(chunks, None)
+            if chunk is None:
+                done = True
+                buffer = buffer[position:] + text.decode(b"", final=True)
+            else:
+                buffer = buffer[position:] + text.decode(chunk)
+            position = 0
+
+    def _parse_fields(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        fields = self._fields
+        number = self._number
+        for key, value in obj.items():
+            if key not in fields:
+                continue
+            kind = value.__class__
+            if kind is str:
+                text = value
+            elif kind is float:
+                text = repr(value)
+            elif kind is int:
+                text = str(value)
+            else:
+                continue
+            try:
+                obj[key] = number(text)  # type: ignore[misc]
+            except PrecisionError:
+                raise
+            except (ValueError, ArithmeticError):
+                pass
+        return obj
+
+
+_WHITESPACE = frozenset(" \t\n\r")
+_SEPARATORS = _WHITESPACE | {","}
+
+_default = Decoder()
+
+
+def get_decoder() -> Decoder:
+    """
+    Gets the Decoder used by client objects that are not given their own
+
+    Returns:
+        Shared Decoder
+    """
+    return _default
@@ -1,8 +1,52 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from gemini_api.authentication import Authentication
+from gemini_api.lazy import LazySequence
+from gemini_api.models import Field, model_init, model_slots
+from gemini_api.projection import project
+from gemini_api.utils import is_raw
+
+_VOLUME_FIELDS = (
+    Field("date", "_date"),
+    Field("last_updated_ms", "_last_updated_ms"),
+    Field("web_maker_fee_bps", "_web_maker_fee_bps"),
+    Field("web_taker_fee_bps", "_web_taker_fee_bps"),
+    Field("web_auction_fee_bps", "_web_auction_fee_bps"),
+    Field("api_maker_fee_bps", "_api_maker_fee_bps"),
+    Field("api_taker_fee_bps", "_api_taker_fee_bps"),
+    Field("api_auction_fee_bps", "_api_auction_fee_bps"),
+    Field("fix_maker_fee_bps", "_fix_maker_fee_bps"),
+    Field("fix_taker_fee_bps", "_fix_taker_fee_bps"),
+    Field("fix_auction_fee_bps", "_fix_auction_fee_bps"),
+    Field("block_maker_fee_bps", "_block_maker_fee_bps"),
+    Field("block_taker_fee_bps", "_block_taker_fee_bps"),
+    Field("notional_30d_volume", "_notional_30d_volume"),
+    Field("notional_1d_volume", "_notional_1d_volume"),
+    Field("symbol", "_symbol"),
+    Field("base_currency", "_base_currency"),
+    Field("notional_currency", "_notional_currency"),
+    Field("data_date", "_data_date"),
+    Field("total_volume_base", "_total_volume_base"),
+    Field("maker_buy_sell_ratio", "_maker_buy_sell_ratio"),
+    Field("buy_maker_base", "_buy_maker_base"),
+    Field("buy_maker_notional", "_buy_maker_notional"),
+    Field("buy_maker_count", "_buy_maker_count"),
+    Field("sell_maker_base", "_sell_maker_base"),
+    Field("sell_maker_notional", "_sell_maker_notional"),
+    Field("sell_maker_count", "_sell_maker_count"),
+    Field("buy_taker_base", "_buy_taker_base"),
+    Field("buy_taker_notional", "_buy_taker_notional"),
+    Field("buy_taker_count", "_buy_taker_count"),
+    Field("sell_taker_base", "_sell_taker_base"),
+    Field("sell_taker_notional", "_sell_taker_notional"),
+    Field("sell_taker_count", "_sell_taker_count"),
+    Field("result", "_result"),
+    Field("reason", "_reason"),
+    Field("message", "_message"),
+)
 
 
 class FeeVolume:
@@ -10,133 +54,52 @@ class FeeVolume:
     Class that manages Fee and Volumes APIs
     """
 
-    __slots__ = [
-        "_date",
-        "_last_updated_ms",
-        "_web_maker_fee_bps",
-        "_web_taker_fee_bps",
-        "_web_auction_fee_bps",
-        "_api_maker_fee_bps",
-        "_api_taker_fee_bps",
-        "_api_auction_fee_bps",
-        "_fix_maker_fee_bps",
-        "_fix_taker_fee_bps",
-        "_fix_auction_fee_bps",
-        "_block_maker_fee_bps",
-        "_block_taker_fee_bps",
-        "_notional_30d_volume",
-        "_notional_1d_volume",
-        "_notional_1d_volume_date",
-        "_notional_1d_volume_notional_volume",
-        "_symbol",
-        "_base_currency",
-        "_notional_currency",
-        "_data_date",
-        "_total_volume_base",
-        "_maker_buy_sell_ratio",
-        "_buy_maker_base",
-        "_buy_maker_notional",
-        "_buy_maker_count",
-        "_sell_maker_base",
-        "_sell_maker_notional",
-        "_sell_maker_count",
-        "_buy_taker_base",
-        "_buy_taker_notional",
-        "_buy_taker_count",
-        "_sell_taker_base",
-        "_sell_taker_notional",
-        "_sell_taker_count",
-        "_result",
-        "_reason",
-        "_message",
-    ]
-
-    def __init__(
-        self, auth: Authentication, volume_data: Dict[str, Any]
-    ) -> None:
-        """
+    __slots__ = model_slots(_VOLUME_FIELDS, "__weakref__")
+
+    _date: str
+    _last_updated_ms: int
+    _web_maker_fee_bps: int
+    _web_taker_fee_bps: int
+    _web_auction_fee_bps: int
+    _api_maker_fee_bps: int
+    _api_taker_fee_bps: int
+    _api_auction_fee_bps: int
+    _fix_maker_fee_bps: int
+    _fix_taker_fee_bps: int
+    _fix_auction_fee_bps: int
+    _block_maker_fee_bps: int
+    _block_taker_fee_bps: int
+    _notional_30d_volume: int
+    _notional_1d_volume: List[Dict[str, Any]]
+    _symbol: str
+    _base_currency: float
+    _notional_currency: float
+    _data_date: str
+    _total_volume_base: float
+    _maker_buy_sell_ratio: float
+    _buy_maker_base: float
+    _buy_maker_notional: float
+    _buy_maker_count: float
+    _sell_maker_base: float
+    _sell_maker_notional: float
+    _sell_maker_count: float
+    _buy_taker_base: float
+    _buy_taker_notional: float
+    _buy_taker_count: float
+    _sell_taker_base: float
+    _sell_taker_notional: float
+    _sell_taker_count: float
+    _result: str
+    _reason: str
+    _message: str
+
+    __init__ = model_init(
+        _VOLUME_FIELDS,
+        "volume_data",
+        doc="""
         Initialise FeeVolume class
-        """
-        if "date" in volume_data:
-            self._date: str = volume_data["date"]
-        if "last_updated_ms" in volume_data:
-            self._last_updated_ms: int = volume_data["last_updated_ms"]
-        if "web_maker_fee_bps" in volume_data:
-            self._web_maker_fee_bps: int = volume_data["web_maker_fee_bps"]
-        if "web_taker_fee_bps" in volume_data:
-            self._web_taker_fee_bps: int = volume_data["web_taker_fee_bps"]
-        if "web_auction_fee_bps" in volume_data:
-            self._web_auction_fee_bps: int = volume_data["web_auction_fee_bps"]
-        if "api_maker_fee_bps" in volume_data:
-            self._api_maker_fee_bps: int = volume_data["api_maker_fee_bps"]
-        if "api_taker_fee_bps" in volume_data:
-            self._api_taker_fee_bps: int = volume_data["api_taker_fee_bps"]
-        if "api_auction_fee_bps" in volume_data:
-            self._api_auction_fee_bps: int = volume_data["api_auction_fee_bps"]
-        if "fix_maker_fee_bps" in volume_data:
-            self._fix_maker_fee_bps: int = volume_data["fix_maker_fee_bps"]
-        if "fix_taker_fee_bps" in volume_data:
-            self._fix_taker_fee_bps: int = volume_data["fix_taker_fee_bps"]
-        if "fix_auction_fee_bps" in volume_data:
-            self._fix_auction_fee_bps: int = volume_data["fix_auction_fee_bps"]
-        if "block_maker_fee_bps" in volume_data:
-            self._block_maker_fee_bps: int = volume_data["block_maker_fee_bps"]
-        if "block_taker_fee_bps" in volume_data:
-            self._block_taker_fee_bps: int = volume_data["block_taker_fee_bps"]
-        if "notional_30d_volume" in volume_data:
-            self._notional_30d_volume: int = volume_data["notional_30d_volume"]
-        if "notional_1d_volume" in volume_data:
-            self._notional_1d_volume: List[Dict[str, Any]] = volume_data[
-                "notional_1d_volume"
-            ]
-        if "symbol" in volume_data:
-            self._symbol: str = volume_data["symbol"]
-        if "base_currency" in volume_data:
-            self._base_currency: float = volume_data["base_currency"]
-        if "notional_currency" in volume_data:
-            self._notional_currency: float = volume_data["notional_currency"]
-        if "data_date" in volume_data:
-            self._data_date: str = volume_data["data_date"]
-        if "total_volume_base" in volume_data:
-            self._total_volume_base: float = volume_data["total_volume_base"]
-        if "maker_buy_sell_ratio" in volume_data:
-            self._maker_buy_sell_ratio: float = volume_data[
-                "maker_buy_sell_ratio"
-            ]
-        if "buy_maker_base" in volume_data:
-            self._buy_maker_base: float = volume_data["buy_maker_base"]
-        if "buy_maker_notional" in volume_data:
-            self._buy_maker_notional: float = volume_data["buy_maker_notional"]
-        if "buy_maker_count" in volume_data:
-            self._buy_maker_count: float = volume_data["buy_maker_count"]
-        if "sell_maker_base" in volume_data:
-            self._sell_maker_base: float = volume_data["sell_maker_base"]
-        if "sell_maker_notional" in volume_data:
-            self._sell_maker_notional: float = volume_data[
-                "sell_maker_notional"
-            ]
-        if "sell_maker_count" in volume_data:
-            self._sell_maker_count: float = volume_data["sell_maker_count"]
-        if "buy_taker_base" in volume_data:
-            self._buy_taker_base: float = volume_data["buy_taker_base"]
-        if "buy_taker_notional" in volume_data:
-            self._buy_taker_notional: float = volume_data["buy_taker_notional"]
-        if "buy_taker_count" in volume_data:
-            self._buy_taker_count: float = volume_data["buy_taker_count"]
-        if "sell_taker_base" in volume_data:
-            self._sell_taker_base: float = volume_data["sell_taker_base"]
-        if "sell_taker_notional" in volume_data:
-            self._sell_taker_notional: float = volume_data[
-                "sell_taker_notional"
-            ]
-        if "sell_taker_count" in volume_data:
-            self._sell_taker_count: float = volume_data["sell_taker_count"]
-        if "result" in volume_data:
-            self._result: str = volume_data["result"]
-        if "reason" in volume_data:
-            self._reason: str = volume_data["reason"]
-        if "message" in volume_data:
-            self._message: str = volume_data["message"]
+        """,
+    )
 
     @property
     def date(self) -> str:
@@ -516,13 +479,17 @@ class FeeVolume:
         return self._message
 
     @classmethod
-    def get_notional_volume(cls, auth: Authentication) -> Optional[FeeVolume]:
+    def get_notional_volume(
+        cls, auth: Authentication, raw: Optional[bool] = None
+    ) -> Union[FeeVolume, Dict[str, Any], None]:
         """
         Method to get the notional volume in price currency that has
         been traded across all pairs over a period of 30 days.
 
         Args:
             auth: Gemini authentication object
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FeeVolume object
@@ -531,14 +498,31 @@ class FeeVolume:
         path = "/v1/notionalvolume"
 
         res = auth.make_request(endpoint=path)
+        if is_raw(auth, raw):
+            return res
         return FeeVolume(auth=auth, volume_data=res)
 
     @classmethod
-    def get_trade_volume(cls, auth: Authentication) -> List[FeeVolume]:
+    def get_trade_volume(
+        cls,
+        auth: Authentication,
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[Sequence[FeeVolume], List[Tuple[Any, ...]], List[Any]]:
         """
         Method to
         Args:
             auth: Gemini authentication object
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["symbol", "total_volume_base"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
         Returns:
             FeeVolume object
@@ -548,6 +532,13 @@ class FeeVolume:
 
         res = auth.make_request(endpoint=path)
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res[0], fields)
+        if lazy:
+            return LazySequence(res[0], partial(FeeVolume, auth), weak_cache)
+
         all_trade_volume = []
 
         for i in range(len(res[0])):
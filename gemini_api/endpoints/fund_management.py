@@ -1,9 +1,74 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Union
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from gemini_api.authentication import Authentication
-from gemini_api.utils import date_to_unix_ts
+from gemini_api.lazy import LazySequence
+from gemini_api.models import Field, model_init, model_slots
+from gemini_api.projection import project
+from gemini_api.utils import date_to_unix_ts, is_raw, stream_records
+
+
+def _fee_value(fee: Any) -> Any:
+    # fee estimates return {"currency": ..., "value": ...}
+    if type(fee) is dict:
+        return fee["value"]
+    return fee
+
+
+_FUND_FIELDS = (
+    Field("currency", "_currency"),
+    Field("amount", "_amount"),
+    Field("available", "_available"),
+    Field("availableForWithdrawal", "_availableForWithdrawal"),
+    Field("type", "_type"),
+    Field("amountNotional", "_amountNotional"),
+    Field("availableNotional", "_availableNotional"),
+    Field(
+        "availableForWithdrawalNotional", "_availableForWithdrawalNotional"
+    ),
+    Field("status", "_status"),
+    Field("timestampms", "_timestampms"),
+    Field("eid", "_eid"),
+    Field("advanceEid", "_advanceEid"),
+    Field("feeAmount", "_feeAmount"),
+    Field("feeCurrency", "_feeCurrency"),
+    Field("method", "_method"),
+    Field("txHash", "_txHash"),
+    Field("outputIdx", "_outputidx"),
+    Field("destination", "_destination"),
+    Field("purpose", "_purpose"),
+    Field("txTime", "_txTime"),
+    Field("eventType", "_eventType"),
+    Field("address", "_address"),
+    Field("label", "_label"),
+    Field("network", "_network"),
+    Field("fee", "_fee", _fee_value),
+    Field("withdrawalID", "_withdrawalId"),
+    Field("isOverride", "_isOverride"),
+    Field("monthlyLimit", "_monthlyLimit"),
+    Field("monthlyRemaining", "_monthlyRemaining"),
+    Field("montlyRemaining", "_monthlyRemaining"),
+    Field("referenceId", "_referenceId"),
+    Field("balances", "_balances"),
+    Field("banks", "_banks"),
+    Field("result", "_result"),
+    Field("reason", "_reason"),
+    Field("message", "_message"),
+    Field("fromAccount", "_fromAccount"),
+    Field("toAccount", "_toAccount"),
+    Field("uuid", "_uuid"),
+)
 
 
 class FundManagement:
@@ -11,137 +76,54 @@ class FundManagement:
     Class that manages Fund Management APIs
     """
 
-    __slots__ = [
-        "_currency",
-        "_amount",
-        "_available",
-        "_availableForWithdrawal",
-        "_type",
-        "_amountNotional",
-        "_availableNotional",
-        "_availableForWithdrawalNotional",
-        "_status",
-        "_timestampms",
-        "_eid",
-        "_advanceEid",
-        "_feeAmount",
-        "_fee_currency",
-        "_method",
-        "_tx_hash",
-        "_outputidx",
-        "_destination",
-        "_purpose",
-        "_txTime",
-        "_eventType",
-        "_address",
-        "_label",
-        "_network",
-        "_fee",
-        "_withdrawalId",
-        "_message",
-        "_isOverride",
-        "_monthlyLimit",
-        "_monthlyRemaining",
-        "_referenceId",
-        "_result",
-        "_reason",
-        "_message",
-        "_balances",
-        "_banks",
-        "_fromAccount",
-        "_toAccount",
-        "_uuid",
-    ]
-
-    def __init__(
-        self, auth: Authentication, fund_data: Union[Dict[str, Any], Any]
-    ) -> None:
-        """
+    __slots__ = model_slots(_FUND_FIELDS, "__weakref__")
+
+    _currency: str
+    _amount: float
+    _available: float
+    _availableForWithdrawal: float
+    _type: str
+    _amountNotional: float
+    _availableNotional: float
+    _availableForWithdrawalNotional: float
+    _status: str
+    _timestampms: int
+    _eid: int
+    _advanceEid: int
+    _feeAmount: int
+    _feeCurrency: str
+    _method: str
+    _txHash: str
+    _outputidx: int
+    _destination: str
+    _purpose: str
+    _txTime: str
+    _eventType: str
+    _address: str
+    _label: str
+    _network: str
+    _fee: Dict[str, str]
+    _withdrawalId: str
+    _isOverride: bool
+    _monthlyLimit: int
+    _monthlyRemaining: int
+    _referenceId: str
+    _balances: List[Dict[str, str]]
+    _banks: List[Dict[str, str]]
+    _result: str
+    _reason: str
+    _message: str
+    _fromAccount: str
+    _toAccount: str
+    _uuid: str
+
+    __init__ = model_init(
+        _FUND_FIELDS,
+        "fund_data",
+        doc="""
         Initialise FundManagement class
-        """
-        if "currency" in fund_data:
-            self._currency: str = fund_data["currency"]
-        if "amount" in fund_data:
-            self._amount: float = fund_data["amount"]
-        if "available" in fund_data:
-            self._available: float = fund_data["available"]
-        if "availableForWithdrawal" in fund_data:
-            self._availableForWithdrawal: float = fund_data[
-                "availableForWithdrawal"
-            ]
-        if "type" in fund_data:
-            self._type: str = fund_data["type"]
-        if "amountNotional" in fund_data:
-            self._amountNotional: float = fund_data["amountNotional"]
-        if "availableNotional" in fund_data:
-            self._availableNotional: float = fund_data["availableNotional"]
-        if "availableForWithdrawalNotional" in fund_data:
-            self._availableForWithdrawalNotional: float = fund_data[
-                "availableForWithdrawalNotional"
-            ]
-        if "status" in fund_data:
-            self._status: str = fund_data["status"]
-        if "timestampms" in fund_data:
-            self._timestampms: int = fund_data["timestampms"]
-        if "eid" in fund_data:
-            self._eid: int = fund_data["eid"]
-        if "advanceEid" in fund_data:
-            self._advanceEid: int = fund_data["advanceEid"]
-        if "feeAmount" in fund_data:
-            self._feeAmount: int = fund_data["feeAmount"]
-        if "feeCurrency" in fund_data:
-            self._feeCurrency: str = fund_data["feeCurrency"]
-        if "method" in fund_data:
-            self._method: str = fund_data["method"]
-        if "txHash" in fund_data:
-            self._txHash: str = fund_data["txHash"]
-        if "outputIdx" in fund_data:
-            self._outputidx: int = fund_data["outputidx"]
-        if "destination" in fund_data:
-            self._destination: str = fund_data["destination"]
-        if "purpose" in fund_data:
-            self._purpose: str = fund_data["purpose"]
-        if "txTime" in fund_data:
-            self._txTime: str = fund_data["txTime"]
-        if "eventType" in fund_data:
-            self._eventType: str = fund_data["eventType"]
-        if "address" in fund_data:
-            self._address: str = fund_data["address"]
-        if "label" in fund_data:
-            self._label: str = fund_data["label"]
-        if "network" in fund_data:
-            self._network: str = fund_data["network"]
-        if "fee" in fund_data:
-            if isinstance(fund_data["fee"], dict):
-                self._fee: Dict[str, str] = fund_data["fee"]["value"]
-            else:
-                self._fee = fund_data["fee"]
-        if "withdrawalID" in fund_data:
-            self._withdrawalID: str = fund_data["withdrawalID"]
-        if "isOverride" in fund_data:
-            self._isOverride: bool = fund_data["isOverride"]
-        if "monthlyLimit" in fund_data:
-            self._monthlyLimit: int = fund_data["monthlyLimit"]
-        if "montlyRemaining" in fund_data:
-            self._monthlyRemaining: int = fund_data["montlyRemaining"]
-        if "referenceId" in fund_data:
-            self._referenceId: str = fund_data["referenceId"]
-        if "balances" in fund_data:
-            self._balances: List[Dict[str, str]] = fund_data["balances"]
-        if "banks" in fund_data:
-            self._banks: List[Dict[str, str]] = fund_data["banks"]
-        if "result" in fund_data:
-            self._result: str = fund_data["result"]
-        if "reason" in fund_data:
-            self._reason: str = fund_data["reason"]
-        if "message" in fund_data:
-            self._message: str = fund_data["message"]
-        if "fromAccount" in fund_data:
-            self._fromAccount: str = fund_data["fromAccount"]
-        if "toAccount" in fund_data:
-            self._toAccount: str = fund_data["toAccount"]
-        if "uuid" in fund_data:
-            self._uuid: str = fund_data["uuid"]
+        """,
+    )
 
     @property
     def currency(self) -> str:
@@ -543,13 +525,27 @@ class FundManagement:
     def get_available_balances(
         cls, auth: Authentication,
         account: List[str] = ["primary"],
-    ) -> List[FundManagement]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[
+        Sequence[FundManagement], List[Tuple[Any, ...]], List[Any]
+    ]:
 
         """
         Method to get available balances in the supported currencies
 
         Args:
             auth: Gemini authentication object
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["currency", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
         Returns:
             List of FundManagement object
@@ -558,6 +554,13 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload={"account": account})
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(FundManagement, auth), weak_cache)
+
         all_available_balances = []
 
         for i in range(len(res)):
@@ -571,7 +574,13 @@ class FundManagement:
         cls, auth: Authentication, 
         currency: str,
         account: List[str] = ["primary"],
-    ) -> List[FundManagement]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[
+        Sequence[FundManagement], List[Tuple[Any, ...]], List[Any]
+    ]:
 
         """
         Method to get available balances in the supported currencies
@@ -580,6 +589,14 @@ class FundManagement:
         Args:
             auth: Gemini authentication object
             currency: supported three-letter fiat currency code
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["currency", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
 
         Returns:
@@ -589,6 +606,13 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload={"account": account})
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(FundManagement, auth), weak_cache)
+
         all_notional_balances = []
 
         for i in range(len(res)):
@@ -606,7 +630,18 @@ class FundManagement:
         limit_transfers: int = None,
         currency: str = None,
         account: List[str] = ["primary"],
-    ) -> List[FundManagement]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+        stream: bool = False,
+    ) -> Union[
+        Sequence[FundManagement],
+        List[Tuple[Any, ...]],
+        List[Any],
+        Iterator[FundManagement],
+        Iterator[Any],
+    ]:
 
         """
         Method to get transfers - shows deposits and withdrawals in the
@@ -623,9 +658,19 @@ class FundManagement:
             show_completed_deposit_advances: Display completed deposit advances
             limit_transfers: The maximum number of transfers to return
             currency: Currency code symbols
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["currency", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
+            stream: Return an iterator decoding records as the response
+                arrives, which cannot be combined with fields or lazy
 
         Returns:
-            List of FundManagement object
+            List of FundManagement object, or an iterator if streamed
         """
         path = "/v1/transfers"
 
@@ -644,8 +689,20 @@ class FundManagement:
                 "show_completed_deposit_advances"
             ] = show_completed_deposit_advances
 
+        if stream:
+            return stream_records(
+                auth, path, data, FundManagement, raw, fields, lazy
+            )
+
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(FundManagement, auth), weak_cache)
+
         all_transfers = []
 
         for i in range(len(res)):
@@ -661,7 +718,13 @@ class FundManagement:
         since: str = None,
         limit_transfers: int = None,
         account: List[str] = ["primary"],
-    ) -> List[FundManagement]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[
+        Sequence[FundManagement], List[Tuple[Any, ...]], List[Any]
+    ]:
 
         """
         Method to get Custody fee records in the supported currencies
@@ -670,6 +733,14 @@ class FundManagement:
             auth: Gemini authentication object
             since: Date in YYYYMMDD format
             limit_transfers: The maximum nmber of transfers to return
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["currency", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
         Returns:
             List of FundManagement object
@@ -687,6 +758,13 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(FundManagement, auth), weak_cache)
+
         all_custody_fees = []
 
         for i in range(len(res)):
@@ -701,7 +779,13 @@ class FundManagement:
         network: str,
         since: str = None,
         account: List[str] = ["primary"],
-    ) -> List[FundManagement]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[
+        Sequence[FundManagement], List[Tuple[Any, ...]], List[Any]
+    ]:
 
         """
         Method to get deposit address
@@ -713,6 +797,14 @@ class FundManagement:
             auth: Gemini API authentication object
             network: e.g. bitcoin
             since: Date in YYYYMMDD format
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["currency", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
         Returns:
             List of FundManagement object
@@ -728,6 +820,13 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(FundManagement, auth), weak_cache)
+
         all_deposit_addresses = []
 
         for i in range(len(res)):
@@ -745,7 +844,8 @@ class FundManagement:
         since: str = None,
         legacy: bool = False,
         account: List[str] = ["primary"],
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to get custody fee records
@@ -759,6 +859,8 @@ class FundManagement:
             label: The label for the new address if provided on creation
             since: Date in YYYYMMDD format
             legacy: Whether to generate a legacy P2SH-P2PKH litecoin address
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             Fundmanagement object
@@ -778,6 +880,8 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
 
     @classmethod
@@ -789,7 +893,8 @@ class FundManagement:
         amount: str,
         client_transfer_id: str = None,
         account: List[str] = ["primary"],
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to withdraw crypto funds
@@ -800,6 +905,8 @@ class FundManagement:
             address: Standard string format of cryptocurrency address
             amount: Quoted decimal amount to withdraw
             client_transfer_id: Unique identifier for withdrawal, uuid4 format
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FundManagement object
@@ -817,6 +924,8 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
 
     @classmethod
@@ -827,7 +936,8 @@ class FundManagement:
         amount: str,
         currency: str,
         account: List[str] = ["primary"],
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to estimate gas fees for ETH and ERC20 tokens
@@ -838,6 +948,8 @@ class FundManagement:
             amount: Quoted decimal amount to withdraw
             currency: Currency code of a supported crypto-currency, e.g. eth
             account: The name of the account within the subaccount group
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FundManagement object
@@ -852,6 +964,8 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
     
     @classmethod
@@ -864,7 +978,8 @@ class FundManagement:
 		amount: str,
         client_transfer_id: str = None,
         withdrawal_id: str = None,
-	) -> FundManagement:
+        raw: Optional[bool] = None,
+	) -> Union[FundManagement, Dict[str, Any]]:
         '''
         Method that allows you to execute an internal transfer between any two accounts within your Master Group.
         
@@ -876,6 +991,8 @@ class FundManagement:
 			amount: Quoted decimal amount to withdraw.
 			client_transfer_id: Optional. A unique identifier for the internal transfer, in uuid4 format.
 			withdrawal_id: Optional. Unique ID of the requested withdrawal.
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
             
         Returns:
 			FundManagement object
@@ -892,6 +1009,8 @@ class FundManagement:
         
         res = auth.make_request(endpoint=path, payload=data)
         
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
 
     @classmethod
@@ -903,7 +1022,8 @@ class FundManagement:
         type: str,
         name: str,
         account: List[str] = ["primary"],
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to add a US bank
@@ -914,6 +1034,8 @@ class FundManagement:
             routing: Routing number of bank account to be added
             type: Type of bank account to be added
             name: Name of the bank account as shown on your account statements
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
 
         Returns:
@@ -931,6 +1053,8 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
 
     @classmethod
@@ -944,7 +1068,8 @@ class FundManagement:
         institutionnumber: str = None,
         branchnumber: str = None,
         account: List[str] = ["primary"],
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to add a CAD bank
@@ -956,6 +1081,8 @@ class FundManagement:
             type: Type of bank account to be added
             institutionnumber: the institution number of the account
             branchnumber: The branch number
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FundManagement object
@@ -977,6 +1104,8 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
 
     @classmethod
@@ -984,13 +1113,16 @@ class FundManagement:
         cls,
         auth: Authentication,
         account: str = "primary",
-    ) -> FundManagement:
+        raw: Optional[bool] = None,
+    ) -> Union[FundManagement, Dict[str, Any]]:
 
         """
         Method to get data on balances in the account and linked banks
 
         Args:
             auth: Gemini authentication object
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FundManagement object
@@ -999,4 +1131,6 @@ class FundManagement:
 
         res = auth.make_request(endpoint=path, payload={"account": account})
 
+        if is_raw(auth, raw):
+            return res
         return FundManagement(auth=auth, fund_data=res)
\ No newline at end of file
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
 from gemini_api.authentication import Authentication
-from gemini_api.utils import date_to_unix_ts
+from gemini_api.models import Field, model_init, model_slots
+from gemini_api.utils import date_to_unix_ts, is_raw
+
+_FX_RATE_FIELDS = (
+    Field("fxPair", "_fx_pair"),
+    Field("rate", "_rate"),
+    Field("asOf", "_as_of"),
+    Field("provider", "_provider"),
+    Field("benchmark", "_benchmark"),
+    Field("result", "_result"),
+    Field("reason", "_reason"),
+    Field("message", "_message"),
+)
 
 
 class FXRate:
@@ -11,39 +23,24 @@ class FXRate:
     Class for FX Rate historical reference
     """
 
-    __slots__ = [
-        "_fx_pair",
-        "_rate",
-        "_as_of",
-        "_provider",
-        "_benchmark",
-        "_result",
-        "_message",
-        "_reason",
-    ]
-
-    def __init__(
-        self, auth: Authentication, fx_rate_data: Dict[str, Any]
-    ) -> None:
-        """
+    __slots__ = model_slots(_FX_RATE_FIELDS)
+
+    _fx_pair: str
+    _rate: str
+    _as_of: int
+    _provider: str
+    _benchmark: str
+    _result: str
+    _reason: str
+    _message: str
+
+    __init__ = model_init(
+        _FX_RATE_FIELDS,
+        "fx_rate_data",
+        doc="""
         Initialise FXRate class
-        """
-        if "fxPair" in fx_rate_data:
-            self._fx_pair: str = fx_rate_data["fxPair"]
-        if "rate" in fx_rate_data:
-            self._rate: str = fx_rate_data["rate"]
-        if "asOf" in fx_rate_data:
-            self._as_of: int = fx_rate_data["asOf"]
-        if "provider" in fx_rate_data:
-            self._provider: str = fx_rate_data["provider"]
-        if "benchmark" in fx_rate_data:
-            self._benchmark: str = fx_rate_data["benchmark"]
-        if "result" in fx_rate_data:
-            self._result: str = fx_rate_data["result"]
-        if "reason" in fx_rate_data:
-            self._reason: str = fx_rate_data["reason"]
-        if "message" in fx_rate_data:
-            self._message: str = fx_rate_data["message"]
+        """,
+    )
 
     @property
     def fx_pair(self) -> str:
@@ -129,8 +126,12 @@ class FXRate:
 
     @classmethod
     def get_fx_rate(
-        cls, auth: Authentication, symbol: str, since: str
-    ) -> FXRate:
+        cls,
+        auth: Authentication,
+        symbol: str,
+        since: str,
+        raw: Optional[bool] = None,
+    ) -> Union[FXRate, Dict[str, Any]]:
         """
         Method to get the fx rate
 
@@ -141,6 +142,8 @@ class FXRate:
             auth: Gemini authentication object
             symbol: Trading pair
             since: Date in YYYYMMDD format
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             FXRate object
@@ -149,4 +152,6 @@ class FXRate:
         path = f"/v2/fxrate/{symbol}/{date_unix}"
 
         res = auth.make_request(endpoint=path)
+        if is_raw(auth, raw):
+            return res
         return FXRate(auth=auth, fx_rate_data=res)
@@ -1,9 +1,96 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
+import time
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from gemini_api.authentication import Authentication
-from gemini_api.utils import date_to_unix_ts
+from gemini_api.lazy import LazySequence
+from gemini_api.models import Field, model_init, model_slots
+from gemini_api.projection import project
+from gemini_api.utils import (
+    date_to_unix_ts,
+    is_raw,
+    run_concurrently,
+    stream_records,
+)
+
+
+class OrderResult(NamedTuple):
+    """
+    Result of a single order within a bulk request
+
+    Attributes:
+        order: Order object, or the decoded response in raw mode, None
+            if the request failed
+        error: Exception raised by the request, None if it succeeded
+    """
+
+    order: Union[Order, Dict[str, Any], None]
+    error: Optional[BaseException]
+
+
+_ORDER_FIELDS = (
+    Field("order_id", "_order_id"),
+    Field("orderId", "_order_id"),
+    Field("id", "_id"),
+    Field("client_order_id", "_client_order_id"),
+    Field("symbol", "_symbol"),
+    Field("exchange", "_exchange"),
+    Field("avg_execution_price", "_avg_execution_price"),
+    Field("side", "_side"),
+    Field("type", "_order_type"),
+    Field("timestamp", "_timestamp"),
+    Field("timestampms", "_timestampms"),
+    Field("trades", "_trades"),
+    Field("is_live", "_is_live"),
+    Field("is_cancelled", "_is_cancelled"),
+    Field("is_hidden", "_is_hidden"),
+    Field("was_forced", "_was_forced"),
+    Field("executed_amount", "_executed_amount"),
+    Field("remaining_amount", "_remaining_amount"),
+    Field("options", "_options"),
+    Field("price", "_price"),
+    Field("original_amount", "_original_amount"),
+    Field("pair", "_pair"),
+    Field("priceCurrency", "_price_currency"),
+    Field("quantity", "_quantity"),
+    Field("quantityCurrency", "_quantity_currency"),
+    Field("totalSpend", "_total_spend"),
+    Field("totalSpendCurrency", "_total_spend_currency"),
+    Field("fee", "_fee"),
+    Field("feeCurrency", "_fee_currency"),
+    Field("fee_currency", "_fee_currency"),
+    Field("depositFee", "_deposit_fee"),
+    Field("depositFeeCurrency", "_deposit_fee_currency"),
+    Field("amount", "_amount"),
+    Field("aggressor", "_aggressor"),
+    Field("fee_amount", "_fee_amount"),
+    Field("tid", "_trade_id"),
+    Field("is_auction_fill", "_is_auction_fill"),
+    Field("is_clearing_fill", "_is_clearing_fill"),
+    Field("break", "_break_type"),
+    Field("result", "_result"),
+    Field("reason", "_reason"),
+    Field("message", "_message"),
+)
+
+
+def _unpack_cancel_details(order: Order, order_data: Dict[Any, Any]) -> None:
+    # cancel-all details are built into {"order_id": {id: cancelled}}
+    if "order_id" in order_data and type(order_data["order_id"]) is dict:
+        cancelled = order_data["order_id"].items()
+        order._order_id, order._is_cancelled = next(iter(cancelled))
 
 
 class Order:
@@ -12,152 +99,57 @@ class Order:
     wrap orders and cancel orders.
     """
 
-    __slots__ = [
-        "_order_id",
-        "_id",
-        "_client_order_id",
-        "_symbol",
-        "_exchange",
-        "_avg_execution_price",
-        "_side",
-        "_order_type",
-        "_timestamp",
-        "_timestampms",
-        "_trades",
-        "_is_live",
-        "_is_cancelled",
-        "_reason",
-        "_is_hidden",
-        "_was_forced",
-        "_executed_amount",
-        "_remaining_amount",
-        "_options",
-        "_price",
-        "_amount",
-        "_original_amount",
-        "_remaining_amount",
-        "_pair",
-        "_price_currency",
-        "_quantity",
-        "_quantity_currency",
-        "_total_spend",
-        "_total_spend_currency",
-        "_fee",
-        "_fee_currency",
-        "_fee_amount",
-        "_deposit_fee",
-        "_deposit_fee_currency",
-        "_trade_id",
-        "_aggressor",
-        "_is_auction_fill",
-        "_is_clearing_fill",
-        "_break_type",
-        "_reason",
-        "_result",
-        "_message",
-    ]
-
-    def __init__(
-        self, auth: Authentication, order_data: Dict[Any, Any]
-    ) -> None:
-        """
+    __slots__ = model_slots(_ORDER_FIELDS, "__weakref__")
+
+    _order_id: Union[str, Dict[int, bool]]
+    _id: str
+    _client_order_id: str
+    _symbol: str
+    _exchange: str
+    _avg_execution_price: str
+    _side: str
+    _order_type: str
+    _timestamp: str
+    _timestampms: int
+    _trades: List[Dict[str, Union[str, Any]]]
+    _is_live: bool
+    _is_cancelled: bool
+    _is_hidden: bool
+    _was_forced: bool
+    _executed_amount: float
+    _remaining_amount: str
+    _options: List[str]
+    _price: str
+    _original_amount: str
+    _pair: str
+    _price_currency: str
+    _quantity: str
+    _quantity_currency: str
+    _total_spend: str
+    _total_spend_currency: str
+    _fee: str
+    _fee_currency: str
+    _deposit_fee: str
+    _deposit_fee_currency: str
+    _amount: float
+    _aggressor: bool
+    _fee_amount: str
+    _trade_id: int
+    _is_auction_fill: bool
+    _is_clearing_fill: bool
+    _break_type: str
+    _result: str
+    _reason: str
+    _message: str
+
+    __init__ = model_init(
+        _ORDER_FIELDS,
+        "order_data",
+        doc="""
         Initialise Order class
-        """
-        if "order_id" in order_data:
-            if isinstance(order_data["order_id"], str):
-                self._order_id: Union[str, Dict[int, bool]] = order_data[
-                    "order_id"
-                ]
-            else:
-                if isinstance(order_data["order_id"], dict):
-                    self._order_id = list(order_data["order_id"].keys())[0]
-                    self._is_cancelled: bool = list(
-                        order_data["order_id"].values()
-                    )[0]
-        if "orderId" in order_data:
-            self._order_id = order_data["orderId"]
-        if "id" in order_data:
-            self._id: str = order_data["id"]
-        if "client_order_id" in order_data:
-            self._client_order_id: str = order_data["client_order_id"]
-        if "symbol" in order_data:
-            self._symbol: str = order_data["symbol"]
-        if "exchange" in order_data:
-            self._exchange: str = order_data["exchange"]
-        if "avg_execution_price" in order_data:
-            self._avg_execution_price: str = order_data["avg_execution_price"]
-        if "side" in order_data:
-            self._side: str = order_data["side"]
-        if "type" in order_data:
-            self._order_type: str = order_data["type"]
-        if "timestamp" in order_data:
-            self._timestamp: str = order_data["timestamp"]
-        if "timestampms" in order_data:
-            self._timestampms: int = order_data["timestampms"]
-        if "trades" in order_data:
-            self._trades: List[Dict[str, Union[str, Any]]] = order_data[
-                "trades"
-            ]
-        if "is_live" in order_data:
-            self._is_live: bool = order_data["is_live"]
-        if "is_cancelled" in order_data:
-            self._is_cancelled = order_data["is_cancelled"]
-        if "is_hidden" in order_data:
-            self._is_hidden: bool = order_data["is_hidden"]
-        if "was_forced" in order_data:
-            self._was_forced: bool = order_data["was_forced"]
-        if "executed_amount" in order_data:
-            self._executed_amount: float = order_data["executed_amount"]
-        if "remaining_amount" in order_data:
-            self._remaining_amount: str = order_data["remaining_amount"]
-        if "options" in order_data:
-            self._options: List[str] = order_data["options"]
-        if "price" in order_data:
-            self._price: str = order_data["price"]
-        if "original_amount" in order_data:
-            self._original_amount: str = order_data["original_amount"]
-        if "pair" in order_data:
-            self._pair: str = order_data["pair"]
-        if "priceCurrency" in order_data:
-            self._price_currency: str = order_data["priceCurrency"]
-        if "quantity" in order_data:
-            self._quantity: str = order_data["quantity"]
-        if "quantityCurrency" in order_data:
-            self._quantity_currency: str = order_data["quantityCurrency"]
-        if "totalSpend" in order_data:
-            self._total_spend: str = order_data["totalSpend"]
-        if "totalSpendCurrency" in order_data:
-            self._total_spend_currency: str = order_data["totalSpendCurrency"]
-        if "fee" in order_data:
-            self._fee: str = order_data["fee"]
-        if "feeCurrency" in order_data:
-            self._fee_currency: str = order_data["feeCurrency"]
-        if "fee_currency" in order_data:
-            self._fee_currency = order_data["fee_currency"]
-        if "depositFee" in order_data:
-            self._deposit_fee: str = order_data["depositFee"]
-        if "depositFeeCurrency" in order_data:
-            self._deposit_fee_currency: str = order_data["depositFeeCurrency"]
-        if "amount" in order_data:
-            self._amount: float = order_data["amount"]
-        if "aggressor" in order_data:
-            self._aggressor: bool = order_data["aggressor"]
-        if "fee_amount" in order_data:
-            self._fee_amount: str = order_data["fee_amount"]
-        if "tid" in order_data:
-            self._trade_id: int = order_data["tid"]
-        if "is_auction_fill" in order_data:
-            self._is_auction_fill: bool = order_data["is_auction_fill"]
-        if "is_clearing_fill" in order_data:
-            self._is_clearing_fill: bool = order_data["is_clearing_fill"]
-        if "break" in order_data:
-            self._break_type: str = order_data["break"]
-        if "result" in order_data:
-            self._result: str = order_data["result"]
-        if "reason" in order_data:
-            self._reason: str = order_data["reason"]
-        if "message" in order_data:
-            self._message: str = order_data["message"]
+        """,
+        post=_unpack_cancel_details,
+    )
 
     @property
     def order_id(self) -> Union[str, Dict[int, bool]]:
@@ -577,7 +569,8 @@ class Order:
         stop_price: Optional[str] = None,
         client_order_id: str = None,
         account: List[str] = ["primary"],
-    ) -> Order:
+        raw: Optional[bool] = None,
+    ) -> Union[Order, Dict[str, Any]]:
         """
         Method to create a new limit or stop-limit order
 
@@ -590,6 +583,8 @@ class Order:
             stop_price: The price to trigger a stop-limit order
             stop_limit: True if stop_price is provided
             client_order_id: Client-specified order if
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             Order object
@@ -613,21 +608,80 @@ class Order:
             data["client_order_id"] = client_order_id
 
         res = auth.make_request(endpoint=path, payload=data)
+        if auth.order_store is not None:
+            auth.order_store.update(res, account)
+        if is_raw(auth, raw):
+            return res
         return Order(auth=auth, order_data=res)
 
+    @classmethod
+    def place_orders(
+        cls,
+        auth: Authentication,
+        specs: List[Dict[str, Any]],
+        fail_fast: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[OrderResult]:
+        """
+        Method to place many limit or stop-limit orders concurrently
+
+        Orders share the pooled connections and rate limiter of the
+        authentication object and are signed with strictly increasing
+        nonces, in the order of specs as far as the rate limiter lets
+        them go. By default an authentication object sends one request
+        at a time so the nonces reach Gemini in order, and only the
+        preparation of the orders overlaps. Created with
+        ordered_nonces=False it sends them concurrently, and sends an
+        order once more when a later nonce arrived first. Nonces in
+        seconds advance by one per order, so with
+        them batches that would sign nonces beyond Gemini's window are
+        refused. Use an authentication object with millisecond_nonce
+        for large batches.
+
+        Args:
+            auth: Gemini authentication object
+            specs: Keyword arguments of new_order for each order, e.g.
+                {"symbol": "btcusd", "amount": "1", "price": "20000",
+                "side": "buy"}
+            fail_fast: Stop sending orders after the first failure,
+                orders not sent hold a CancelledError
+            max_workers: Maximum number of orders in flight, defaults
+                to the maximum limit of the adaptive concurrency limiter
+                of auth, or 10
+
+        Returns:
+            List of OrderResult objects in the order of specs
+
+        Raises:
+            ValueError: The batch could run nonces in seconds outside
+                the window Gemini accepts
+        """
+        auth.check_nonce_window(len(specs))
+        calls = [partial(cls.new_order, auth, **spec) for spec in specs]
+
+        return [
+            OrderResult(order, error)
+            for order, error in run_concurrently(
+                calls, _max_workers(auth, max_workers), fail_fast
+            )
+        ]
+
     @classmethod
     def cancel_order(
         cls,
         auth: Authentication,
         order_id: str,
         account: List[str] = ["primary"],
-    ) -> Order:
+        raw: Optional[bool] = None,
+    ) -> Union[Order, Dict[str, Any]]:
         """
         Method to cancel an order
 
         Args:
             auth: Gemini authentication object
             order_id: The order id
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             Order object
@@ -636,8 +690,98 @@ class Order:
 
         data = {"order_id": order_id, "account": account}
         res = auth.make_request(endpoint=path, payload=data)
+        if auth.order_store is not None:
+            auth.order_store.update(res, account)
+        if is_raw(auth, raw):
+            return res
         return Order(auth=auth, order_data=res)
 
+    @classmethod
+    def cancel_orders(
+        cls,
+        auth: Authentication,
+        order_ids: Optional[List[str]] = None,
+        client_order_ids: Optional[List[str]] = None,
+        fail_fast: bool = False,
+        max_workers: Optional[int] = None,
+        account: List[str] = ["primary"],
+    ) -> Dict[str, OrderResult]:
+        """
+        Method to cancel a set of orders concurrently, e.g. every open
+        btcusd bid below a price taken from an OrderStore
+
+        Client order ids are resolved from the OrderStore attached to
+        the authentication object when possible, otherwise with an
+        order status request before the cancel.
+
+        Args:
+            auth: Gemini authentication object
+            order_ids: The order ids to cancel
+            client_order_ids: Client-specified order ids to cancel
+            fail_fast: Stop sending cancels after the first failure,
+                cancels not sent hold a CancelledError
+            max_workers: Maximum number of cancels in flight, defaults
+                to the maximum limit of the adaptive concurrency limiter
+                of auth, or 10
+
+        Returns:
+            Dictionary of OrderResult objects keyed by the order id or
+            client order id given
+
+        Raises:
+            ValueError: The batch could run nonces in seconds outside
+                the window Gemini accepts
+        """
+        # a client order id may take a status request before its cancel
+        auth.check_nonce_window(
+            len(order_ids or []) + 2 * len(client_order_ids or [])
+        )
+        keys: List[str] = []
+        calls = []
+
+        for order_id in order_ids or []:
+            keys.append(order_id)
+            calls.append(partial(cls.cancel_order, auth, order_id, account))
+
+        for client_order_id in client_order_ids or []:
+            keys.append(client_order_id)
+            calls.append(
+                partial(
+                    cls._cancel_client_order, auth, client_order_id, account
+                )
+            )
+
+        results = run_concurrently(
+            calls, _max_workers(auth, max_workers), fail_fast
+        )
+        return {
+            key: OrderResult(order, error)
+            for key, (order, error) in zip(keys, results)
+        }
+
+    @classmethod
+    def _cancel_client_order(
+        cls, auth: Authentication, client_order_id: str, account: List[str]
+    ) -> Union[Order, Dict[str, Any]]:
+        order = None
+        if auth.order_store is not None:
+            order = auth.order_store.get_by_client_order_id(client_order_id)
+        if order is not None:
+            order_id = order.order_id
+        else:
+            res = auth.make_request(
+                endpoint="/v1/order/status",
+                payload={
+                    "client_order_id": client_order_id,
+                    "include_trades": False,
+                    "account": account,
+                },
+            )
+            if isinstance(res, list):
+                res = res[-1]
+            order_id = res["order_id"]
+        return cls.cancel_order(auth, str(order_id), account)
+
     @classmethod
     def wrap_order(
         cls,
@@ -647,7 +791,8 @@ class Order:
         symbol: str,
         client_order_id: str = None,
         account: List[str] = ["primary"],
-    ) -> Order:
+        raw: Optional[bool] = None,
+    ) -> Union[Order, Dict[str, Any]]:
         """
         Method to wrap or unwrap Gemini isued assets
 
@@ -657,6 +802,8 @@ class Order:
             side: Either "buy" or "sell"
             symbol: Trading pair
             client_order_id: Client-specified order id
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             Order object
@@ -674,29 +821,27 @@ class Order:
             data["client_order_id"] = client_order_id
 
         res = auth.make_request(endpoint=path, payload=data)
+        if is_raw(auth, raw):
+            return res
         return Order(auth=auth, order_data=res)
 
     @classmethod
-    def cancel_session_orders(
-        cls,
-        auth: Authentication,
-        account: List[str] = ["primary"],
+    def from_cancel_details(
+        cls, auth: Authentication, res: Dict[str, Any]
     ) -> List[Order]:
-
         """
-        Method to cancel all session orders
+        Method to build Order objects from the response of a cancel-all
+        request
 
         Args:
             auth: Gemini authentication object
+            res: Response containing "details" of cancelled orders
 
         Returns:
-            Order object
+            List of Order objects, with is_cancelled False for rejected
+            cancels
         """
-        path = "/v1/order/cancel/session"
-
-        res = auth.make_request(endpoint=path, payload={"account": account})
-
-        all_cancelled_session_orders = []
+        all_cancelled_orders = []
         orders: Dict[str, Any] = {}
         orders["order_id"] = {}
 
@@ -709,24 +854,29 @@ class Order:
                 for id in v:
                     orders["order_id"][id] = False
 
+        if auth.order_store is not None:
+            auth.order_store.mark_cancelled(
+                k for k, v in orders["order_id"].items() if v
+            )
+
         for k, v in orders["order_id"].items():
             new_dict: Dict[str, Any] = {}
             new_dict["order_id"] = {}
             new_dict["order_id"][k] = v
             obj = Order(auth=auth, order_data=new_dict)
-            all_cancelled_session_orders.append(obj)
+            all_cancelled_orders.append(obj)
 
-        return all_cancelled_session_orders
+        return all_cancelled_orders
 
     @classmethod
-    def cancel_active_orders(
+    def cancel_session_orders(
         cls,
         auth: Authentication,
         account: List[str] = ["primary"],
     ) -> List[Order]:
 
         """
-        Method to cancel all active orders
+        Method to cancel all session orders
 
         Args:
             auth: Gemini authentication object
@@ -734,31 +884,33 @@ class Order:
         Returns:
             Order object
         """
-        path = "/v1/order/cancel/all"
+        path = "/v1/order/cancel/session"
 
         res = auth.make_request(endpoint=path, payload={"account": account})
 
-        all_cancelled_active_orders = []
-        orders: Dict[str, Any] = {}
-        orders["order_id"] = {}
+        return cls.from_cancel_details(auth, res)
 
-        for k, v in res["details"].items():
-            if k == "cancelledOrders":
-                for id in v:
-                    orders["order_id"][id] = True
+    @classmethod
+    def cancel_active_orders(
+        cls,
+        auth: Authentication,
+        account: List[str] = ["primary"],
+    ) -> List[Order]:
 
-            if k == "cancelRejects":
-                for id in v:
-                    orders["order_id"][id] = False
+        """
+        Method to cancel all active orders
 
-        for k, v in orders["order_id"].items():
-            new_dict: Dict[str, Any] = {}
-            new_dict["order_id"] = {}
-            new_dict["order_id"][k] = v
-            obj = Order(auth=auth, order_data=new_dict)
-            all_cancelled_active_orders.append(obj)
+        Args:
+            auth: Gemini authentication object
+
+        Returns:
+            Order object
+        """
+        path = "/v1/order/cancel/all"
 
-        return all_cancelled_active_orders
+        res = auth.make_request(endpoint=path, payload={"account": account})
+
+        return cls.from_cancel_details(auth, res)
 
     @classmethod
     def order_status(
@@ -768,7 +920,8 @@ class Order:
         include_trades: bool,
         client_order_id: str = None,
         account: List[str] = ["primary"],
-    ) -> Order:
+        raw: Optional[bool] = None,
+    ) -> Union[Order, List[Order], Dict[str, Any], List[Any]]:
 
         """
         Method to get order status
@@ -781,9 +934,12 @@ class Order:
             order_id: The order id
             include_trades: Include trade details of all fills from the order
             client_order_id: Client-specified order
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
-            Order object
+            Order object, or a list of Order objects for every order
+            with the client order id
         """
         path = "/v1/order/status"
 
@@ -797,13 +953,25 @@ class Order:
             data["client_order_id"] = client_order_id
 
         res = auth.make_request(endpoint=path, payload=data)
+        if auth.order_store is not None:
+            auth.order_store.update(res, account)
+        if is_raw(auth, raw):
+            return res
+        if isinstance(res, list):
+            return [Order(auth=auth, order_data=data) for data in res]
         return Order(auth=auth, order_data=res)
 
     @classmethod
     def get_active_orders(
         cls, auth: Authentication,
         account: List[str] = ["primary"],
-    ) -> List[Order]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+    ) -> Union[
+        Sequence[Order], List[Tuple[Any, ...]], List[Any]
+    ]:
 
         """
         Method to get active orders
@@ -811,13 +979,31 @@ class Order:
         Args:
             auth: Gemini authentication object
             account: The name of the account within the subaccount group
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["price", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
 
         Returns:
             List of Order objects
         """
         path = "/v1/orders"
 
+        requested_at = time.monotonic()
         res = auth.make_request(endpoint=path, payload={"account": account})
+        if auth.order_store is not None:
+            auth.order_store.replace_active(res, account, requested_at)
+
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(Order, auth), weak_cache)
 
         all_active_orders = []
 
@@ -836,7 +1022,18 @@ class Order:
         limit_trades: int = None,
         timestamp: int = None,
         account: List[str] = ["primary"],
-    ) -> List[Order]:
+        raw: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        weak_cache: bool = False,
+        stream: bool = False,
+    ) -> Union[
+        Sequence[Order],
+        List[Tuple[Any, ...]],
+        List[Any],
+        Iterator[Order],
+        Iterator[Any],
+    ]:
 
         """
         Method to get past trades
@@ -848,9 +1045,19 @@ class Order:
             limit_trades: Maximum number of trades to return, min 50 max 500
             timestamp: Timestamp in milliseconds
             account: The name of the account within the subaccount group
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
+            fields: Keys kept in named tuples built instead of
+                objects, e.g. ["price", "amount"]
+            lazy: Return a LazySequence building objects only when
+                they are accessed
+            weak_cache: With lazy, keep built objects in a weak cache, so
+                objects still referenced are not built again
+            stream: Return an iterator decoding records as the response
+                arrives, which cannot be combined with fields or lazy
 
         Returns:
-            List of Order objects
+            List of Order objects, or an iterator if streamed
         """
         path = "/v1/mytrades"
 
@@ -865,8 +1072,18 @@ class Order:
         if limit_trades is not None:
             data["limit_trades"] = limit_trades
 
+        if stream:
+            return stream_records(auth, path, data, Order, raw, fields, lazy)
+
         res = auth.make_request(endpoint=path, payload=data)
 
+        if is_raw(auth, raw):
+            return res
+        if fields is not None:
+            return project(res, fields)
+        if lazy:
+            return LazySequence(res, partial(Order, auth), weak_cache)
+
         all_past_trades = []
 
         for i in range(len(res)):
@@ -879,13 +1096,16 @@ class Order:
     def revive_heartbeat(
         cls,
         auth: Authentication,
-    ) -> Order:
+        raw: Optional[bool] = None,
+    ) -> Union[Order, Dict[str, Any]]:
 
         """
         Method to revive the heartbeat
 
         Args:
             auth: Gemini authentication object
+            raw: Return the decoded response instead of objects,
+                defaults to auth.raw
 
         Returns:
             Order object
@@ -894,4 +1114,16 @@ class Order:
 
         res = auth.make_request(endpoint=path)
 
+        if is_raw(auth, raw):
+            return res
         return Order(auth=auth, order_data=res)
+
+
+def _max_workers(auth: Authentication, max_workers: Optional[int]) -> int:
+    # with an adaptive limiter the workers only bound the threads, the
+    # limiter decides how many requests are in flight
+    if max_workers is not None:
+        return max_workers
+    if auth.concurrency is not None:
+        return auth.concurrency.max_limit
+    return 10
@@ -1,8 +1,18 @@
-from typing import Any, Dict, List
+import time
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
 
 import requests
 
+from gemini_api.circuit_breaker import GROUP_PUBLIC, CircuitBreakers
+from gemini_api.compression import accept_encoding, record_payload
+from gemini_api.decoding import Decoder, get_decoder
+from gemini_api.hedging import HedgePolicy
+from gemini_api.instrumentation import Instrumentation, get_instrumentation
+from gemini_api.rate_limit import AdaptiveLimiter
+from gemini_api.single_flight import SingleFlight
 from gemini_api.utils import date_to_unix_ts
+from gemini_api.warm_up import KeepWarm, warm_up
 
 
 class Public:
@@ -10,11 +20,164 @@ class Public:
     Class to fetch public data from the Gemini REST API
     """
 
-    def __init__(self, sandbox: bool = False) -> None:
-        if sandbox:
+    def __init__(
+        self,
+        sandbox: bool = False,
+        url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        concurrency: Optional[AdaptiveLimiter] = None,
+        hedge: Optional[HedgePolicy] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        timeout: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+        decoder: Optional[Decoder] = None,
+        compression: Optional[Iterable[str]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        Initialise Public
+
+        Args:
+            sandbox: flag for connecting to Sandbox environment
+            url: Base URL of the v1 API overriding the sandbox flag, e.g.
+                the URL of a local stand-in server followed by "/v1"
+            session: HTTP session reused for every request, defaults to
+                a new pooled session
+            concurrency: AdaptiveLimiter bounding the public requests in
+                flight, adjusted from 429s and latency
+            hedge: HedgePolicy sending a second request when a response
+                is slower than usual, every public endpoint is idempotent
+            circuit_breakers: CircuitBreakers whose public group fails
+                requests fast while market data requests are failing
+            timeout: Seconds to wait for a response, None waits forever
+            single_flight: SingleFlight letting concurrent requests for
+                the same URL share one response
+            decoder: Decoder of response bodies, defaults to the fastest
+                installed JSON backend
+            compression: Response encodings accepted in order of
+                preference, e.g. ["gzip"], or an empty list for
+                uncompressed responses. Defaults to gzip, deflate and
+                br when brotli is installed, leaving the headers of a
+                given session unchanged
+            instrumentation: Instrumentation counting the bytes of
+                every response per endpoint, defaults to the shared one
+        """
+        if url is not None:
+            self.url = url.rstrip("/")
+        elif sandbox:
             self.url = "https://api.sandbox.gemini.com/v1"
         else:
             self.url = "https://api.gemini.com/v1"
+        self.session = session or requests.Session()
+        if session is None or compression is not None:
+            self.session.headers["Accept-Encoding"] = accept_encoding(
+                compression
+            )
+        self.concurrency = concurrency
+        self.hedge = hedge
+        self.circuit_breaker = (
+            None
+            if circuit_breakers is None
+            else circuit_breakers.get(GROUP_PUBLIC)
+        )
+        self.timeout = timeout
+        self.single_flight = single_flight
+        self.decoder = decoder or get_decoder()
+        self.instrumentation = instrumentation or get_instrumentation()
+
+    def _get(self, url: str, endpoint: str) -> requests.Response:
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                url, partial(self._guarded, url, endpoint)
+            )
+        return self._guarded(url, endpoint)
+
+    def _guarded(self, url: str, endpoint: str) -> requests.Response:
+        if self.circuit_breaker is None:
+            return self._hedged(url, endpoint)
+        probe = self.circuit_breaker.acquire()
+        success = False
+        try:
+            response = self._hedged(url, endpoint)
+            success = response.status_code < 500
+            return response
+        finally:
+            self.circuit_breaker.release(success, probe)
+
+    def _hedged(self, url: str, endpoint: str) -> requests.Response:
+        if self.hedge is not None:
+            return self.hedge.call(
+                partial(self._send, url, endpoint), _close, _failed
+            )
+        return self._send(url, endpoint)
+
+    def _send(self, url: str, endpoint: str) -> requests.Response:
+        if self.concurrency is None:
+            response = self.session.get(url, timeout=self.timeout)
+        else:
+            response = self._limited(self.concurrency, url)
+        record_payload(self.instrumentation, endpoint, response)
+        return response
+
+    def _limited(
+        self, concurrency: AdaptiveLimiter, url: str
+    ) -> requests.Response:
+        concurrency.acquire()
+        start = time.monotonic()
+        response = None
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        finally:
+            concurrency.release(
+                None if response is None else time.monotonic() - start,
+                response is not None and response.status_code == 429,
+            )
+        return response
+
+    def warm_up(self, connections: int = 4) -> int:
+        """
+        Resolves the API host and opens pooled connections to it, so the
+        first requests skip DNS, TCP and TLS setup
+
+        Args:
+            connections: Connections to open, at most the pool size of
+                the session
+
+        Returns:
+            Number of open connections in the pool
+        """
+        return warm_up(
+            self.session,
+            self.url + "/pubticker/btcusd",
+            connections,
+            self.timeout,
+            self.instrumentation,
+        )
+
+    def keep_warm(
+        self, interval: float = 30.0, connections: int = 4
+    ) -> KeepWarm:
+        """
+        Starts a background thread keeping pooled connections to the API
+        open through idle periods, with a ticker request on each idle
+        connection every interval
+
+        Args:
+            interval: Seconds between pings of the idle connections
+            connections: Connections to keep open, at most the pool size
+                of the session
+
+        Returns:
+            Started KeepWarm, stopped with its stop method
+        """
+        return KeepWarm(
+            self.session,
+            self.url + "/pubticker/btcusd",
+            connections,
+            interval,
+            self.timeout,
+            self.instrumentation,
+        ).start()
 
     def get_pairs(self) -> List[str]:
         """
@@ -24,8 +187,8 @@ class Public:
             List of trading pairs, e.g. "BTCGBP"
         """
 
-        data = requests.get(self.url + "/symbols")
-        pairs = data.json()
+        data = self._get(self.url + "/symbols", "/v1/symbols")
+        pairs = self.decoder.decode(data.content)
 
         return pairs
 
@@ -38,8 +201,10 @@ class Public:
         Returns:
             Dictionary containing the details of the trading pair
         """
-        data = requests.get(self.url + "/symbols/details/" + pair)
-        details = data.json()
+        data = self._get(
+            self.url + "/symbols/details/" + pair, "/v1/symbols/details"
+        )
+        details = self.decoder.decode(data.content)
         return details
 
     def get_ticker(self, pair: str) -> Dict[str, Any]:
@@ -54,8 +219,8 @@ class Public:
             Dictionary containing the details of the pair's recent trades
         """
 
-        data = requests.get(self.url + "/pubticker/" + pair)
-        ticker = data.json()
+        data = self._get(self.url + "/pubticker/" + pair, "/v1/pubticker")
+        ticker = self.decoder.decode(data.content)
         return ticker
 
     def get_ticker_prices(self, pair: str) -> Dict[str, Any]:
@@ -71,8 +236,8 @@ class Public:
             Dictionary containing the details of the pair's recent trades
         """
         v2_url = self.url.replace("v1", "v2")
-        data = requests.get(v2_url + "/ticker/" + pair)
-        ticker = data.json()
+        data = self._get(v2_url + "/ticker/" + pair, "/v2/ticker")
+        ticker = self.decoder.decode(data.content)
         return ticker
 
     def get_candles(self, pair: str, time_frame: str) -> List[List[float]]:
@@ -89,8 +254,10 @@ class Public:
             Nested lists of time-intervaled prices
         """
         v2_url = self.url.replace("v1", "v2")
-        data = requests.get(v2_url + "/candles/" + pair + "/" + time_frame)
-        candles = data.json()
+        data = self._get(
+            v2_url + "/candles/" + pair + "/" + time_frame, "/v2/candles"
+        )
+        candles = self.decoder.decode(data.content)
         return candles
 
     def get_order_book(self, pair: str) -> Dict[str, List[Dict[str, str]]]:
@@ -108,8 +275,8 @@ class Public:
         Returns:
             Dictionary with keys "bids" and "asks"
         """
-        data = requests.get(self.url + "/book/" + pair)
-        current_order_book = data.json()
+        data = self._get(self.url + "/book/" + pair, "/v1/book")
+        current_order_book = self.decoder.decode(data.content)
         return current_order_book
 
     def get_trades_history(
@@ -129,14 +296,15 @@ class Public:
         """
 
         if not since:
-            data = requests.get(self.url + "/trades/" + pair)
+            data = self._get(self.url + "/trades/" + pair, "/v1/trades")
         else:
             self.timestamp = date_to_unix_ts(since)
-            data = requests.get(
-                self.url + "/trades/{}?since={}".format(pair, self.timestamp)
+            data = self._get(
+                self.url + "/trades/{}?since={}".format(pair, self.timestamp),
+                "/v1/trades",
             )
 
-        trades_history = data.json()
+        trades_history = self.decoder.decode(data.content)
         return trades_history
 
     def get_current_auction(self, pair: str) -> Dict[str, Any]:
@@ -150,8 +318,8 @@ class Public:
         Returns:
             Dictionary of current auction information
         """
-        data = requests.get(self.url + "/auction/" + pair)
-        current_auction = data.json()
+        data = self._get(self.url + "/auction/" + pair, "/v1/auction")
+        current_auction = self.decoder.decode(data.content)
         return current_auction
 
     def get_auction_history(
@@ -172,15 +340,19 @@ class Public:
         """
 
         if not since:
-            data = requests.get(self.url + "/auction/" + pair + "/history")
+            data = self._get(
+                self.url + "/auction/" + pair + "/history",
+                "/v1/auction/history",
+            )
         else:
             self.timestamp = date_to_unix_ts(since)
-            data = requests.get(
+            data = self._get(
                 self.url
-                + "/auction/history/{}?since={}".format(pair, self.timestamp)
+                + "/auction/history/{}?since={}".format(pair, self.timestamp),
+                "/v1/auction/history",
             )
 
-        auction_history = data.json()
+        auction_history = self.decoder.decode(data.content)
         return auction_history
 
     def get_price_feed(self) -> List[Dict[str, str]]:
@@ -192,6 +364,14 @@ class Public:
             List of dictionaries containing the price and change in price
         """
 
-        data = requests.get(self.url + "/pricefeed")
-        price_feed = data.json()
+        data = self._get(self.url + "/pricefeed", "/v1/pricefeed")
+        price_feed = self.decoder.decode(data.content)
         return price_feed
+
+
+def _close(response: requests.Response) -> None:
+    response.close()
+
+
+def _failed(response: requests.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
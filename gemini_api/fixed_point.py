@@ -0,0 +1,550 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from decimal import Decimal
+from operator import mul
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from gemini_api.decoding import parse_scaled
+
+_MODULUS = sys.hash_info.modulus
+_INVERSE_10 = pow(10, _MODULUS - 2, _MODULUS)
+_INVERSE_POWERS: Dict[int, int] = {}
+_POWERS = [10**i for i in range(40)]
+
+
+def _power(exponent: int) -> int:
+    if exponent < len(_POWERS):
+        return _POWERS[exponent]
+    return 10**exponent
+
+
+class FixedPoint:
+    """
+    Class for an exact decimal number stored as an integer mantissa and
+    a scale, the number of decimal places: FixedPoint(2500012, 2) is
+    25000.12.
+
+    Values with the same scale add, subtract and compare as plain
+    integers, so parse every price and amount of a symbol at the scale
+    of its SymbolScale. Products keep every digit, with the scales
+    added, and quotients are rounded half-even to the larger scale of
+    the operands. Values compare and hash equal to int and Decimal
+    values of the same number.
+
+    Example:
+        price = FixedPoint.parse("25000.12", 8)
+        str(price * 2)  # "50000.24000000"
+    """
+
+    __slots__ = ["_mantissa", "_scale"]
+
+    def __init__(self, mantissa: int, scale: int = 0) -> None:
+        """
+        Initialise FixedPoint
+
+        Args:
+            mantissa: The number multiplied by 10 ** scale
+            scale: Number of decimal places
+        """
+        self._mantissa: int = mantissa
+        self._scale: int = scale
+
+    @classmethod
+    def parse(cls, text: str, scale: Optional[int] = None) -> FixedPoint:
+        """
+        Method to parse a decimal string, e.g. a price from the API
+
+        Args:
+            text: Decimal string e.g. "25000.12"
+            scale: Number of decimal places to keep, defaults to the
+                places of text
+
+        Returns:
+            FixedPoint object
+
+        Raises:
+            ValueError: text has more significant places than scale
+        """
+        if scale is None:
+            _, _, fraction = text.partition(".")
+            scale = len(fraction)
+        return cls(parse_scaled(text, scale), scale)
+
+    @classmethod
+    def parser(cls, scale: int) -> Callable[[str], FixedPoint]:
+        """
+        Method to create a parser of decimal strings at a fixed scale,
+        e.g. for the number argument of OrderBook or Decoder
+
+        Args:
+            scale: Number of decimal places to keep
+
+        Returns:
+            Callable parsing a decimal string into a FixedPoint
+        """
+
+        def parse(text: Union[str, Any]) -> FixedPoint:
+            if isinstance(text, FixedPoint):
+                return text.rescale(scale)
+            return cls(parse_scaled(str(text), scale), scale)
+
+        return parse
+
+    @property
+    def mantissa(self) -> int:
+        """
+        Property for the integer holding the digits of the number
+
+        Returns:
+            Number multiplied by 10 ** scale
+        """
+        return self._mantissa
+
+    @property
+    def scale(self) -> int:
+        """
+        Property for the number of decimal places
+
+        Returns:
+            Scale
+        """
+        return self._scale
+
+    def rescale(self, scale: int) -> FixedPoint:
+        """
+        Method to get the number with another number of decimal places,
+        rounding half-even when places are dropped
+
+        Args:
+            scale: Number of decimal places
+
+        Returns:
+            FixedPoint object
+        """
+        if scale == self._scale:
+            return self
+        if scale > self._scale:
+            return FixedPoint(
+                self._mantissa * _power(scale - self._scale), scale
+            )
+        return FixedPoint(
+            _divide(self._mantissa, _power(self._scale - scale)), scale
+        )
+
+    def to_decimal(self) -> Decimal:
+        """
+        Method to convert the number to a Decimal
+
+        Returns:
+            Decimal with the same digits
+        """
+        return Decimal(self._mantissa).scaleb(-self._scale)
+
+    def __str__(self) -> str:
+        mantissa, scale = self._mantissa, self._scale
+        if not scale:
+            return str(mantissa)
+        digits = str(abs(mantissa)).rjust(scale + 1, "0")
+        sign = "-" if mantissa < 0 else ""
+        return f"{sign}{digits[:-scale]}.{digits[-scale:]}"
+
+    def __repr__(self) -> str:
+        return f"FixedPoint('{self}')"
+
+    def __float__(self) -> float:
+        return self._mantissa / _power(self._scale)
+
+    def __int__(self) -> int:
+        mantissa = self._mantissa
+        quotient = abs(mantissa) // _power(self._scale)
+        return -quotient if mantissa < 0 else quotient
+
+    def __bool__(self) -> bool:
+        return self._mantissa != 0
+
+    def __hash__(self) -> int:
+        # the hash of the fraction mantissa / 10 ** scale, which is also
+        # the hash of equal int and Decimal values
+        inverse = _INVERSE_POWERS.get(self._scale)
+        if inverse is None:
+            inverse = pow(_INVERSE_10, self._scale, _MODULUS)
+            _INVERSE_POWERS[self._scale] = inverse
+        value = abs(self._mantissa) % _MODULUS * inverse % _MODULUS
+        if self._mantissa < 0:
+            value = -value
+        return -2 if value == -1 else value
+
+    def __neg__(self) -> FixedPoint:
+        return FixedPoint(-self._mantissa, self._scale)
+
+    def __pos__(self) -> FixedPoint:
+        return self
+
+    def __abs__(self) -> FixedPoint:
+        return FixedPoint(abs(self._mantissa), self._scale)
+
+    def __add__(self, other: Any) -> FixedPoint:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return FixedPoint(self._mantissa + other._mantissa, self._scale)
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return FixedPoint(a + b, scale)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> FixedPoint:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return FixedPoint(self._mantissa - other._mantissa, self._scale)
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return FixedPoint(a - b, scale)
+
+    def __rsub__(self, other: Any) -> FixedPoint:
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        a, b, scale = aligned
+        return FixedPoint(b - a, scale)
+
+    def __mul__(self, other: Any) -> FixedPoint:
+        if other.__class__ is FixedPoint:
+            return FixedPoint(
+                self._mantissa * other._mantissa, self._scale + other._scale
+            )
+        if isinstance(other, int):
+            return FixedPoint(self._mantissa * other, self._scale)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> FixedPoint:
+        if isinstance(other, int):
+            other = FixedPoint(other)
+        elif other.__class__ is not FixedPoint:
+            return NotImplemented
+        return _quotient(self, other)
+
+    def __rtruediv__(self, other: Any) -> FixedPoint:
+        if not isinstance(other, int):
+            return NotImplemented
+        return _quotient(FixedPoint(other), self)
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return self._mantissa == other._mantissa
+        if isinstance(other, Decimal):
+            return self.to_decimal() == other
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        return aligned[0] == aligned[1]
+
+    def __lt__(self, other: Any) -> bool:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return self._mantissa < other._mantissa
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        return aligned[0] < aligned[1]
+
+    def __le__(self, other: Any) -> bool:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return self._mantissa <= other._mantissa
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        return aligned[0] <= aligned[1]
+
+    def __gt__(self, other: Any) -> bool:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return self._mantissa > other._mantissa
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        return aligned[0] > aligned[1]
+
+    def __ge__(self, other: Any) -> bool:
+        if other.__class__ is FixedPoint and other._scale == self._scale:
+            return self._mantissa >= other._mantissa
+        aligned = _align(self, other)
+        if aligned is None:
+            return NotImplemented
+        return aligned[0] >= aligned[1]
+
+
+class FixedPointColumn:
+    """
+    Class for a column of fixed-point numbers sharing one scale, e.g.
+    the prices or amounts of a page of trades.
+
+    Mantissas are stored in an int64 array, so totals, extremes and
+    comparisons run over plain integers without a Python object per
+    value, several times faster than the same operations on Decimal.
+
+    Example:
+        amounts = FixedPointColumn.parse(
+            [trade["amount"] for trade in trades], 8
+        )
+        str(amounts.sum())
+    """
+
+    __slots__ = ["_mantissas", "_scale"]
+
+    def __init__(self, scale: int, mantissas: Iterable[int] = ()) -> None:
+        """
+        Initialise FixedPointColumn
+
+        Args:
+            scale: Number of decimal places of every value
+            mantissas: Values multiplied by 10 ** scale
+        """
+        self._scale: int = scale
+        self._mantissas: array[int] = array("q", mantissas)
+
+    @classmethod
+    def parse(cls, texts: Iterable[str], scale: int) -> FixedPointColumn:
+        """
+        Method to parse decimal strings into a column
+
+        Args:
+            texts: Decimal strings e.g. ["0.5", "1.25"]
+            scale: Number of decimal places to keep
+
+        Returns:
+            FixedPointColumn object
+        """
+        return cls(scale, [parse_scaled(text, scale) for text in texts])
+
+    @property
+    def scale(self) -> int:
+        """
+        Property for the number of decimal places of every value
+
+        Returns:
+            Scale
+        """
+        return self._scale
+
+    @property
+    def mantissas(self) -> array[int]:
+        """
+        Property for the int64 array of values multiplied by
+        10 ** scale
+
+        Returns:
+            array of typecode "q"
+        """
+        return self._mantissas
+
+    def __len__(self) -> int:
+        return len(self._mantissas)
+
+    def __getitem__(self, index: int) -> FixedPoint:
+        return FixedPoint(self._mantissas[index], self._scale)
+
+    def __iter__(self) -> Iterator[FixedPoint]:
+        scale = self._scale
+        return (FixedPoint(mantissa, scale) for mantissa in self._mantissas)
+
+    def append(self, value: Union[str, FixedPoint]) -> None:
+        """
+        Method to add a value at the end of the column
+
+        Args:
+            value: Decimal string or FixedPoint
+        """
+        if isinstance(value, FixedPoint):
+            self._mantissas.append(value.rescale(self._scale).mantissa)
+        else:
+            self._mantissas.append(parse_scaled(value, self._scale))
+
+    def sum(self) -> FixedPoint:
+        """
+        Method to add every value of the column
+
+        Returns:
+            FixedPoint total
+        """
+        return FixedPoint(sum(self._mantissas), self._scale)
+
+    def min(self) -> FixedPoint:
+        """
+        Method to get the smallest value of the column
+
+        Returns:
+            FixedPoint
+        """
+        return FixedPoint(min(self._mantissas), self._scale)
+
+    def max(self) -> FixedPoint:
+        """
+        Method to get the largest value of the column
+
+        Returns:
+            FixedPoint
+        """
+        return FixedPoint(max(self._mantissas), self._scale)
+
+    def dot(self, other: FixedPointColumn) -> FixedPoint:
+        """
+        Method to add the products of the values of two columns, e.g.
+        the notional of prices and amounts
+
+        Args:
+            other: Column of the same length
+
+        Returns:
+            FixedPoint total with the scales of both columns added
+        """
+        if len(other) != len(self):
+            raise ValueError("Columns must have the same length")
+        return FixedPoint(
+            sum(map(mul, self._mantissas, other._mantissas)),
+            self._scale + other._scale,
+        )
+
+    def to_strings(self) -> List[str]:
+        """
+        Method to format every value as a wire string
+
+        Returns:
+            List of decimal strings
+        """
+        return [str(value) for value in self]
+
+
+def _align(value: FixedPoint, other: Any) -> Any:
+    if other.__class__ is FixedPoint:
+        scale = max(value._scale, other._scale)
+        return (
+            value._mantissa * _power(scale - value._scale),
+            other._mantissa * _power(scale - other._scale),
+            scale,
+        )
+    if isinstance(other, int) and not isinstance(other, bool):
+        return value._mantissa, other * _power(value._scale), value._scale
+    return None
+
+
+def _divide(numerator: int, denominator: int) -> int:
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def _quotient(dividend: FixedPoint, divisor: FixedPoint) -> FixedPoint:
+    if not divisor._mantissa:
+        raise ZeroDivisionError("FixedPoint division by zero")
+    scale = max(dividend._scale, divisor._scale)
+    exponent = divisor._scale + scale - dividend._scale
+    return FixedPoint(
+        _divide(dividend._mantissa * _power(exponent), divisor._mantissa),
+        scale,
+    )
+
+
+def _places(increment: Any) -> int:
+    exponent = Decimal(str(increment)).normalize().as_tuple().exponent
+    return max(0, -exponent)  # type: ignore[operator]
+
+
+class SymbolScale(NamedTuple):
+    """
+    Decimal places of the prices and amounts of a trading pair
+
+    Attributes:
+        symbol: Trading pair e.g. "btcusd"
+        price_scale: Decimal places of prices, from the quote increment
+        amount_scale: Decimal places of amounts, from the tick size
+    """
+
+    symbol: str
+    price_scale: int
+    amount_scale: int
+
+    @classmethod
+    def from_pair_details(cls, details: Dict[str, Any]) -> SymbolScale:
+        """
+        Method to derive the scales from a Public.get_pair_details
+        response
+
+        Args:
+            details: Dictionary with "symbol", "quote_increment" and
+                "tick_size"
+
+        Returns:
+            SymbolScale object
+        """
+        return cls(
+            details["symbol"].lower(),
+            _places(details["quote_increment"]),
+            _places(details["tick_size"]),
+        )
+
+    @property
+    def scale(self) -> int:
+        """
+        Property for a scale holding both prices and amounts exactly
+
+        Returns:
+            The larger of price_scale and amount_scale
+        """
+        return max(self.price_scale, self.amount_scale)
+
+    def number(self) -> Callable[[str], FixedPoint]:
+        """
+        Method to create a parser for both prices and amounts, e.g. for
+        the number argument of OrderBook, SnapshotDiffer or Decoder
+
+        Returns:
+            Callable parsing a decimal string at the combined scale
+        """
+        return FixedPoint.parser(self.scale)
+
+    def price(self, text: str) -> FixedPoint:
+        """
+        Method to parse a price of the trading pair
+
+        Args:
+            text: Decimal string
+
+        Returns:
+            FixedPoint at the price scale
+        """
+        return FixedPoint(
+            parse_scaled(text, self.price_scale), self.price_scale
+        )
+
+    def amount(self, text: str) -> FixedPoint:
+        """
+        Method to parse an amount of the trading pair
+
+        Args:
+            text: Decimal string
+
+        Returns:
+            FixedPoint at the amount scale
+        """
+        return FixedPoint(
+            parse_scaled(text, self.amount_scale), self.amount_scale
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+
+SESSION_TIMEOUT = 30.0
+
+
+class HeartbeatKeeper:
+    """
+    Class that keeps a "Requires Heartbeat" API session alive from a
+    background thread.
+
+    Any private request resets the exchange's 30 second timer, so a
+    heartbeat is only sent after the authentication object has been
+    idle for the interval. While orders are being placed or cancelled no
+    heartbeats are sent and no rate limit budget is spent. Heartbeats
+    reuse the pooled connection and nonce source of the authentication
+    object.
+
+    Failures call on_miss with the exception, or with None when the
+    session has been silent for longer than the exchange timeout.
+
+    Example:
+        keeper = HeartbeatKeeper(auth, on_miss=alert)
+        keeper.start()
+    """
+
+    def __init__(
+        self,
+        auth: Authentication,
+        interval: float = 15.0,
+        on_miss: Optional[Callable[[Optional[BaseException]], None]] = None,
+        check_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialise HeartbeatKeeper
+
+        Args:
+            auth: Gemini authentication object of the heartbeat session
+            interval: Seconds of inactivity before a heartbeat is sent,
+                must be well below the 30 second session timeout
+            on_miss: Callable invoked when a heartbeat fails or the
+                session timeout has passed without a response
+            check_interval: Seconds between checks for inactivity
+        """
+        if interval >= SESSION_TIMEOUT:
+            raise ValueError(
+                f"Heartbeat interval must be below {SESSION_TIMEOUT} seconds"
+            )
+        self._auth: Authentication = auth
+        self._interval: float = interval
+        self._check_interval: float = check_interval
+        self.on_miss = on_miss
+
+        self._last_heartbeat_at: Optional[float] = None
+        self._last_heartbeat_latency: Optional[float] = None
+        self._heartbeats: int = 0
+        self._misses: int = 0
+        self._started_at: float = time.monotonic()
+        self._alerted: bool = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def last_heartbeat_at(self) -> Optional[float]:
+        """
+        Property for the time of the last successful heartbeat
+
+        Returns:
+            Unix time in seconds or None if no heartbeat was needed yet
+        """
+        return self._last_heartbeat_at
+
+    @property
+    def last_heartbeat_latency(self) -> Optional[float]:
+        """
+        Property for the round trip time of the last successful
+        heartbeat
+
+        Returns:
+            Latency in seconds or None if no heartbeat was needed yet
+        """
+        return self._last_heartbeat_latency
+
+    @property
+    def heartbeats(self) -> int:
+        """
+        Property for the number of heartbeats sent successfully
+
+        Returns:
+            Number of heartbeats
+        """
+        return self._heartbeats
+
+    @property
+    def misses(self) -> int:
+        """
+        Property for the number of failed heartbeats
+
+        Returns:
+            Number of misses
+        """
+        return self._misses
+
+    def idle_for(self) -> float:
+        """
+        Method to get the time since the exchange last answered a private
+        request of the session
+
+        Returns:
+            Seconds of inactivity
+        """
+        last = self._auth.last_request_at
+        return time.monotonic() - (
+            self._started_at if last is None else max(last, self._started_at)
+        )
+
+    def start(self) -> None:
+        """
+        Method to start the background thread
+        """
+        self._started_at = time.monotonic()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to stop the background thread
+
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def beat(self) -> bool:
+        """
+        Method to send a heartbeat right away
+
+        Returns:
+            True if the exchange acknowledged the heartbeat
+        """
+        start = time.perf_counter()
+        try:
+            heartbeat = Order.revive_heartbeat(self._auth, raw=False)
+            if not isinstance(heartbeat, Order) or heartbeat.result != "ok":
+                raise ValueError(f"Unexpected heartbeat result: {heartbeat}")
+        except Exception as exc:
+            self._miss(exc)
+            return False
+        self._last_heartbeat_latency = time.perf_counter() - start
+        self._last_heartbeat_at = time.time()
+        self._heartbeats += 1
+        self._alerted = False
+        return True
+
+    def _miss(self, error: Optional[BaseException]) -> None:
+        self._misses += 1
+        if self.on_miss is not None:
+            self.on_miss(error)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._check_interval):
+            idle = self.idle_for()
+            if idle < self._interval:
+                continue
+            if not self.beat() and not self._alerted:
+                if self.idle_for() >= SESSION_TIMEOUT:
+                    # the exchange has most likely cancelled the session
+                    # orders by now
+                    self._alerted = True
+                    self._miss(None)
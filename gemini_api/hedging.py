@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Class for hedging idempotent requests to cut tail latency.
+
+    A request that has not completed within a percentile of recent
+    latencies is sent again, and the first successful response wins.
+    Responses the failed callable rejects, e.g. 5xx or 429 responses,
+    lose to the other attempt and are not kept as latencies. The slower
+    response is discarded when it arrives, which releases its
+    connection. Latencies and the hedge delay are timed from when a
+    worker starts the request, so time spent waiting for a free worker
+    neither skews the percentile nor triggers hedges. Every request
+    earns `budget` hedge credits and a hedge spends one, so hedges add
+    at most that fraction of extra load.
+
+    Only use with requests that are safe to send twice, such as the
+    public GET endpoints.
+
+    Example:
+        public = Public(hedge=HedgePolicy(percentile=0.9, budget=0.05))
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.001,
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Initialise HedgePolicy
+
+        Args:
+            percentile: Percentile of recent latencies after which a
+                hedge is sent, between 0 and 1
+            budget: Hedges allowed per request, e.g. 0.05 for at most
+                5% extra requests
+            window: Number of recent latencies kept
+            min_samples: Latencies needed before hedging starts
+            min_delay: Shortest delay before a hedge in seconds
+            max_workers: Maximum number of requests in flight
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self._percentile: float = percentile
+        self._budget: float = budget
+        self._max_credit: float = max(1.0, budget * window)
+        self._credit: float = 0.0
+        self._min_samples: int = min_samples
+        self._min_delay: float = min_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._requests: int = 0
+        self._hedges: int = 0
+        self._hedge_wins: int = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+
+    @property
+    def requests(self) -> int:
+        """
+        Property for the number of requests made through the policy
+
+        Returns:
+            Number of requests, not counting hedges
+        """
+        return self._requests
+
+    @property
+    def hedges(self) -> int:
+        """
+        Property for the number of hedges sent
+
+        Returns:
+            Number of hedges
+        """
+        return self._hedges
+
+    @property
+    def hedge_wins(self) -> int:
+        """
+        Property for the number of hedges that answered first
+
+        Returns:
+            Number of hedges that won
+        """
+        return self._hedge_wins
+
+    def delay(self) -> Optional[float]:
+        """
+        Method to get the time after which a request is hedged
+
+        Returns:
+            Delay in seconds or None until enough latencies are known
+        """
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self._percentile))
+        return max(self._min_delay, latencies[index])
+
+    def call(
+        self,
+        request: Callable[[], T],
+        discard: Optional[Callable[[T], None]] = None,
+        failed: Optional[Callable[[T], bool]] = None,
+    ) -> T:
+        """
+        Method to make a request, hedging it if it is slow
+
+        Args:
+            request: Callable making the request and returning the
+                response
+            discard: Callable releasing a response that lost the race
+            failed: Callable returning True for a response that must
+                not win while the other attempt may still succeed
+
+        Returns:
+            The first successful response, or the last failed one when
+            no attempt succeeded
+        """
+        delay = self.delay()
+        with self._lock:
+            self._requests += 1
+            self._credit = min(self._max_credit, self._credit + self._budget)
+
+        started = threading.Event()
+        primary = self._submit(request, failed, started)
+        if delay is None:
+            return primary.result()
+        # the delay only runs once a worker has picked the request up
+        while not started.wait(0.01):
+            if primary.done():
+                break
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._spend():
+            return primary.result()
+
+        hedge = self._submit(request, failed)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        failure: Optional[Future[T]] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exception = future.exception()
+                if exception is not None:
+                    error = exception
+                    continue
+                result = future.result()
+                if failed is not None and failed(result):
+                    if failure is not None and discard is not None:
+                        discard(failure.result())
+                    failure = future
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._hedge_wins += 1
+                for loser in pending:
+                    if discard is not None:
+                        loser.add_done_callback(_discarder(discard))
+                    loser.cancel()
+                if failure is not None and discard is not None:
+                    discard(failure.result())
+                return result
+        if failure is not None:
+            return failure.result()
+        assert error is not None
+        raise error
+
+    def shutdown(self) -> None:
+        """
+        Method to stop the worker threads once requests in flight finish
+        """
+        self._executor.shutdown(wait=False)
+
+    def _submit(
+        self,
+        request: Callable[[], T],
+        failed: Optional[Callable[[T], bool]],
+        started: Optional[threading.Event] = None,
+    ) -> Future[T]:
+        def timed() -> T:
+            start = time.perf_counter()
+            if started is not None:
+                started.set()
+            result = request()
+            if failed is None or not failed(result):
+                latency = time.perf_counter() - start
+                with self._lock:
+                    self._latencies.append(latency)
+            return result
+
+        return self._executor.submit(timed)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            self._hedges += 1
+            return True
+
+
+def _discarder(discard: Callable[[T], None]) -> Callable[[Future[T]], None]:
+    def callback(future: Future[T]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            discard(future.result())
+
+    return callback
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[str, Dict[str, Any]], None]
+
+
+class Instrumentation:
+    """
+    Class collecting counters, gauges and events from the client.
+
+    Hooks are called with the event name and a dictionary describing the
+    event, from the thread that emitted it, and should return quickly.
+    An exception raised by a hook is logged and does not reach the
+    request that emitted the event.
+
+    Example:
+        instrumentation = get_instrumentation()
+        instrumentation.add_hook(lambda event, data: print(event, data))
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise Instrumentation
+        """
+        self._hooks: List[Hook] = []
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Method to call a hook for every event
+
+        Args:
+            hook: Callable taking the event name and event data
+        """
+        with self._lock:
+            self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook: Hook) -> None:
+        """
+        Method to stop calling a hook
+
+        Args:
+            hook: Callable added with add_hook
+        """
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def emit(self, event: str, **data: Any) -> None:
+        """
+        Method to count an event and pass it to every hook
+
+        Args:
+            event: Event name e.g. "circuit_breaker.state_change"
+            data: Event details
+        """
+        self.increment(event)
+        for hook in self._hooks:
+            try:
+                hook(event, data)
+            except Exception:
+                logger.exception("Instrumentation hook failed on %s", event)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Method to add to a counter
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Method to set a gauge
+
+        Args:
+            name: Gauge name
+            value: Current value
+        """
+        self._gauges[name] = value
+
+    def counters(self) -> Dict[str, float]:
+        """
+        Method to get a copy of the counters
+
+        Returns:
+            Dictionary of counter values keyed by name
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def gauges(self) -> Dict[str, float]:
+        """
+        Method to get a copy of the gauges
+
+        Returns:
+            Dictionary of gauge values keyed by name
+        """
+        return dict(self._gauges)
+
+    def reset(self) -> None:
+        """
+        Method to clear the counters and gauges, keeping the hooks
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+_default = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """
+    Gets the Instrumentation used by client objects that are not given
+    their own
+
+    Returns:
+        Shared Instrumentation
+    """
+    return _default
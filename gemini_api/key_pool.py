@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from gemini_api.authentication import Authentication
+from gemini_api.decoding import Decoder
+from gemini_api.rate_limit import AdaptiveLimiter
+from gemini_api.single_flight import is_read_only
+
+if TYPE_CHECKING:
+    from gemini_api.order_store import OrderStore
+
+LEAST_LOADED = "least_loaded"
+ROUND_ROBIN = "round_robin"
+
+
+class KeyPool:
+    """
+    Class spreading private requests across several API keys.
+
+    Gemini's rate limits apply per key, and every Authentication object
+    in the pool keeps its own nonce, rate limiter and connections.
+    Requests to read-only endpoints go to the least loaded key, or to
+    each key in turn. Orders, cancels, heartbeats and other writes are
+    pinned to the order key, which owns the API session, so session
+    cancels and heartbeats keep working.
+
+    A KeyPool can be passed wherever an Authentication object is
+    expected. Every key must be able to read the same data, e.g. keys
+    of the same account, or master keys combined with the account
+    parameter of the endpoints.
+
+    Example:
+        pool = KeyPool([trading_auth, reporting_auth_1, reporting_auth_2])
+        FundManagement.get_transfers(pool)
+        Order.new_order(pool, ...)
+    """
+
+    def __init__(
+        self,
+        auths: List[Authentication],
+        strategy: str = LEAST_LOADED,
+        order_auth: Optional[Authentication] = None,
+    ) -> None:
+        """
+        Initialise KeyPool
+
+        Args:
+            auths: Authentication objects of the keys read requests are
+                spread across
+            strategy: LEAST_LOADED or ROUND_ROBIN
+            order_auth: Authentication object order requests are pinned
+                to, defaults to the first of auths
+        """
+        if not auths:
+            raise ValueError("A key pool needs at least one key")
+        if strategy not in (LEAST_LOADED, ROUND_ROBIN):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self._auths: List[Authentication] = list(auths)
+        self._strategy: str = strategy
+        self._order_auth: Authentication = order_auth or auths[0]
+        keys = self._auths + [self._order_auth]
+        self._in_flight: Dict[int, int] = {id(a): 0 for a in keys}
+        self._requests: Dict[int, int] = {id(a): 0 for a in keys}
+        self._next: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def auths(self) -> List[Authentication]:
+        """
+        Property for the Authentication objects read requests are spread
+        across
+
+        Returns:
+            List of Authentication objects
+        """
+        return list(self._auths)
+
+    @property
+    def order_auth(self) -> Authentication:
+        """
+        Property for the Authentication object order requests are
+        pinned to
+
+        Returns:
+            Authentication
+        """
+        return self._order_auth
+
+    @property
+    def url(self) -> str:
+        """
+        Property for the base URL of the API
+
+        Returns:
+            Base URL of the order key
+        """
+        return self._order_auth.url
+
+    @property
+    def order_store(self) -> Optional[OrderStore]:
+        """
+        Property for the OrderStore kept up to date from order responses
+
+        Returns:
+            OrderStore of the order key or None
+        """
+        return self._order_auth.order_store
+
+    @property
+    def concurrency(self) -> Optional[AdaptiveLimiter]:
+        """
+        Property for the adaptive limit on order requests in flight
+
+        Returns:
+            AdaptiveLimiter of the order key or None
+        """
+        return self._order_auth.concurrency
+
+    @property
+    def decoder(self) -> Decoder:
+        """
+        Property for the decoder of response bodies
+
+        Returns:
+            Decoder of the order key
+        """
+        return self._order_auth.decoder
+
+    @property
+    def raw(self) -> bool:
+        """
+        Property for the default of endpoint calls returning the decoded
+        response without building objects
+
+        Returns:
+            Raw flag of the order key
+        """
+        return self._order_auth.raw
+
+    @property
+    def last_request_at(self) -> Optional[float]:
+        """
+        Property for the time the exchange last answered a request made
+        with the order key, which keeps its session alive
+
+        Returns:
+            time.monotonic() value or None if no request was made
+        """
+        return self._order_auth.last_request_at
+
+    def next_nonce(self) -> int:
+        """
+        Creates a nonce of the order key
+
+        Returns:
+            Nonce
+        """
+        return self._order_auth.next_nonce()
+
+    def check_nonce_window(self, count: int) -> None:
+        """
+        Checks that a batch of requests can be signed with the order
+        key without running its nonce outside the window Gemini accepts
+
+        Args:
+            count: Number of requests in the batch
+
+        Raises:
+            ValueError: The batch could sign a nonce more than
+                NONCE_WINDOW seconds ahead of the current time
+        """
+        self._order_auth.check_nonce_window(count)
+
+    def signed_headers(
+        self, endpoint: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Creates the headers authenticating a request with the order key
+
+        Args:
+            endpoint: String to add to base URL
+            payload: Data to pass into encoded payload
+
+        Returns:
+            Dictionary of request headers
+        """
+        return self._order_auth.signed_headers(endpoint, payload)
+
+    def requests_by_key(self) -> Dict[str, int]:
+        """
+        Method to get the number of requests sent with each key
+
+        Returns:
+            Dictionary of request counts keyed by public key
+        """
+        with self._lock:
+            return {
+                auth.public_key: self._requests[id(auth)]
+                for auth in self._auths + [self._order_auth]
+            }
+
+    def select(self, endpoint: str) -> Authentication:
+        """
+        Method to choose the key a request is sent with
+
+        Args:
+            endpoint: Endpoint path e.g. "/v1/mytrades"
+
+        Returns:
+            Authentication object of the key
+        """
+        with self._lock:
+            return self._select(endpoint)
+
+    def warm_up(self, connections: int = 4) -> int:
+        """
+        Method to open pooled connections of every key ahead of the
+        first requests
+
+        Args:
+            connections: Connections to open per key
+
+        Returns:
+            Number of open connections across the keys
+        """
+        keys = self._auths + [
+            auth for auth in [self._order_auth] if auth not in self._auths
+        ]
+        return sum(auth.warm_up(connections) for auth in keys)
+
+    def make_request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        decode: bool = True,
+    ) -> Any:
+        """
+        Makes a request to an endpoint in the API with the key chosen
+        for it
+
+        Args:
+            endpoint: String to add to base URL
+            payload: Data to pass into encoded payload
+            decode: False returns the response body as bytes
+
+        Returns:
+            Decoded response data, or the body as bytes when decode is
+            False
+        """
+        with self._lock:
+            auth = self._select(endpoint)
+            self._in_flight[id(auth)] += 1
+            self._requests[id(auth)] += 1
+        try:
+            return auth.make_request(endpoint, payload, decode)
+        finally:
+            with self._lock:
+                self._in_flight[id(auth)] -= 1
+
+    def stream_request(
+        self,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[Any]:
+        """
+        Makes a request to an endpoint returning a JSON array with the
+        key chosen for it, decoding the records as they arrive
+
+        Args:
+            endpoint: String to add to base URL
+            payload: Data to pass into encoded payload
+            chunk_size: Bytes read from the connection at a time
+
+        Returns:
+            Iterator of response records
+        """
+        with self._lock:
+            auth = self._select(endpoint)
+            self._requests[id(auth)] += 1
+        return auth.stream_request(endpoint, payload, chunk_size)
+
+    def _select(self, endpoint: str) -> Authentication:
+        if not is_read_only(endpoint):
+            return self._order_auth
+        if self._strategy == ROUND_ROBIN:
+            auth = self._auths[self._next]
+            self._next = (self._next + 1) % len(self._auths)
+            return auth
+        return min(
+            self._auths,
+            key=lambda a: (self._in_flight[id(a)], -a.rate_limiter.available),
+        )
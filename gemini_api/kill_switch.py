@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from gemini_api.authentication import Authentication, retry_invalid_nonce
+from gemini_api.endpoints.order import Order
+
+CANCEL_ALL_ENDPOINT = "/v1/order/cancel/all"
+CANCEL_SESSION_ENDPOINT = "/v1/order/cancel/session"
+
+
+class KillSwitch:
+    """
+    Class for a dedicated low-latency path to cancel every active order.
+
+    The kill switch owns a single pooled connection that is kept warm
+    by a background health probe, and a request prepared once at start
+    up. Firing only signs the payload and sends it: it does not wait on
+    the rate limiter or any other client-side queue of the
+    authentication object, and does not share its connection pool.
+
+    Example:
+        switch = KillSwitch(auth)
+        switch.start()
+        ...
+        cancelled = switch.fire()
+    """
+
+    def __init__(
+        self,
+        auth: Authentication,
+        account: List[str] = ["primary"],
+        session_only: bool = False,
+        health_interval: float = 10.0,
+        probe_path: str = "/v1/pubticker/btcusd",
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Initialise KillSwitch
+
+        Args:
+            auth: Gemini authentication object
+            account: The name of the account within the subaccount group
+            session_only: Cancel only the orders of this API session
+                instead of every active order
+            health_interval: Seconds between health probes
+            probe_path: Public endpoint requested to keep the connection
+                warm
+            timeout: Timeout in seconds for the cancel and probe requests
+        """
+        self._auth: Authentication = auth
+        self._account: List[str] = account
+        self._endpoint: str = (
+            CANCEL_SESSION_ENDPOINT if session_only else CANCEL_ALL_ENDPOINT
+        )
+        self._health_interval: float = health_interval
+        self._probe_url: str = auth.url + probe_path
+        self._timeout: float = timeout
+
+        self._template: requests.PreparedRequest = requests.Request(
+            "POST",
+            auth.url + self._endpoint,
+            headers={
+                "Content-Type": "text/plain",
+                "Content-Length": "0",
+                "Cache-Control": "no-cache",
+            },
+        ).prepare()
+        self._session: requests.Session = self._new_session()
+        self._lock = threading.Lock()
+        self._healthy: bool = False
+        self._last_probe_at: Optional[float] = None
+        self._last_probe_latency: Optional[float] = None
+        self._last_fire_latency: Optional[float] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def healthy(self) -> bool:
+        """
+        Property for the result of the last health probe
+
+        Returns:
+            True if the last probe succeeded
+        """
+        return self._healthy
+
+    @property
+    def last_probe_at(self) -> Optional[float]:
+        """
+        Property for the time of the last health probe
+
+        Returns:
+            Unix time in seconds or None if never probed
+        """
+        return self._last_probe_at
+
+    @property
+    def last_probe_latency(self) -> Optional[float]:
+        """
+        Property for the round trip time of the last health probe
+
+        Returns:
+            Latency in seconds or None if never probed
+        """
+        return self._last_probe_latency
+
+    @property
+    def last_fire_latency(self) -> Optional[float]:
+        """
+        Property for the end-to-end time of the last fire, from signing
+        to the decoded response
+
+        Returns:
+            Latency in seconds or None if never fired
+        """
+        return self._last_fire_latency
+
+    def start(self) -> None:
+        """
+        Method to warm the connection and start the background health
+        probe
+        """
+        self.probe()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to stop the health probe and close the connection
+
+        Args:
+            timeout: Seconds to wait for the probe thread to finish
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            self._session.close()
+
+    def probe(self) -> bool:
+        """
+        Method to check the connection with a public request, opening a
+        new connection if the previous one failed
+
+        Returns:
+            True if the probe succeeded
+        """
+        start = time.perf_counter()
+        try:
+            response = self._session.get(
+                self._probe_url, timeout=self._timeout
+            )
+            healthy = response.ok
+        except requests.RequestException:
+            healthy = False
+        self._last_probe_latency = time.perf_counter() - start
+        self._last_probe_at = time.time()
+        self._healthy = healthy
+        if not healthy:
+            with self._lock:
+                self._session.close()
+                self._session = self._new_session()
+        return healthy
+
+    def fire(self) -> List[Order]:
+        """
+        Method to cancel every active order, or every session order,
+        right away
+
+        A cancel rejected with InvalidNonce, because a concurrent
+        request of the authentication object was signed with a later
+        nonce, is signed and sent again.
+
+        Returns:
+            List of Order objects, with is_cancelled False for rejected
+            cancels
+        """
+        start = time.perf_counter()
+        # the lock keeps probe from closing the session mid-request
+        with self._lock:
+            response = retry_invalid_nonce(self._send)
+        response.raise_for_status()
+        res = self._auth.decoder.decode(response.content)
+        self._last_fire_latency = time.perf_counter() - start
+        return Order.from_cancel_details(self._auth, res)
+
+    def _send(self) -> requests.Response:
+        request = self._template.copy()
+        request.headers.update(
+            self._auth.signed_headers(
+                self._endpoint, {"account": self._account}
+            )
+        )
+        return self._session.send(request, timeout=self._timeout)
+
+    def _monitor(self) -> None:
+        while not self._stopped.wait(self._health_interval):
+            self.probe()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    overload,
+)
+from weakref import WeakValueDictionary
+
+T = TypeVar("T")
+
+
+class LazySequence(Sequence[T]):
+    """
+    Class for a read-only sequence building its items from response
+    records only when they are accessed.
+
+    Filtering or paging through a large result then only pays for the
+    objects it touches, and every access builds a new object. With the
+    weak cache, accessing the same record twice returns the same object
+    for as long as the caller holds it, and slices share the cache of
+    the sequence they were taken from, at the cost of a cache lookup
+    per access.
+
+    Example:
+        trades = Order.get_past_trades(auth, "btcusd", lazy=True)
+        len(trades)  # no Order built
+        trades[-10:]  # 10 Orders built on access
+
+        records = Order.get_past_trades(auth, "btcusd", raw=True)
+        trades = LazySequence(records, partial(Order, auth), True)
+    """
+
+    __slots__ = ["_records", "_factory", "_cache"]
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        factory: Callable[[Dict[str, Any]], T],
+        weak_cache: bool = False,
+        _cache: Optional[WeakValueDictionary[int, T]] = None,
+    ) -> None:
+        """
+        Initialise LazySequence
+
+        Args:
+            records: Decoded response records
+            factory: Callable building an item from a record, e.g.
+                partial(Order, auth)
+            weak_cache: Keep built items in a weak cache, so items still
+                referenced are not built again
+        """
+        self._records: List[Dict[str, Any]] = records
+        self._factory: Callable[[Dict[str, Any]], T] = factory
+        self._cache: Optional[WeakValueDictionary[int, T]] = _cache
+        if _cache is None and weak_cache:
+            self._cache = WeakValueDictionary()
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Property for the records items are built from
+
+        Returns:
+            List of decoded response records
+        """
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> LazySequence[T]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[T, LazySequence[T]]:
+        if isinstance(index, slice):
+            return LazySequence(
+                self._records[index], self._factory, _cache=self._cache
+            )
+        return self._build(self._records[index])
+
+    def __iter__(self) -> Iterator[T]:
+        for record in self._records:
+            yield self._build(record)
+
+    def __repr__(self) -> str:
+        return f"LazySequence({len(self._records)} records)"
+
+    def _build(self, record: Dict[str, Any]) -> T:
+        if self._cache is None:
+            return self._factory(record)
+        # records are kept alive by the sequence, so their ids are stable
+        key = id(record)
+        item = self._cache.get(key)
+        if item is None:
+            item = self._cache.setdefault(key, self._factory(record))
+        return item
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import json
+import threading
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from gemini_api.endpoints.public import Public
+from gemini_api.order_book import OrderBook
+from gemini_api.websocket import WebSocket, WebSocketError
+
+GEMINI_MARKET_DATA_URL = "wss://api.gemini.com/v2/marketdata"
+GEMINI_SANDBOX_MARKET_DATA_URL = "wss://api.sandbox.gemini.com/v2/marketdata"
+
+
+class MarketDataClient:
+    """
+    Class that streams Gemini market data v2 over one multiplexed
+    WebSocket connection and keeps a local OrderBook per symbol.
+
+    Books are updated incrementally from l2 deltas on the client's
+    reader thread, and callbacks are invoked from that thread with the
+    live book. book and books return copies, which other threads can
+    read safely. When messages carry a socket_sequence and a gap is
+    detected in it, every book is rebuilt from a REST snapshot fetched
+    on a separate thread. Deltas received from the gap on are buffered
+    and replayed on top of the snapshot. l2 deltas hold the new amount
+    of a price level, so each level ends at its last buffered amount,
+    which is either newer than the snapshot or equal to it. After a
+    reconnect the full book sent with the new subscription replaces
+    local state.
+
+    Example:
+        client = MarketDataClient(["BTCUSD", "ETHUSD"], on_book=print)
+        client.start()
+        client.book("BTCUSD").best_bid
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        sandbox: bool = False,
+        candles: Iterable[str] = (),
+        on_book: Optional[Callable[[str, OrderBook], None]] = None,
+        on_trade: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_candle: Optional[Callable[[str, str, List[Any]], None]] = None,
+        public: Optional[Public] = None,
+        url: Optional[str] = None,
+        number: Callable[[str], Any] = Decimal,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        """
+        Initialise MarketDataClient
+
+        Args:
+            symbols: Trading pairs e.g. ["BTCUSD", "ETHUSD"]
+            sandbox: flag for connecting to Sandbox environment
+            candles: Candle time frames to subscribe to e.g. ["1m"]
+            on_book: Callable invoked with the symbol and book after
+                every l2 update
+            on_trade: Callable invoked with each trade message
+            on_candle: Callable invoked with the symbol, time frame and
+                each candle as [time, open, high, low, close, volume]
+            public: Public client used for REST snapshots on resync
+            url: WebSocket URL, overrides the sandbox flag
+            number: Callable used to parse price and amount strings
+            reconnect_delay: Seconds to wait before reconnecting
+        """
+        self._symbols: List[str] = [symbol.upper() for symbol in symbols]
+        self._candles: List[str] = list(candles)
+        self._url: str = url or (
+            GEMINI_SANDBOX_MARKET_DATA_URL
+            if sandbox
+            else GEMINI_MARKET_DATA_URL
+        )
+        self._public: Public = public or Public(sandbox=sandbox)
+        self._number: Callable[[str], Any] = number
+        self._reconnect_delay: float = reconnect_delay
+
+        self.on_book = on_book
+        self.on_trade = on_trade
+        self.on_candle = on_candle
+
+        self._books: Dict[str, OrderBook] = {}
+        self._lock = threading.RLock()
+        self._sequence: Optional[int] = None
+        self._resyncs: int = 0
+        # gap count when each symbol last needed a snapshot
+        self._pending: Dict[str, int] = {}
+        # l2 changes received since then, replayed onto the snapshot
+        self._buffered: Dict[str, List[List[Any]]] = {}
+        self._gaps: int = 0
+        self._resync_thread: Optional[threading.Thread] = None
+        self._ws: Optional[WebSocket] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def books(self) -> Dict[str, OrderBook]:
+        """
+        Property for copies of the local order books
+
+        Returns:
+            Dictionary of OrderBook objects keyed by symbol
+        """
+        with self._lock:
+            return {
+                symbol: book.copy() for symbol, book in self._books.items()
+            }
+
+    @property
+    def resyncs(self) -> int:
+        """
+        Property for the number of REST resyncs performed
+
+        Returns:
+            Number of resyncs
+        """
+        return self._resyncs
+
+    def book(self, symbol: str) -> OrderBook:
+        """
+        Method to get a copy of the local order book of a symbol, which
+        is not changed by later updates
+
+        Args:
+            symbol: Trading pair e.g. "BTCUSD"
+
+        Returns:
+            OrderBook object
+        """
+        with self._lock:
+            return self._books[symbol.upper()].copy()
+
+    def start(self) -> None:
+        """
+        Method to connect and process messages on a background thread
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to close the connection and stop the background thread
+
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self._stopped.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self) -> None:
+        """
+        Method to connect, subscribe and process messages on the current
+        thread until stop is called, reconnecting after failures
+        """
+        while not self._stopped.is_set():
+            ws = WebSocket(self._url)
+            try:
+                ws.connect()
+                self._ws = ws
+                ws.send(json.dumps(self._subscribe_message(self._symbols)))
+                while not self._stopped.is_set():
+                    self.handle_message(json.loads(ws.recv()))
+            except (OSError, WebSocketError, ValueError):
+                pass
+            finally:
+                self._ws = None
+                ws.close()
+                self._sequence = None
+            self._stopped.wait(self._reconnect_delay)
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        """
+        Method to add symbols to the multiplexed subscription
+
+        Args:
+            symbols: Trading pairs e.g. ["SOLUSD"]
+        """
+        new = [s.upper() for s in symbols if s.upper() not in self._symbols]
+        self._symbols.extend(new)
+        ws = self._ws
+        if new and ws is not None:
+            ws.send(json.dumps(self._subscribe_message(new)))
+
+    def resync(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """
+        Method to rebuild local books from Public.get_order_book
+
+        Deltas of a symbol received while its snapshot is fetched are
+        buffered and replayed onto the snapshot.
+
+        Args:
+            symbols: Trading pairs to resync, defaults to every symbol
+        """
+        symbols = [s.upper() for s in symbols or self._symbols]
+        with self._lock:
+            for symbol in symbols:
+                self._pending.setdefault(symbol, self._gaps)
+                self._buffered.setdefault(symbol, [])
+        for symbol in symbols:
+            with self._lock:
+                gap = self._pending.get(symbol, self._gaps)
+            snapshot = self._public.get_order_book(symbol.lower())
+            with self._lock:
+                book = self._books.get(symbol)
+                if book is None:
+                    book = self._books[symbol] = OrderBook(
+                        symbol, self._number
+                    )
+                book.load_snapshot(snapshot)
+                if self._pending.get(symbol) == gap:
+                    # no gap since the request, so the buffered deltas
+                    # bring the snapshot up to date
+                    del self._pending[symbol]
+                    for side, price, amount in self._buffered.pop(symbol, []):
+                        book.update(side, price, amount)
+        with self._lock:
+            self._resyncs += 1
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """
+        Method to apply a decoded market data message to the local
+        state and invoke callbacks
+
+        Args:
+            message: Decoded market data message
+        """
+        with self._lock:
+            sequence = message.get("socket_sequence")
+            if sequence is not None:
+                expected = self._sequence
+                self._sequence = sequence
+                if expected is not None and sequence != expected + 1:
+                    self._start_resync()
+
+            kind = message.get("type", "")
+            if kind == "l2_updates":
+                self._handle_l2(message)
+            elif kind == "trade":
+                if self.on_trade is not None:
+                    self.on_trade(message)
+            elif kind.startswith("candles_") and kind.endswith("_updates"):
+                if self.on_candle is not None:
+                    time_frame = kind[len("candles_") : -len("_updates")]
+                    for candle in message.get("changes", []):
+                        self.on_candle(message["symbol"], time_frame, candle)
+
+    def _start_resync(self) -> None:
+        self._gaps += 1
+        for symbol in self._symbols:
+            self._pending[symbol] = self._gaps
+            # deltas before the gap may be older than changes it lost
+            self._buffered[symbol] = []
+        thread = self._resync_thread
+        if thread is None or not thread.is_alive():
+            self._resync_thread = threading.Thread(
+                target=self._resync_pending, daemon=True
+            )
+            self._resync_thread.start()
+
+    def _resync_pending(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                symbols = list(self._pending)
+                if not symbols:
+                    self._resync_thread = None
+                    return
+            try:
+                self.resync(symbols)
+            except Exception:
+                # deltas stay buffered until a snapshot succeeds
+                self._stopped.wait(self._reconnect_delay)
+
+    def _handle_l2(self, message: Dict[str, Any]) -> None:
+        symbol = message["symbol"]
+        book = self._books.get(symbol)
+        if book is None or "trades" in message:
+            # the first l2 message after subscribing holds the full book
+            # and the most recent trades
+            book = self._books[symbol] = OrderBook(symbol, self._number)
+            self._pending.pop(symbol, None)
+            self._buffered.pop(symbol, None)
+        elif symbol in self._pending:
+            self._buffered[symbol].extend(message.get("changes", []))
+            return
+        for side, price, amount in message.get("changes", []):
+            book.update(side, price, amount)
+
+        if self.on_trade is not None:
+            for trade in message.get("trades", []):
+                self.on_trade(trade)
+        if self.on_book is not None:
+            self.on_book(symbol, book)
+
+    def _subscribe_message(self, symbols: List[str]) -> Dict[str, Any]:
+        subscriptions = [{"name": "l2", "symbols": symbols}]
+        subscriptions.extend(
+            {"name": f"candles_{time_frame}", "symbols": symbols}
+            for time_frame in self._candles
+        )
+        return {"type": "subscribe", "subscriptions": subscriptions}
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+MAX_SHAPES = 64
+
+INTERNED_KEYS: FrozenSet[str] = frozenset(
+    [
+        "symbol",
+        "pair",
+        "exchange",
+        "side",
+        "type",
+        "currency",
+        "fee_currency",
+        "feeCurrency",
+        "priceCurrency",
+        "quantityCurrency",
+        "totalSpendCurrency",
+        "depositFeeCurrency",
+        "status",
+        "method",
+        "network",
+        "eventType",
+        "base_currency",
+        "notional_currency",
+        "fxPair",
+        "provider",
+        "benchmark",
+    ]
+)
+
+_interned_keys: FrozenSet[str] = INTERNED_KEYS
+_resets: List[Callable[[], None]] = []
+_lock = threading.Lock()
+
+
+class Field(NamedTuple):
+    """
+    Specification of a response field kept by a model class
+
+    Attributes:
+        key: Key of the field in the response
+        attribute: Slot the value is stored in, e.g. "_price"
+        convert: Callable applied to the value before it is stored
+    """
+
+    key: str
+    attribute: str
+    convert: Optional[Callable[[Any], Any]] = None
+
+
+def interned_keys() -> FrozenSet[str]:
+    """
+    Gets the response keys whose string values are interned by model
+    constructors
+
+    Returns:
+        Set of keys
+    """
+    return _interned_keys
+
+
+def set_interned_keys(keys: Iterable[str]) -> None:
+    """
+    Sets the response keys whose string values are interned by model
+    constructors, e.g. low-cardinality fields repeated across thousands
+    of records such as symbol and currency. Each distinct value is then
+    stored once instead of once per record
+
+    Args:
+        keys: Response keys, e.g. INTERNED_KEYS | {"purpose"}, or an
+            empty set to turn interning off
+    """
+    global _interned_keys
+    with _lock:
+        _interned_keys = frozenset(keys)
+        for reset in _resets:
+            reset()
+
+
+def intern_value(value: Any) -> Any:
+    """
+    Interns a string, so equal strings share one object
+
+    Args:
+        value: Any value
+
+    Returns:
+        The interned string, or value if it is not a string
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+def model_slots(fields: Sequence[Field], *extra: str) -> List[str]:
+    """
+    Creates the __slots__ of a model class from its fields, so every
+    attribute set by the constructor has a slot
+
+    Args:
+        fields: Field specifications of the class
+        extra: Further attributes the class sets itself
+
+    Returns:
+        List of unique attribute names, in order
+    """
+    slots: List[str] = []
+    for attribute in [field.attribute for field in fields] + list(extra):
+        if attribute not in slots:
+            slots.append(attribute)
+    return slots
+
+
+def model_init(
+    fields: Sequence[Field],
+    data: str,
+    doc: Optional[str] = None,
+    post: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+) -> Callable[..., None]:
+    """
+    Generates the constructor of a model class from its fields
+
+    Records of the same endpoint share their keys and key order, so the
+    constructor compiles a setter per key order: straight-line code
+    unpacking the values of the record into the slots of its fields in
+    one pass, without a membership test per field. Records that are not
+    dictionaries, or key orders beyond MAX_SHAPES, use a general setter
+    testing each field in turn. Fields are set in order, so a later
+    field with the same attribute overrides an earlier one. String
+    values of the keys set with set_interned_keys are interned.
+
+    Args:
+        fields: Field specifications of the class
+        data: Name of the response parameter, e.g. "order_data"
+        doc: Docstring of the constructor
+        post: Callable taking the object and the response, called
+            after the fields are set for values that need more than a
+            conversion
+
+    Returns:
+        __init__ function taking self, auth and the response
+    """
+    if not data.isidentifier():
+        raise ValueError(f"Invalid parameter name: {data}")
+    for field in fields:
+        if not field.attribute.isidentifier():
+            raise ValueError(f"Invalid attribute name: {field.attribute}")
+
+    namespace: Dict[str, Any] = {
+        "_post": post,
+        "_intern": intern_value,
+        "_sys_intern": sys.intern,
+    }
+    for i, field in enumerate(fields):
+        namespace[f"_convert_{i}"] = field.convert
+    shapes: Dict[Tuple[Any, ...], Callable[[Any, Dict[str, Any]], None]] = {}
+
+    def general() -> Callable[[Any, Dict[str, Any]], None]:
+        lines = ["def _set_fields(self, data):"]
+        for i, field in enumerate(fields):
+            value = _value(i, field, f"data[{field.key!r}]")
+            lines.append(f"    if {field.key!r} in data:")
+            lines.append(f"        self.{field.attribute} = {value}")
+        return _compile(lines, post, namespace)
+
+    def shape(keys: Tuple[Any, ...]) -> Callable[[Any, Dict[str, Any]], None]:
+        if len(shapes) >= MAX_SHAPES:
+            return namespace["_general"]
+        names = [f"v{i}" for i in range(len(keys))]
+        position = {key: name for key, name in zip(keys, names)}
+        lines = ["def _set_fields(self, data):"]
+        if keys:
+            lines.append(f"    {', '.join(names)}, = data.values()")
+        for i, field in enumerate(fields):
+            if field.key in position:
+                value = _value(i, field, position[field.key])
+                lines.append(f"    self.{field.attribute} = {value}")
+        setter = _compile(lines, post, namespace)
+        shapes[keys] = setter
+        return setter
+
+    def reset() -> None:
+        # recompiled with the interned keys in force
+        shapes.clear()
+        namespace["_general"] = general()
+
+    namespace.update(_shape=shape, _shapes=shapes)
+    with _lock:
+        reset()
+        _resets.append(reset)
+    source = f"""def __init__(self, auth, {data}):
+    if type({data}) is not dict:
+        return _general(self, {data})
+    keys = tuple({data})
+    try:
+        setter = _shapes[keys]
+    except KeyError:
+        setter = _shape(keys)
+    setter(self, {data})
+"""
+    exec(source, namespace)
+    init = namespace["__init__"]
+    init.__doc__ = doc
+    return init
+
+
+def _value(index: int, field: Field, value: str) -> str:
+    if field.convert is not None:
+        value = f"_convert_{index}({value})"
+    if field.key not in _interned_keys:
+        return value
+    if not value.isidentifier():
+        return f"_intern({value})"
+    # intern_value inlined for the unpacked values of shape setters
+    return f"(_sys_intern({value}) if {value}.__class__ is str else {value})"
+
+
+def _compile(
+    lines: List[str],
+    post: Optional[Callable[[Any, Dict[str, Any]], None]],
+    namespace: Dict[str, Any],
+) -> Callable[[Any, Dict[str, Any]], None]:
+    if post is not None:
+        lines.append("    _post(self, data)")
+    lines.append("    return None")
+    local: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace, local)
+    return local["_set_fields"]
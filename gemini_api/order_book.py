@@ -0,0 +1,634 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from itertools import accumulate
+from operator import itemgetter, mul
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+BUY = "buy"
+SELL = "sell"
+
+ADD = "add"
+UPDATE = "update"
+REMOVE = "remove"
+
+
+class FillEstimate(NamedTuple):
+    """
+    Expected result of sweeping one side of the book for a given size
+
+    Attributes:
+        size: Requested amount
+        filled: Amount the visible book can fill (less than size when
+            the book is too shallow)
+        avg_price: Volume weighted average price of the fill
+        worst_price: Price of the last level touched by the fill
+        slippage_bps: Distance between avg_price and the best price in
+            basis points, always positive for an adverse fill
+    """
+
+    size: Any
+    filled: Any
+    avg_price: Optional[Any]
+    worst_price: Optional[Any]
+    slippage_bps: Optional[Any]
+
+
+class LevelChange(NamedTuple):
+    """
+    Change to a single price level between two order book states
+
+    Attributes:
+        side: "bids" or "asks"
+        action: "add", "update" or "remove"
+        price: Level price
+        amount: New amount at the level, zero for removed levels
+    """
+
+    side: str
+    action: str
+    price: Any
+    amount: Any
+
+
+class BookSide:
+    """
+    Class holding one side of an order book as price levels sorted
+    best price first.
+
+    Levels are keyed so that ascending keys are always best first (ask
+    prices as they are, bid prices negated), which lets both sides share
+    the same bisect based lookups. Cumulative amount and notional arrays
+    are built once per book state and reused for every estimate until
+    the side is updated again.
+    """
+
+    __slots__ = ["_descending", "_keys", "_levels", "_depth"]
+
+    def __init__(self, descending: bool) -> None:
+        """
+        Initialise BookSide
+
+        Args:
+            descending: True for bids (best price is the highest)
+        """
+        self._descending: bool = descending
+        self._keys: List[Any] = []
+        self._levels: Dict[Any, Any] = {}
+        self._depth: Optional[Tuple[List[Any], List[Any], List[Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return iter(self.levels())
+
+    def _key(self, price: Any) -> Any:
+        return -price if self._descending else price
+
+    def levels(self) -> List[Tuple[Any, Any]]:
+        """
+        Method to list the price levels of the side
+
+        Returns:
+            List of (price, amount) tuples, best price first
+        """
+        prices, _, _ = self._cumulative()
+        levels = self._levels
+        return [(price, levels[self._key(price)]) for price in prices]
+
+    def best(self) -> Optional[Any]:
+        """
+        Method to get the best price of the side
+
+        Returns:
+            Best price or None if the side is empty
+        """
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return -key if self._descending else key
+
+    def update(self, price: Any, amount: Any) -> None:
+        """
+        Method to set the amount resting at a price level, removing the
+        level when the amount is zero
+
+        Args:
+            price: Level price
+            amount: New amount at the level
+        """
+        key = self._key(price)
+        if not amount:
+            if self._levels.pop(key, None) is not None:
+                del self._keys[bisect_left(self._keys, key)]
+                self._depth = None
+            return
+        if key not in self._levels:
+            insort(self._keys, key)
+        self._levels[key] = amount
+        self._depth = None
+
+    def replace(self, levels: Iterable[Tuple[Any, Any]]) -> None:
+        """
+        Method to replace every level of the side at once
+
+        Args:
+            levels: Iterable of (price, amount) tuples in any order
+        """
+        key = self._key
+        self._levels = {
+            key(price): amount for price, amount in levels if amount
+        }
+        self._keys = sorted(self._levels)
+        self._depth = None
+
+    def copy(self) -> BookSide:
+        """
+        Method to copy the side, e.g. to read it on another thread while
+        this one keeps being updated
+
+        Returns:
+            BookSide with the same levels
+        """
+        side = BookSide(self._descending)
+        side._keys = self._keys[:]
+        side._levels = dict(self._levels)
+        # the cumulative arrays are replaced, never changed in place
+        side._depth = self._depth
+        return side
+
+    def _cumulative(self) -> Tuple[List[Any], List[Any], List[Any]]:
+        if self._depth is None:
+            keys = self._keys
+            amounts = [self._levels[key] for key in keys]
+            prices = [-key for key in keys] if self._descending else keys[:]
+            self._depth = (
+                prices,
+                list(accumulate(amounts)),
+                list(accumulate(map(mul, prices, amounts))),
+            )
+        return self._depth
+
+    def estimate_fills(self, sizes: Sequence[Any]) -> List[FillEstimate]:
+        """
+        Method to estimate the fill of a market sweep for each size
+
+        Args:
+            sizes: Amounts to sweep through the side
+
+        Returns:
+            List of FillEstimate objects in the order of sizes
+        """
+        prices, cum_amounts, cum_notional = self._cumulative()
+        if not prices:
+            return [FillEstimate(size, 0, None, None, None) for size in sizes]
+
+        best = prices[0]
+        total = cum_amounts[-1]
+        last = len(prices) - 1
+        sign = -1 if self._descending else 1
+        estimates = []
+
+        for size in sizes:
+            if size <= 0:
+                estimates.append(FillEstimate(size, 0, None, None, None))
+                continue
+            filled = size if size < total else total
+            idx = bisect_left(cum_amounts, filled)
+            if idx > last:
+                idx = last
+            notional = prices[idx] * (
+                filled - (cum_amounts[idx - 1] if idx else 0)
+            )
+            if idx:
+                notional += cum_notional[idx - 1]
+            avg_price = notional / filled
+            slippage = sign * (avg_price - best) / best * 10000
+            estimates.append(
+                FillEstimate(size, filled, avg_price, prices[idx], slippage)
+            )
+
+        return estimates
+
+    def fillable_amounts(self, limit_prices: Sequence[Any]) -> List[Any]:
+        """
+        Method to get the amount resting at or better than each price
+
+        Args:
+            limit_prices: Limit prices of hypothetical orders
+
+        Returns:
+            List of amounts in the order of limit_prices
+        """
+        _, cum_amounts, _ = self._cumulative()
+        keys = self._keys
+        amounts = []
+        for price in limit_prices:
+            idx = bisect_right(keys, self._key(price))
+            amounts.append(cum_amounts[idx - 1] if idx else 0)
+        return amounts
+
+
+class OrderBook:
+    """
+    Class holding a local copy of the order book for a trading pair.
+
+    Prices and amounts are parsed once, with Decimal by default, so
+    repeated estimates never go back to the string levels returned by
+    Public.get_order_book.
+    """
+
+    __slots__ = ["_symbol", "_number", "_bids", "_asks"]
+
+    def __init__(
+        self, symbol: str = "", number: Callable[[str], Any] = Decimal
+    ) -> None:
+        """
+        Initialise OrderBook
+
+        Args:
+            symbol: Trading pair e.g. "btcusd"
+            number: Callable used to parse price and amount strings
+        """
+        self._symbol: str = symbol
+        self._number: Callable[[str], Any] = number
+        self._bids: BookSide = BookSide(descending=True)
+        self._asks: BookSide = BookSide(descending=False)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        symbol: str,
+        snapshot: Mapping[str, List[Dict[str, str]]],
+        number: Callable[[str], Any] = Decimal,
+    ) -> OrderBook:
+        """
+        Method to build an order book from a Public.get_order_book
+        response
+
+        Args:
+            symbol: Trading pair e.g. "btcusd"
+            snapshot: Dictionary with keys "bids" and "asks"
+            number: Callable used to parse price and amount strings
+
+        Returns:
+            OrderBook object
+        """
+        book = cls(symbol=symbol, number=number)
+        book.load_snapshot(snapshot)
+        return book
+
+    @property
+    def symbol(self) -> str:
+        """
+        Property for the trading pair of the book
+
+        Returns:
+            Trading pair
+        """
+        return self._symbol
+
+    @property
+    def bids(self) -> BookSide:
+        """
+        Property for the bid side of the book
+
+        Returns:
+            BookSide with the highest bid first
+        """
+        return self._bids
+
+    @property
+    def asks(self) -> BookSide:
+        """
+        Property for the ask side of the book
+
+        Returns:
+            BookSide with the lowest ask first
+        """
+        return self._asks
+
+    @property
+    def best_bid(self) -> Optional[Any]:
+        """
+        Property for the highest bid price
+
+        Returns:
+            Best bid or None if there are no bids
+        """
+        return self._bids.best()
+
+    @property
+    def best_ask(self) -> Optional[Any]:
+        """
+        Property for the lowest ask price
+
+        Returns:
+            Best ask or None if there are no asks
+        """
+        return self._asks.best()
+
+    def side(self, side: str) -> BookSide:
+        """
+        Method to get a side of the book by name
+
+        Args:
+            side: "bids"/"buy" or "asks"/"sell"
+
+        Returns:
+            BookSide object
+        """
+        if side in ("bids", "bid", BUY):
+            return self._bids
+        if side in ("asks", "ask", SELL):
+            return self._asks
+        raise ValueError(f"Unknown order book side: {side}")
+
+    def copy(self) -> OrderBook:
+        """
+        Method to copy the book, e.g. to read it on another thread while
+        this one keeps being updated
+
+        Returns:
+            OrderBook with the same levels
+        """
+        book = OrderBook(self._symbol, self._number)
+        book._bids = self._bids.copy()
+        book._asks = self._asks.copy()
+        return book
+
+    def load_snapshot(
+        self, snapshot: Mapping[str, List[Dict[str, str]]]
+    ) -> None:
+        """
+        Method to replace the book with a Public.get_order_book response
+
+        Args:
+            snapshot: Dictionary with keys "bids" and "asks"
+        """
+        number = self._number
+        for name, side in (("bids", self._bids), ("asks", self._asks)):
+            side.replace(
+                (number(level["price"]), number(level["amount"]))
+                for level in snapshot.get(name, [])
+            )
+
+    def update(self, side: str, price: str, amount: str) -> None:
+        """
+        Method to apply a single level change to the book
+
+        Args:
+            side: "bids"/"buy" or "asks"/"sell"
+            price: Level price as a string
+            amount: New amount at the level, "0" removes the level
+        """
+        self.side(side).update(self._number(price), self._number(amount))
+
+    def apply_changes(self, changes: Iterable[LevelChange]) -> None:
+        """
+        Method to apply level changes produced by diff_snapshots or
+        SnapshotDiffer to the book
+
+        Args:
+            changes: Iterable of LevelChange objects
+        """
+        bids, asks = self._bids, self._asks
+        for change in changes:
+            side = bids if change.side == "bids" else asks
+            side.update(change.price, change.amount)
+
+    def estimate_fills(
+        self, side: str, sizes: Sequence[Union[str, Any]]
+    ) -> List[FillEstimate]:
+        """
+        Method to estimate the average fill price and slippage of an
+        order sweeping the book, for many candidate sizes at once
+
+        Args:
+            side: Side of the order, "buy" walks the asks and "sell"
+                walks the bids
+            sizes: Candidate order amounts
+
+        Returns:
+            List of FillEstimate objects in the order of sizes
+        """
+        return self._taker_side(side).estimate_fills(self._parse(sizes))
+
+    def fillable_amounts(
+        self, side: str, limit_prices: Sequence[Union[str, Any]]
+    ) -> List[Any]:
+        """
+        Method to get the amount an order could take immediately at or
+        better than each limit price
+
+        Args:
+            side: Side of the order, "buy" or "sell"
+            limit_prices: Candidate limit prices
+
+        Returns:
+            List of amounts in the order of limit_prices
+        """
+        return self._taker_side(side).fillable_amounts(
+            self._parse(limit_prices)
+        )
+
+    def _taker_side(self, side: str) -> BookSide:
+        if side == BUY:
+            return self._asks
+        if side == SELL:
+            return self._bids
+        raise ValueError(f"Order side must be 'buy' or 'sell', not {side}")
+
+    def _parse(self, values: Sequence[Union[str, Any]]) -> List[Any]:
+        number = self._number
+        return [
+            number(value) if isinstance(value, str) else value
+            for value in values
+        ]
+
+
+def estimate_fills(
+    books: Mapping[str, Union[OrderBook, Mapping[str, Any]]],
+    side: str,
+    sizes: Union[Sequence[Any], Mapping[str, Sequence[Any]]],
+) -> Dict[str, List[FillEstimate]]:
+    """
+    Estimates fills for a batch of trading pairs in one call
+
+    Args:
+        books: OrderBook objects or Public.get_order_book responses
+            keyed by trading pair
+        side: Side of the orders, "buy" or "sell"
+        sizes: Candidate sizes shared by every pair, or a dictionary of
+            candidate sizes keyed by trading pair
+
+    Returns:
+        Dictionary of FillEstimate lists keyed by trading pair
+    """
+    estimates = {}
+    for pair, book in books.items():
+        if not isinstance(book, OrderBook):
+            book = OrderBook.from_snapshot(pair, book)
+        pair_sizes = sizes[pair] if isinstance(sizes, Mapping) else sizes
+        estimates[pair] = book.estimate_fills(side, pair_sizes)
+    return estimates
+
+
+_ParsedLevels = List[Tuple[Any, Any, str]]
+
+
+def _parse_levels(
+    levels: List[Dict[str, str]],
+    descending: bool,
+    number: Callable[[str], Any],
+) -> _ParsedLevels:
+    parsed = []
+    for level in levels:
+        price = number(level["price"])
+        parsed.append(
+            (-price if descending else price, price, level["amount"])
+        )
+    # Gemini returns levels best first, so this is a single linear pass
+    # over already ordered data rather than a full sort
+    parsed.sort(key=itemgetter(0))
+    return parsed
+
+
+def _merge_levels(
+    side: str,
+    old: _ParsedLevels,
+    new: _ParsedLevels,
+    number: Callable[[str], Any],
+) -> List[LevelChange]:
+    changes = []
+    zero = number("0")
+    i = j = 0
+    n_old = len(old)
+    n_new = len(new)
+
+    while i < n_old and j < n_new:
+        old_key, old_price, old_amount = old[i]
+        new_key, new_price, new_amount = new[j]
+        if old_key == new_key:
+            if old_amount != new_amount:
+                changes.append(
+                    LevelChange(side, UPDATE, new_price, number(new_amount))
+                )
+            i += 1
+            j += 1
+        elif old_key < new_key:
+            changes.append(LevelChange(side, REMOVE, old_price, zero))
+            i += 1
+        else:
+            changes.append(
+                LevelChange(side, ADD, new_price, number(new_amount))
+            )
+            j += 1
+
+    for _, old_price, _ in old[i:]:
+        changes.append(LevelChange(side, REMOVE, old_price, zero))
+    for _, new_price, new_amount in new[j:]:
+        changes.append(LevelChange(side, ADD, new_price, number(new_amount)))
+
+    return changes
+
+
+def diff_snapshots(
+    old: Mapping[str, List[Dict[str, str]]],
+    new: Mapping[str, List[Dict[str, str]]],
+    number: Callable[[str], Any] = Decimal,
+) -> List[LevelChange]:
+    """
+    Compares two Public.get_order_book responses and returns only the
+    levels that were added, updated or removed
+
+    Amounts are compared as the strings returned by the exchange, so
+    only changed levels are parsed into numbers.
+
+    Args:
+        old: Previous order book snapshot
+        new: Current order book snapshot
+        number: Callable used to parse price and amount strings
+
+    Returns:
+        List of LevelChange objects, bids first, each side best price
+        first
+    """
+    changes = []
+    for side, descending in (("bids", True), ("asks", False)):
+        changes.extend(
+            _merge_levels(
+                side,
+                _parse_levels(old.get(side, []), descending, number),
+                _parse_levels(new.get(side, []), descending, number),
+                number,
+            )
+        )
+    return changes
+
+
+class SnapshotDiffer:
+    """
+    Class that turns successive order book polls into level changes.
+
+    The parsed levels of the previous snapshot are kept between calls,
+    so each poll only parses the new snapshot once and merges it with
+    the previous one.
+    """
+
+    __slots__ = ["_number", "_bids", "_asks"]
+
+    def __init__(self, number: Callable[[str], Any] = Decimal) -> None:
+        """
+        Initialise SnapshotDiffer
+
+        Args:
+            number: Callable used to parse price and amount strings
+        """
+        self._number: Callable[[str], Any] = number
+        self._bids: _ParsedLevels = []
+        self._asks: _ParsedLevels = []
+
+    def diff(
+        self, snapshot: Mapping[str, List[Dict[str, str]]]
+    ) -> List[LevelChange]:
+        """
+        Method to compare a snapshot with the previous one passed in.
+        The first call reports every level as added.
+
+        Args:
+            snapshot: Public.get_order_book response
+
+        Returns:
+            List of LevelChange objects
+        """
+        number = self._number
+        bids = _parse_levels(snapshot.get("bids", []), True, number)
+        asks = _parse_levels(snapshot.get("asks", []), False, number)
+        changes = _merge_levels("bids", self._bids, bids, number)
+        changes.extend(_merge_levels("asks", self._asks, asks, number))
+        self._bids = bids
+        self._asks = asks
+        return changes
+
+    def reset(self) -> None:
+        """
+        Method to forget the previous snapshot
+        """
+        self._bids = []
+        self._asks = []
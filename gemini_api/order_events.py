@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import urlencode
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+from gemini_api.websocket import WebSocket, WebSocketError
+
+ORDER_EVENTS_ENDPOINT = "/v1/order/events"
+
+EVENT_TYPES = (
+    "initial",
+    "accepted",
+    "rejected",
+    "booked",
+    "fill",
+    "cancelled",
+    "cancel_rejected",
+    "closed",
+)
+
+_STOP = object()
+
+
+class OrderEventsClient:
+    """
+    Class that streams order events for the account of an Authentication
+    object over Gemini's authenticated order events WebSocket.
+
+    Events are delivered as decoded dictionaries to the on_event
+    callback, to blocking iteration over the client and to async
+    iteration with `async for`. The connection is re-established after
+    failures and, after every reconnect or gap in socket_sequence, the
+    open orders tracked from events are reconciled against
+    Order.get_active_orders on a separate thread, so events keep being
+    read while the request is made. Orders that closed while
+    disconnected are reported as synthetic "closed" events and unknown
+    active orders as synthetic "initial" events, both with "reconciled"
+    set to True. Orders with events received during the request are
+    left to those events. The "initial" event the server sends for an
+    order already reported this way is not delivered again.
+
+    Events are only queued for iteration when no on_event callback is
+    given or once iteration has started, and at most max_queued of them
+    are kept, dropping the oldest.
+
+    Example:
+        client = OrderEventsClient(auth, event_types=["fill", "closed"])
+        client.start()
+        for event in client:
+            print(event["type"], event["order_id"])
+    """
+
+    def __init__(
+        self,
+        auth: Authentication,
+        event_types: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        url: Optional[str] = None,
+        reconnect_delay: float = 1.0,
+        account: List[str] = ["primary"],
+        max_queued: int = 10000,
+    ) -> None:
+        """
+        Initialise OrderEventsClient
+
+        Args:
+            auth: Gemini authentication object
+            event_types: Event types to receive, defaults to all
+            symbols: Trading pairs to receive events for, defaults to all
+            on_event: Callable invoked with every event
+            url: WebSocket URL, defaults to the URL of auth
+            reconnect_delay: Seconds to wait before reconnecting
+            account: Account used when reconciling active orders
+            max_queued: Maximum number of events waiting to be iterated
+                over
+        """
+        self._auth: Authentication = auth
+        self._account: List[str] = account
+        self._reconnect_delay: float = reconnect_delay
+        self.on_event = on_event
+
+        query: List[Tuple[str, str]] = []
+        if event_types:
+            query.extend(("eventTypeFilter", t) for t in event_types)
+        if symbols:
+            query.extend(("symbolFilter", s.lower()) for s in symbols)
+        base = url or auth.url.replace("https://", "wss://", 1)
+        base = base.rstrip("/")
+        self._url: str = base + ORDER_EVENTS_ENDPOINT
+        if query:
+            self._url += "?" + urlencode(query)
+
+        self._open_orders: Dict[str, Dict[str, Any]] = {}
+        # guards the open orders and event delivery across threads
+        self._lock = threading.RLock()
+        self._reconcile_lock = threading.Lock()
+        # orders with events since the current reconcile started
+        self._touched: Set[str] = set()
+        self._reconcile_requested: bool = False
+        self._reconcile_thread: Optional[threading.Thread] = None
+        self._queue: queue.Queue[Any] = queue.Queue(max_queued)
+        self._iterating: bool = False
+        self._sequence: Optional[int] = None
+        self._last_heartbeat: Optional[float] = None
+        self._connections: int = 0
+        self._ws: Optional[WebSocket] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def open_orders(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Property for the orders known to be open from the event stream
+
+        Returns:
+            Dictionary of the latest event for each open order keyed by
+            order id
+        """
+        return self._open_orders
+
+    @property
+    def last_heartbeat(self) -> Optional[float]:
+        """
+        Property for the time the last heartbeat was received
+
+        Returns:
+            Unix time in seconds or None if no heartbeat was received
+        """
+        return self._last_heartbeat
+
+    def start(self) -> None:
+        """
+        Method to connect and process events on a background thread
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to close the connection, stop the background thread and
+        end any iteration over the client
+
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self._stopped.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._put(_STOP)
+
+    def run_forever(self) -> None:
+        """
+        Method to connect and process events on the current thread until
+        stop is called, reconnecting and reconciling after failures
+        """
+        while not self._stopped.is_set():
+            headers = self._auth.signed_headers(ORDER_EVENTS_ENDPOINT)
+            ws = WebSocket(
+                self._url,
+                headers={
+                    name: (
+                        value.decode("ascii")
+                        if isinstance(value, bytes)
+                        else value
+                    )
+                    for name, value in headers.items()
+                    if name.startswith("X-GEMINI")
+                },
+            )
+            try:
+                ws.connect()
+                self._ws = ws
+                self._connections += 1
+                if self._connections > 1:
+                    self._start_reconcile()
+                while not self._stopped.is_set():
+                    self.handle_message(json.loads(ws.recv()))
+            except (OSError, WebSocketError, ValueError):
+                pass
+            finally:
+                self._ws = None
+                ws.close()
+                self._sequence = None
+            self._stopped.wait(self._reconnect_delay)
+
+    def reconcile(self) -> None:
+        """
+        Method to compare the open orders tracked from events with
+        Order.get_active_orders and emit synthetic events for the
+        differences, except for orders with events received while the
+        request was made
+        """
+        with self._reconcile_lock:
+            with self._lock:
+                self._touched.clear()
+            active = {
+                str(order.order_id): order
+                for order in Order.get_active_orders(
+                    self._auth, account=self._account, raw=False
+                )
+                if isinstance(order, Order)
+            }
+            with self._lock:
+                for order_id in list(self._open_orders):
+                    if (
+                        order_id not in active
+                        and order_id not in self._touched
+                    ):
+                        self._emit(
+                            {
+                                "type": "closed",
+                                "order_id": order_id,
+                                "reconciled": True,
+                            }
+                        )
+                for order_id, order in active.items():
+                    if (
+                        order_id not in self._open_orders
+                        and order_id not in self._touched
+                    ):
+                        self._emit(
+                            {
+                                "type": "initial",
+                                "order_id": order_id,
+                                "order": order,
+                                "reconciled": True,
+                            }
+                        )
+
+    def handle_message(self, message: Any) -> None:
+        """
+        Method to process a decoded order events message
+
+        Args:
+            message: Decoded message, either a list of order events or
+                a subscription acknowledgement or heartbeat
+        """
+        if isinstance(message, dict):
+            if message.get("type") == "heartbeat":
+                self._last_heartbeat = time.time()
+                self._check_sequence(message)
+            return
+        for event in message:
+            self._check_sequence(event)
+            order_id = str(event.get("order_id"))
+            with self._lock:
+                self._touched.add(order_id)
+                known = self._open_orders.get(order_id, {})
+                if event.get("type") == "initial" and known.get("reconciled"):
+                    # already reported by reconcile after the reconnect
+                    self._open_orders[order_id] = event
+                    continue
+                self._emit(event)
+
+    def _check_sequence(self, message: Dict[str, Any]) -> None:
+        sequence = message.get("socket_sequence")
+        if sequence is None:
+            return
+        expected = self._sequence
+        self._sequence = sequence
+        if expected is not None and sequence != expected + 1:
+            self._start_reconcile()
+
+    def _start_reconcile(self) -> None:
+        # the request is made on another thread, so events keep being
+        # read, and requests made while one runs are merged into one
+        with self._lock:
+            self._reconcile_requested = True
+            thread = self._reconcile_thread
+            if thread is None or not thread.is_alive():
+                self._reconcile_thread = threading.Thread(
+                    target=self._reconcile_requests, daemon=True
+                )
+                self._reconcile_thread.start()
+
+    def _reconcile_requests(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                if not self._reconcile_requested:
+                    self._reconcile_thread = None
+                    return
+                self._reconcile_requested = False
+            try:
+                self.reconcile()
+            except Exception:
+                with self._lock:
+                    self._reconcile_requested = True
+                self._stopped.wait(self._reconnect_delay)
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        order_id = event.get("order_id")
+        if order_id is not None:
+            if event.get("type") in ("closed", "rejected"):
+                self._open_orders.pop(str(order_id), None)
+            else:
+                self._open_orders[str(order_id)] = event
+        if self.on_event is not None:
+            self.on_event(event)
+        if self.on_event is None or self._iterating:
+            self._put(event)
+
+    def _put(self, item: Any) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Method to block until the next event arrives
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Event dictionary
+        """
+        self._iterating = True
+        event = self._queue.get(timeout=timeout)
+        if event is _STOP:
+            self._put(_STOP)
+            raise queue.Empty
+        return event
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            try:
+                yield self.get()
+            except queue.Empty:
+                return
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                yield await loop.run_in_executor(None, self.get)
+            except queue.Empty:
+                return
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from gemini_api.endpoints.order import Order
+
+if TYPE_CHECKING:
+    from gemini_api.authentication import Authentication
+
+
+class OrderStore:
+    """
+    Class holding the last known state of orders, kept up to date from
+    the responses of Order class methods.
+
+    Attach a store to an Authentication object and every new_order,
+    cancel_order, order_status, get_active_orders and cancel-all
+    response made with it updates the store, so open orders can be
+    queried locally instead of calling get_active_orders. A full
+    get_active_orders response also marks orders of the same account
+    missing from it as no longer live.
+
+    Responses can arrive out of order when requests overlap, so a
+    response older than the stored state is ignored: cancelled and
+    filled orders are never made live again, and responses with an
+    earlier timestampms are not merged.
+
+    Example:
+        store = OrderStore()
+        auth = Authentication(public_key, private_key, order_store=store)
+        Order.new_order(auth, "btcusd", "1", "20000", "buy")
+        store.open_orders(symbol="btcusd", side="buy")
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise OrderStore
+        """
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._orders: Dict[str, Order] = {}
+        self._client_ids: Dict[str, str] = {}
+        self._symbols: Dict[str, Set[str]] = {}
+        self._live: Set[str] = set()
+        self._accounts: Dict[str, Tuple[str, ...]] = {}
+        # time.monotonic() of the last update merged into each order
+        self._updated: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._reconciled_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: object) -> bool:
+        return str(order_id) in self._orders
+
+    @property
+    def reconciled_at(self) -> Optional[float]:
+        """
+        Property for the time of the last full get_active_orders
+        response
+
+        Returns:
+            Unix time in seconds or None if never reconciled
+        """
+        return self._reconciled_at
+
+    def get(self, order_id: str) -> Optional[Order]:
+        """
+        Method to get an order by order id
+
+        Args:
+            order_id: The order id
+
+        Returns:
+            Order object or None if the order is unknown
+        """
+        return self._orders.get(str(order_id))
+
+    def get_by_client_order_id(self, client_order_id: str) -> Optional[Order]:
+        """
+        Method to get an order by client order id
+
+        Args:
+            client_order_id: Client-specified order id
+
+        Returns:
+            Order object or None if the order is unknown
+        """
+        order_id = self._client_ids.get(client_order_id)
+        return None if order_id is None else self._orders.get(order_id)
+
+    def orders(
+        self,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        live: Optional[bool] = None,
+    ) -> List[Order]:
+        """
+        Method to query known orders
+
+        Args:
+            symbol: Only return orders for this trading pair
+            side: Only return "buy" or "sell" orders
+            live: Only return orders that are (True) or are not (False)
+                resting on the book
+
+        Returns:
+            List of Order objects
+        """
+        with self._lock:
+            if symbol is not None:
+                ids: Iterable[str] = self._symbols.get(symbol.lower(), ())
+            elif live:
+                ids = self._live
+            else:
+                ids = self._orders
+            orders = []
+            for order_id in ids:
+                if live is not None and (order_id in self._live) != live:
+                    continue
+                data = self._data[order_id]
+                if side is not None and data.get("side") != side:
+                    continue
+                orders.append(self._orders[order_id])
+            return orders
+
+    def open_orders(
+        self, symbol: Optional[str] = None, side: Optional[str] = None
+    ) -> List[Order]:
+        """
+        Method to query orders resting on the book
+
+        Args:
+            symbol: Only return orders for this trading pair
+            side: Only return "buy" or "sell" orders
+
+        Returns:
+            List of Order objects
+        """
+        return self.orders(symbol=symbol, side=side, live=True)
+
+    def is_stale(self, max_age: float) -> bool:
+        """
+        Method to check whether the store should be reconciled
+
+        Args:
+            max_age: Maximum seconds since the last reconciliation
+
+        Returns:
+            True if the store was never reconciled or is older than
+            max_age
+        """
+        reconciled_at = self._reconciled_at
+        return reconciled_at is None or time.time() - reconciled_at > max_age
+
+    def reconcile(
+        self,
+        auth: Authentication,
+        max_age: Optional[float] = None,
+        account: List[str] = ["primary"],
+    ) -> bool:
+        """
+        Method to refresh the store from Order.get_active_orders
+
+        Args:
+            auth: Gemini authentication object the store is attached to
+            max_age: Only reconcile when the store is older than this
+            account: The name of the account within the subaccount group
+
+        Returns:
+            True if a request was made
+        """
+        if auth.order_store is not self:
+            raise ValueError("OrderStore is not attached to auth")
+        if max_age is not None and not self.is_stale(max_age):
+            return False
+        Order.get_active_orders(auth, account=account, raw=True)
+        return True
+
+    def update(
+        self,
+        order_data: Union[Dict[str, Any], List[Dict[str, Any]]],
+        account: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Method to merge an order response into the store, unless the
+        stored state is newer
+
+        Args:
+            order_data: Order dictionary returned by the API, or a list
+                of them as returned when looking up a client order id
+            account: The account the order was requested for
+        """
+        if isinstance(order_data, list):
+            with self._lock:
+                for item in order_data:
+                    self.update(item, account)
+            return
+        order_id = order_data.get("order_id")
+        if order_id is None or isinstance(order_id, dict):
+            return
+        order_id = str(order_id)
+        with self._lock:
+            data = self._data.get(order_id)
+            if data is None:
+                data = self._data[order_id] = {}
+            elif _is_stale(data, order_data):
+                return
+            data.update(order_data)
+            self._updated[order_id] = time.monotonic()
+            self._orders[order_id] = Order(auth=None, order_data=data)
+            if account is not None:
+                self._accounts[order_id] = tuple(account)
+
+            client_order_id = data.get("client_order_id")
+            if client_order_id is not None:
+                self._client_ids[client_order_id] = order_id
+            symbol = data.get("symbol")
+            if symbol is not None:
+                self._symbols.setdefault(symbol.lower(), set()).add(order_id)
+            if data.get("is_live"):
+                self._live.add(order_id)
+            else:
+                self._live.discard(order_id)
+
+    def replace_active(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        account: Optional[List[str]] = None,
+        requested_at: Optional[float] = None,
+    ) -> None:
+        """
+        Method to apply a complete list of active orders, marking every
+        other live order of the account as no longer live
+
+        Args:
+            orders: Order dictionaries returned by get_active_orders
+            account: The account the orders were requested for, None
+                when the list covers every account. Live orders stored
+                without an account are left live
+            requested_at: time.monotonic() when the list was requested.
+                Orders updated since then, e.g. placed or cancelled by
+                a request that overlapped, keep their state
+        """
+        with self._lock:
+            active = set()
+            for order_data in orders:
+                order_id = str(order_data.get("order_id"))
+                active.add(order_id)
+                if not self._updated_since(order_id, requested_at):
+                    self.update(order_data, account)
+            key = None if account is None else tuple(account)
+            for order_id in self._live - active:
+                if self._updated_since(order_id, requested_at):
+                    continue
+                if key is None or self._accounts.get(order_id) == key:
+                    self.update({"order_id": order_id, "is_live": False})
+            self._reconciled_at = time.time()
+
+    def mark_cancelled(self, order_ids: Iterable[Any]) -> None:
+        """
+        Method to mark orders as cancelled
+
+        Args:
+            order_ids: Ids of the cancelled orders
+        """
+        with self._lock:
+            for order_id in order_ids:
+                self.update(
+                    {
+                        "order_id": str(order_id),
+                        "is_live": False,
+                        "is_cancelled": True,
+                    }
+                )
+
+    def clear(self) -> None:
+        """
+        Method to forget every order
+        """
+        with self._lock:
+            self._data.clear()
+            self._orders.clear()
+            self._client_ids.clear()
+            self._symbols.clear()
+            self._live.clear()
+            self._accounts.clear()
+            self._updated.clear()
+            self._reconciled_at = None
+
+    def _updated_since(
+        self, order_id: str, requested_at: Optional[float]
+    ) -> bool:
+        updated = self._updated.get(order_id)
+        return (
+            requested_at is not None
+            and updated is not None
+            and updated > requested_at
+        )
+
+
+def _is_stale(stored: Dict[str, Any], order_data: Dict[str, Any]) -> bool:
+    if order_data.get("is_live") and _is_terminal(stored):
+        return True
+    stored_at = _timestampms(stored)
+    received_at = _timestampms(order_data)
+    return (
+        stored_at is not None
+        and received_at is not None
+        and received_at < stored_at
+    )
+
+
+def _is_terminal(data: Dict[str, Any]) -> bool:
+    # cancelled, or filled with nothing left to execute
+    if data.get("is_cancelled"):
+        return True
+    remaining = data.get("remaining_amount")
+    if data.get("is_live") or remaining is None:
+        return False
+    try:
+        return Decimal(str(remaining)) == 0
+    except InvalidOperation:
+        return False
+
+
+def _timestampms(data: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(data["timestampms"])
+    except (KeyError, TypeError, ValueError):
+        return None
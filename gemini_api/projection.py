@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+
+@lru_cache(maxsize=128)
+def record_type(fields: Tuple[str, ...]) -> Type[Tuple[Any, ...]]:
+    """
+    Gets the named tuple class holding a projection of records, created
+    once per set of fields
+
+    Args:
+        fields: Keys of the response records, in order
+
+    Returns:
+        Named tuple class with one attribute per field. Fields that are
+        not valid identifiers are renamed to _0, _1 etc. by position
+    """
+    return namedtuple("Record", fields, rename=True)
+
+
+def project(
+    rows: Sequence[Dict[str, Any]], fields: Sequence[str]
+) -> List[Tuple[Any, ...]]:
+    """
+    Builds named tuples holding only some fields of response records,
+    e.g. for pages of trades or transfers where most fields are unused
+
+    Args:
+        rows: Decoded response records
+        fields: Keys kept, e.g. ["price", "amount", "timestamp"].
+            Records without a key hold None for it
+
+    Returns:
+        List of named tuples with the fields as attributes
+    """
+    fields = tuple(fields)
+    record = record_type(fields)
+    new = tuple.__new__
+    if len(fields) > 1:
+        get = itemgetter(*fields)
+        try:
+            return [new(record, get(row)) for row in rows]
+        except KeyError:
+            # a record without one of the fields
+            pass
+    return [new(record, [row.get(key) for key in fields]) for row in rows]
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+PUBLIC_REQUESTS_PER_SECOND = 120 / 60
+PRIVATE_REQUESTS_PER_SECOND = 600 / 60
+
+
+class RateLimiter:
+    """
+    Class for a thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at the given rate up to the burst size,
+    and acquire blocks until enough tokens are available. Defaults match
+    Gemini's private API limit of 600 requests per minute.
+    """
+
+    __slots__ = ["_rate", "_burst", "_tokens", "_updated", "_lock"]
+
+    def __init__(
+        self,
+        rate: float = PRIVATE_REQUESTS_PER_SECOND,
+        burst: Optional[float] = None,
+    ) -> None:
+        """
+        Initialise RateLimiter
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens, defaults to one second of
+                requests
+        """
+        self._rate: float = rate
+        self._burst: float = burst if burst is not None else max(rate, 1.0)
+        self._tokens: float = self._burst
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """
+        Property for the refill rate
+
+        Returns:
+            Tokens added per second
+        """
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """
+        Property for the maximum number of tokens
+
+        Returns:
+            Tokens held when the bucket is full
+        """
+        return self._burst
+
+    @property
+    def available(self) -> float:
+        """
+        Property for the number of tokens currently available
+
+        Returns:
+            Available tokens
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Method to get the time until tokens will be available
+
+        Args:
+            tokens: Number of tokens needed
+
+        Returns:
+            Seconds to wait, 0 if the tokens are available now
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self._rate)
+
+    def try_acquire(self, tokens: float = 1.0, reserve: float = 0.0) -> bool:
+        """
+        Method to take tokens without waiting
+
+        Args:
+            tokens: Number of tokens to take
+            reserve: Number of tokens that must be left available after
+                taking them
+
+        Returns:
+            True if the tokens were taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens + reserve:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(
+        self, tokens: float = 1.0, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Method to block until tokens are available and take them
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum time to wait in seconds, None waits forever
+
+        Returns:
+            True if the tokens were taken before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self._rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    Class for a thread-safe AIMD limit on the number of requests in
+    flight.
+
+    The limit grows additively, by about one request per round trip,
+    while requests succeed at the limit with healthy latency. It is cut
+    multiplicatively when a request is throttled with a 429 or its
+    latency exceeds latency_tolerance times the baseline, the lowest
+    latency seen. Requests sent before the last cut do not cut the limit
+    again, so one burst of 429s only counts as one congestion event.
+
+    Use one limiter per endpoint group, e.g. one for public and one for
+    private endpoints.
+
+    Example:
+        limiter = AdaptiveLimiter(max_limit=32)
+        auth = Authentication(public_key, private_key, concurrency=limiter)
+    """
+
+    __slots__ = [
+        "_limit",
+        "_min_limit",
+        "_max_limit",
+        "_increase",
+        "_decrease",
+        "_tolerance",
+        "_baseline",
+        "_average",
+        "_in_flight",
+        "_last_cut",
+        "_throttled",
+        "_waiting",
+        "_condition",
+    ]
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        """
+        Initialise AdaptiveLimiter
+
+        Args:
+            initial_limit: Requests allowed in flight at first
+            min_limit: Lowest limit the cuts may reach
+            max_limit: Highest limit the increases may reach
+            increase: Requests added to the limit per round trip of
+                successful requests
+            decrease: Factor the limit is multiplied by on congestion
+            latency_tolerance: Multiple of the baseline latency above
+                which a response counts as congestion
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self._limit: float = float(
+            min(max(initial_limit, min_limit), max_limit)
+        )
+        self._min_limit: int = min_limit
+        self._max_limit: int = max_limit
+        self._increase: float = increase
+        self._decrease: float = decrease
+        self._tolerance: float = latency_tolerance
+        self._baseline: Optional[float] = None
+        self._average: float = 0.0
+        self._in_flight: int = 0
+        self._last_cut: float = time.monotonic()
+        self._throttled: int = 0
+        # number of requests waiting in each priority class
+        self._waiting: Dict[int, int] = {}
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        Property for the number of requests currently allowed in flight
+
+        Returns:
+            Limit
+        """
+        return int(self._limit)
+
+    @property
+    def max_limit(self) -> int:
+        """
+        Property for the highest limit the increases may reach
+
+        Returns:
+            Maximum limit
+        """
+        return self._max_limit
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Property for the number of requests in flight
+
+        Returns:
+            Requests in flight
+        """
+        return self._in_flight
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        """
+        Property for the latency congestion is measured against
+
+        Returns:
+            Latency in seconds or None if no request has completed
+        """
+        return self._baseline
+
+    @property
+    def throttled(self) -> int:
+        """
+        Property for the number of throttled requests seen
+
+        Returns:
+            Number of 429 responses
+        """
+        return self._throttled
+
+    def acquire(
+        self, timeout: Optional[float] = None, priority: int = 0
+    ) -> bool:
+        """
+        Method to block until a request may be sent and count it as in
+        flight
+
+        Requests of a lower priority class wait while requests of a
+        higher one are waiting, e.g. reporting requests for cancels.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None waits forever
+            priority: Priority class of the request, lower values are
+                served first
+
+        Returns:
+            True if the request may be sent before the timeout
+        """
+        with self._condition:
+            self._waiting[priority] = self._waiting.get(priority, 0) + 1
+            try:
+                acquired = self._condition.wait_for(
+                    lambda: self._in_flight < int(self._limit)
+                    and min(self._waiting) == priority,
+                    timeout,
+                )
+            finally:
+                self._waiting[priority] -= 1
+                if not self._waiting[priority]:
+                    del self._waiting[priority]
+                    # the classes below may go now
+                    self._condition.notify_all()
+            if acquired:
+                self._in_flight += 1
+            return acquired
+
+    def release(
+        self, latency: Optional[float] = None, throttled: bool = False
+    ) -> None:
+        """
+        Method to record that a request has completed and adjust the
+        limit
+
+        Args:
+            latency: Round trip time of the request in seconds, None if
+                the request failed without a response
+            throttled: The request was rejected with a 429
+        """
+        now = time.monotonic()
+        with self._condition:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            if throttled:
+                self._throttled += 1
+            if latency is not None:
+                congested = throttled or self._is_slow(latency)
+                if congested and now - latency >= self._last_cut:
+                    self._limit = max(
+                        float(self._min_limit), self._limit * self._decrease
+                    )
+                    self._last_cut = now
+                elif not congested and saturated:
+                    # grows by about `increase` once every request of the
+                    # current window has completed
+                    self._limit = min(
+                        float(self._max_limit),
+                        self._limit + self._increase / self._limit,
+                    )
+            # every waiter, as the next request may be of any class
+            self._condition.notify_all()
+
+    def _is_slow(self, latency: float) -> bool:
+        if self._baseline is None:
+            self._baseline = self._average = latency
+            return False
+        self._baseline = min(self._baseline, latency)
+        self._average += (latency - self._average) * 0.2
+        slow = self._average > self._baseline * self._tolerance
+        # let the baseline follow lasting changes in network latency
+        self._baseline += (latency - self._baseline) * 0.01
+        return slow
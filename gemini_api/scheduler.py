@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from gemini_api.rate_limit import RateLimiter
+
+PRIORITY_CANCEL = 0
+PRIORITY_NEW_ORDER = 1
+PRIORITY_STATUS = 2
+PRIORITY_REPORTING = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_CANCEL: "cancel",
+    PRIORITY_NEW_ORDER: "new_order",
+    PRIORITY_STATUS: "status",
+    PRIORITY_REPORTING: "reporting",
+}
+
+_ENDPOINT_PRIORITIES = {
+    "/v1/order/cancel": PRIORITY_CANCEL,
+    "/v1/order/cancel/all": PRIORITY_CANCEL,
+    "/v1/order/cancel/session": PRIORITY_CANCEL,
+    "/v1/order/new": PRIORITY_NEW_ORDER,
+    "/v1/order/status": PRIORITY_STATUS,
+    "/v1/orders": PRIORITY_STATUS,
+    "/v1/heartbeat": PRIORITY_STATUS,
+}
+
+
+def endpoint_priority(endpoint: str) -> int:
+    """
+    Classifies a private endpoint into a priority class
+
+    Args:
+        endpoint: Endpoint path e.g. "/v1/order/new"
+
+    Returns:
+        Priority class, lower values are served first
+    """
+    priority = _ENDPOINT_PRIORITIES.get(endpoint)
+    if priority is not None:
+        return priority
+    if endpoint.startswith("/v1/wrap/"):
+        return PRIORITY_NEW_ORDER
+    return PRIORITY_REPORTING
+
+
+class RequestScheduler:
+    """
+    Class that hands out rate limit tokens to private requests by
+    priority class: cancels first, then new orders, then order status,
+    then reporting.
+
+    Waiting requests are served strictly by class and in arrival order
+    within a class, each class has a cap on requests in flight, and
+    reporting requests only take a token when enough tokens remain for
+    order traffic. Reporting can therefore not delay order flow, however
+    many reporting calls are queued.
+
+    Example:
+        scheduler = RequestScheduler(caps={PRIORITY_REPORTING: 2})
+        auth = Authentication(public_key, private_key, scheduler=scheduler)
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        caps: Optional[Dict[int, int]] = None,
+        reporting_reserve: float = 2.0,
+    ) -> None:
+        """
+        Initialise RequestScheduler
+
+        Args:
+            rate_limiter: RateLimiter the tokens are taken from,
+                defaults to Gemini's private API limit
+            caps: Maximum requests in flight keyed by priority class,
+                classes not given are unlimited
+            reporting_reserve: Tokens reporting requests must leave
+                available for the other classes, at most the burst of
+                the rate limiter minus the token the request takes
+        """
+        self._rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+        self._caps: Dict[int, int] = dict(caps or {})
+        # a reserve the bucket can never hold would starve reporting
+        self._reserve: float = max(
+            min(reporting_reserve, self._rate_limiter.burst - 1.0), 0.0
+        )
+        self._queues: Dict[int, Deque[object]] = {
+            priority: deque() for priority in PRIORITY_NAMES
+        }
+        self._in_flight: Dict[int, int] = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._served: Dict[int, int] = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._condition = threading.Condition()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """
+        Property for the rate limiter the tokens are taken from
+
+        Returns:
+            RateLimiter
+        """
+        return self._rate_limiter
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Method to get the number of requests waiting in each class
+
+        Returns:
+            Dictionary of queue depths keyed by class name
+        """
+        with self._condition:
+            return {
+                PRIORITY_NAMES[priority]: len(queue)
+                for priority, queue in self._queues.items()
+            }
+
+    def in_flight(self) -> Dict[str, int]:
+        """
+        Method to get the number of requests in flight in each class
+
+        Returns:
+            Dictionary of in flight requests keyed by class name
+        """
+        with self._condition:
+            return {
+                PRIORITY_NAMES[priority]: count
+                for priority, count in self._in_flight.items()
+            }
+
+    def served(self) -> Dict[str, int]:
+        """
+        Method to get the number of requests served in each class
+
+        Returns:
+            Dictionary of request counts keyed by class name
+        """
+        with self._condition:
+            return {
+                PRIORITY_NAMES[priority]: count
+                for priority, count in self._served.items()
+            }
+
+    def acquire(self, priority: int) -> None:
+        """
+        Method to block until a request of the class may be sent
+
+        Args:
+            priority: Priority class of the request
+        """
+        ticket = object()
+        with self._condition:
+            queue = self._queues[priority]
+            queue.append(ticket)
+            try:
+                while True:
+                    if self._next_class() == priority and queue[0] is ticket:
+                        reserve = (
+                            self._reserve
+                            if priority == PRIORITY_REPORTING
+                            else 0.0
+                        )
+                        if self._rate_limiter.try_acquire(reserve=reserve):
+                            break
+                        wait = self._rate_limiter.wait_time(1.0 + reserve)
+                        self._condition.wait(max(wait, 0.001))
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+            queue.popleft()
+            self._in_flight[priority] += 1
+            self._served[priority] += 1
+            self._condition.notify_all()
+
+    def release(self, priority: int) -> None:
+        """
+        Method to record that a request of the class has completed
+
+        Args:
+            priority: Priority class of the request
+        """
+        with self._condition:
+            self._in_flight[priority] -= 1
+            self._condition.notify_all()
+
+    def _next_class(self) -> Optional[int]:
+        for priority, queue in self._queues.items():
+            if not queue:
+                continue
+            cap = self._caps.get(priority)
+            if cap is None or self._in_flight[priority] < cap:
+                return priority
+            if priority != PRIORITY_REPORTING:
+                # a capped order class holds back the classes below it
+                return None
+        return None
+
+
+class PriorityLock:
+    """
+    Class for a lock handed to waiting threads by priority class, lowest
+    value first, and in arrival order within a class.
+
+    A request admitted by the scheduler may still wait for a lock, e.g.
+    the one sending requests of a key one at a time. With this lock a
+    cancel arriving later goes ahead of the reporting requests already
+    waiting for it.
+
+    Example:
+        lock = PriorityLock()
+        lock.acquire(endpoint_priority("/v1/order/cancel"))
+        try:
+            ...
+        finally:
+            lock.release()
+    """
+
+    __slots__ = ["_condition", "_locked", "_waiting", "_tickets"]
+
+    def __init__(self) -> None:
+        """
+        Initialise PriorityLock
+        """
+        self._condition = threading.Condition()
+        self._locked: bool = False
+        self._waiting: List[Tuple[int, int]] = []
+        self._tickets = itertools.count()
+
+    def acquire(self, priority: int) -> None:
+        """
+        Method to block until the lock is handed to the caller
+
+        Args:
+            priority: Priority class of the caller
+        """
+        ticket = (priority, next(self._tickets))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                self._condition.wait_for(
+                    lambda: not self._locked and self._waiting[0] == ticket
+                )
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            self._locked = True
+
+    def release(self) -> None:
+        """
+        Method to hand the lock to the next waiting thread
+        """
+        with self._condition:
+            self._locked = False
+            self._condition.notify_all()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+READ_ONLY_ENDPOINTS = frozenset(
+    [
+        "/v1/balances",
+        "/v1/transfers",
+        "/v1/custodyaccountfees",
+        "/v1/mytrades",
+        "/v1/orders",
+        "/v1/order/status",
+        "/v1/tradevolume",
+        "/v1/notionalvolume",
+        "/v1/payments/methods",
+    ]
+)
+_READ_ONLY_PREFIXES = ("/v1/notionalbalances/", "/v1/addresses/")
+
+
+def is_read_only(endpoint: str) -> bool:
+    """
+    Checks whether a private endpoint only reads data, so identical
+    concurrent requests to it may share one response
+
+    Args:
+        endpoint: Endpoint path e.g. "/v1/balances"
+
+    Returns:
+        True for read-only endpoints
+    """
+    return (
+        endpoint in READ_ONLY_ENDPOINTS
+        or endpoint.startswith(_READ_ONLY_PREFIXES)
+        or endpoint.endswith("/feeEstimate")
+    )
+
+
+def request_key(endpoint: str, payload: Optional[Dict[Any, Any]]) -> str:
+    """
+    Creates the key identifying a request by endpoint and parameters
+
+    Args:
+        endpoint: Endpoint path or URL
+        payload: Request parameters
+
+    Returns:
+        Key
+    """
+    if not payload:
+        return endpoint
+    return endpoint + json.dumps(payload, sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ["done", "result", "error"]
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Class that lets concurrent identical calls share one execution.
+
+    The first caller for a key runs the call, and callers arriving with
+    the same key while it is in flight wait for it and receive the same
+    result or exception. Nothing is cached: a call for a key that is
+    not in flight runs again. Shared results are the same object for
+    every caller and should be treated as read-only.
+
+    Example:
+        flights = SingleFlight()
+        public = Public(single_flight=flights)
+        auth = Authentication(key, secret, single_flight=flights)
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise SingleFlight
+        """
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executions: int = 0
+        self._shared: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executions(self) -> int:
+        """
+        Property for the number of calls that ran
+
+        Returns:
+            Number of executions
+        """
+        return self._executions
+
+    @property
+    def shared(self) -> int:
+        """
+        Property for the number of callers that received the result of
+        another caller's execution
+
+        Returns:
+            Number of coalesced calls
+        """
+        return self._shared
+
+    def in_flight(self) -> int:
+        """
+        Method to get the number of keys with a call in flight
+
+        Returns:
+            Number of calls in flight
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        """
+        Method to run a call, or wait for the identical call in flight
+
+        Args:
+            key: Key identifying identical calls
+            call: Callable taking no arguments
+
+        Returns:
+            Result of the call
+        """
+        with self._lock:
+            flight = self._calls.get(key)
+            if flight is None:
+                flight = self._calls[key] = _Call()
+                leader = True
+                self._executions += 1
+            else:
+                leader = False
+                self._shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = call()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            flight.done.set()
+        return flight.result
@@ -0,0 +1,597 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qsl, urlsplit
+
+from gemini_api.compression import compress
+from gemini_api.websocket import (
+    OP_CLOSE,
+    OP_PING,
+    OP_PONG,
+    OP_TEXT,
+    WebSocketClosed,
+    accept_key,
+    encode_frame,
+    read_frame,
+    read_http_head,
+)
+
+Message = Union[str, Dict[str, Any], List[Any]]
+
+
+def _dump(message: Message) -> str:
+    return message if isinstance(message, str) else json.dumps(message)
+
+
+class ServerConnection:
+    """
+    Class for one client connection accepted by LocalWebSocketServer
+    """
+
+    __slots__ = ["_sock", "_reader", "_send_lock", "_path", "_headers"]
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        reader: BinaryIO,
+        path: str,
+        headers: Dict[str, str],
+    ) -> None:
+        """
+        Initialise ServerConnection
+        """
+        self._sock: socket.socket = sock
+        self._reader: BinaryIO = reader
+        self._send_lock: threading.Lock = threading.Lock()
+        self._path: str = path
+        self._headers: Dict[str, str] = headers
+
+    @property
+    def path(self) -> str:
+        """
+        Property for the request path of the opening handshake
+
+        Returns:
+            Path including any query string
+        """
+        return self._path
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        Property for the headers of the opening handshake
+
+        Returns:
+            Dictionary of headers with lower case names
+        """
+        return self._headers
+
+    def send(self, message: Message) -> None:
+        """
+        Method to send a message to the client
+
+        Args:
+            message: Text, or a dictionary or list sent as JSON
+        """
+        frame = encode_frame(OP_TEXT, _dump(message).encode("utf-8"), False)
+        with self._send_lock:
+            self._sock.sendall(frame)
+
+    def close(self) -> None:
+        """
+        Method to send a close frame and drop the connection
+        """
+        try:
+            with self._send_lock:
+                self._sock.sendall(encode_frame(OP_CLOSE, b"\x03\xe8", False))
+        except OSError:
+            pass
+        self.drop()
+
+    def drop(self) -> None:
+        """
+        Method to drop the connection without a closing handshake, as
+        a network failure would
+        """
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _recv(self) -> Optional[str]:
+        fragments = []
+        while True:
+            try:
+                fin, opcode, payload = read_frame(self._reader)
+            except (OSError, ValueError, WebSocketClosed):
+                return None
+            if opcode == OP_PING:
+                with self._send_lock:
+                    self._sock.sendall(encode_frame(OP_PONG, payload, False))
+                continue
+            if opcode == OP_CLOSE:
+                self.close()
+                return None
+            if opcode == OP_PONG:
+                continue
+            fragments.append(payload)
+            if fin:
+                return b"".join(fragments).decode("utf-8")
+
+
+class LocalWebSocketServer:
+    """
+    Class for a local stand-in for Gemini's WebSocket endpoints, used to
+    test the streaming clients without network access.
+
+    Every message received from a client is put on the received queue
+    and passed to the optional handler, which can reply through the
+    connection it is given.
+
+    Example:
+        with LocalWebSocketServer(handler=reply) as server:
+            client = MarketDataClient(["BTCUSD"], url=server.url)
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[ServerConnection, str], None]] = None,
+        on_connect: Optional[Callable[[ServerConnection], None]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Initialise LocalWebSocketServer
+
+        Args:
+            handler: Callable invoked with each message from a client
+            on_connect: Callable invoked after each opening handshake
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free port
+        """
+        self.handler = handler
+        self.on_connect = on_connect
+        self.received: queue.Queue[Tuple[ServerConnection, str]] = (
+            queue.Queue()
+        )
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((host, port))
+        self._connections: List[ServerConnection] = []
+        self._lock = threading.Lock()
+        self._connected = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Property for the ws:// URL of the server
+
+        Returns:
+            URL
+        """
+        host, port = self._listener.getsockname()
+        return f"ws://{host}:{port}/"
+
+    @property
+    def connections(self) -> List[ServerConnection]:
+        """
+        Property for the currently open client connections
+
+        Returns:
+            List of ServerConnection objects
+        """
+        with self._lock:
+            return list(self._connections)
+
+    def start(self) -> LocalWebSocketServer:
+        """
+        Method to start accepting connections on a background thread
+
+        Returns:
+            The server itself
+        """
+        self._listener.listen()
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Method to stop the server and drop every connection
+        """
+        self._listener.close()
+        for connection in self.connections:
+            connection.drop()
+
+    def wait_for_connections(self, count: int, timeout: float = 5.0) -> bool:
+        """
+        Method to block until a number of clients are connected
+
+        Args:
+            count: Number of open connections to wait for
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the connections arrived before the timeout
+        """
+        with self._connected:
+            return self._connected.wait_for(
+                lambda: len(self._connections) >= count, timeout
+            )
+
+    def send_all(self, message: Message) -> None:
+        """
+        Method to send a message to every connected client
+
+        Args:
+            message: Text, or a dictionary or list sent as JSON
+        """
+        for connection in self.connections:
+            connection.send(message)
+
+    def drop_all(self) -> None:
+        """
+        Method to drop every client connection without a closing
+        handshake, simulating a network failure
+        """
+        for connection in self.connections:
+            connection.drop()
+
+    def __enter__(self) -> LocalWebSocketServer:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._serve, args=(sock,), daemon=True
+            ).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        reader = sock.makefile("rb")
+        try:
+            request_line, headers = read_http_head(reader)
+            key = headers["sec-websocket-key"]
+        except (OSError, KeyError, WebSocketClosed):
+            sock.close()
+            return
+
+        sock.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        path = request_line.split(" ")[1]
+        connection = ServerConnection(sock, reader, path, headers)
+        with self._connected:
+            self._connections.append(connection)
+            self._connected.notify_all()
+        if self.on_connect is not None:
+            self.on_connect(connection)
+
+        while True:
+            message = connection._recv()
+            if message is None:
+                break
+            self.received.put((connection, message))
+            if self.handler is not None:
+                self.handler(connection, message)
+
+        with self._lock:
+            self._connections.remove(connection)
+
+
+class OrderEventsStubServer(LocalWebSocketServer):
+    """
+    Class for a local stand-in for Gemini's order events WebSocket.
+
+    Connections are only kept when their X-GEMINI-SIGNATURE header is a
+    valid HMAC of the payload for the given private key. Accepted
+    clients receive a subscription acknowledgement, and push adds a
+    socket_sequence to each event before sending it to every client.
+    """
+
+    def __init__(self, private_key: str, **kwargs: Any) -> None:
+        """
+        Initialise OrderEventsStubServer
+
+        Args:
+            private_key: Private key expected to sign the handshake
+            kwargs: Arguments passed to LocalWebSocketServer
+        """
+        super().__init__(**kwargs)
+        self._private_key: str = private_key
+        self._sequence: int = 0
+        self._user_on_connect = self.on_connect
+        self.on_connect = self._acknowledge
+
+    def verify(self, headers: Dict[str, str]) -> bool:
+        """
+        Method to check the signature of an opening handshake
+
+        Args:
+            headers: Handshake headers with lower case names
+
+        Returns:
+            True if the payload is signed with the private key and was
+            made for the order events endpoint
+        """
+        payload = headers.get("x-gemini-payload", "").encode("ascii")
+        expected = hmac.new(
+            self._private_key.encode("utf-8"), payload, hashlib.sha384
+        ).hexdigest()
+        if not hmac.compare_digest(
+            expected, headers.get("x-gemini-signature", "")
+        ):
+            return False
+        decoded = json.loads(base64.b64decode(payload))
+        return decoded.get("request") == "/v1/order/events"
+
+    def push(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Method to send a list of order events to every client
+
+        Args:
+            events: Order event dictionaries
+        """
+        with self._lock:
+            for event in events:
+                event.setdefault("socket_sequence", self._sequence)
+                self._sequence += 1
+        self.send_all(events)
+
+    def heartbeat(self) -> None:
+        """
+        Method to send a heartbeat to every client
+        """
+        with self._lock:
+            sequence = self._sequence
+            self._sequence += 1
+        self.send_all(
+            {
+                "type": "heartbeat",
+                "timestampms": 0,
+                "sequence": sequence,
+                "socket_sequence": sequence,
+            }
+        )
+
+    def _acknowledge(self, connection: ServerConnection) -> None:
+        if not self.verify(connection.headers):
+            connection.close()
+            return
+        with self._lock:
+            self._sequence = 0
+        connection.send(
+            {
+                "type": "subscription_ack",
+                "accountId": 1,
+                "subscriptionId": "stub",
+                "symbolFilter": [],
+                "apiSessionFilter": [],
+                "eventTypeFilter": [],
+            }
+        )
+        if self._user_on_connect is not None:
+            self._user_on_connect(connection)
+
+
+RestHandler = Callable[[Dict[str, Any]], Any]
+
+
+class _ThreadingHTTPServer(ThreadingHTTPServer):
+    # bursts of new connections overflow the default backlog of 5, and
+    # dropped connection attempts are only retried after a second
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class LocalRestServer:
+    """
+    Class for a local stand-in for Gemini's REST API, used to exercise
+    and benchmark the clients without network access.
+
+    Handlers are registered per path and receive a dictionary with the
+    method, path, query, headers and the decoded X-GEMINI-PAYLOAD of the
+    request. They return the JSON body, or a (status, body) tuple.
+    Latency can be injected with a fixed delay or a callable returning
+    the delay of each request in seconds, and bandwidth with a limit on
+    the bytes sent per second. Bodies are compressed with the first of
+    the server's encodings the request accepts. Connections are kept
+    alive like Gemini's, so connection reuse can be measured.
+
+    Example:
+        with LocalRestServer({"/v1/orders": lambda request: []}) as server:
+            auth = Authentication("key", "secret", url=server.url)
+            Order.get_active_orders(auth)
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, RestHandler]] = None,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        compression: Sequence[str] = (),
+        bandwidth: Optional[float] = None,
+    ) -> None:
+        """
+        Initialise LocalRestServer
+
+        Args:
+            routes: Handlers keyed by path without query string
+            latency: Delay in seconds, or a callable returning it, added
+                before every response
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free port
+            compression: Content encodings the server may use in order
+                of preference, e.g. ["br", "gzip"]
+            bandwidth: Bytes sent per second, None sends at once
+        """
+        self.routes: Dict[str, RestHandler] = dict(routes or {})
+        self.latency = latency
+        self.compression: List[str] = list(compression)
+        self.bandwidth = bandwidth
+        self.requests: List[Dict[str, Any]] = []
+        self.connections: int = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Property for the http:// base URL of the server
+
+        Returns:
+            URL
+        """
+        host, port = self._server.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, path: str, handler: RestHandler) -> None:
+        """
+        Method to register the handler of a path
+
+        Args:
+            path: Request path without query string, e.g. "/v1/orders"
+            handler: Callable returning the body or (status, body)
+        """
+        self.routes[path] = handler
+
+    def start(self) -> LocalRestServer:
+        """
+        Method to start serving on a background thread
+
+        Returns:
+            The server itself
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Method to stop the server
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> LocalRestServer:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _respond(self, request: Dict[str, Any]) -> Tuple[int, Any]:
+        with self._lock:
+            self.requests.append(request)
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        handler = self.routes.get(request["path"])
+        if handler is None:
+            return 404, {"result": "error", "reason": "EndpointNotFound"}
+        result = handler(request)
+        if isinstance(result, tuple):
+            return result
+        return 200, result
+
+    def _encoding(self, accept: str) -> Optional[str]:
+        accepted = {
+            part.split(";")[0].strip().lower() for part in accept.split(",")
+        }
+        for encoding in self.compression:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                self.connection.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _handle(self) -> None:
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                payload = self.headers.get("X-GEMINI-PAYLOAD")
+                status, body = server._respond(
+                    {
+                        "method": self.command,
+                        "path": parts.path,
+                        "query": dict(parse_qsl(parts.query)),
+                        "headers": dict(self.headers),
+                        "payload": (
+                            json.loads(base64.b64decode(payload))
+                            if payload
+                            else None
+                        ),
+                    }
+                )
+                data = body if isinstance(body, bytes) else _dump(body)
+                encoded = data if isinstance(data, bytes) else data.encode()
+                encoding = server._encoding(
+                    self.headers.get("Accept-Encoding", "")
+                )
+                if encoding is not None:
+                    encoded = compress(encoded, encoding)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if encoding is not None:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                if server.bandwidth:
+                    time.sleep(len(encoded) / server.bandwidth)
+                self.wfile.write(encoded)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        return Handler
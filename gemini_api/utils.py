@@ -1,5 +1,20 @@
 import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
 
 
 def date_to_unix_ts(date: str) -> int:
@@ -7,3 +22,93 @@ def date_to_unix_ts(date: str) -> int:
     unix_ts = int(time.mktime(timestamp_obj))
 
     return unix_ts
+
+
+def run_concurrently(
+    calls: Sequence[Callable[[], T]], max_workers: int, fail_fast: bool = False
+) -> List[Tuple[Optional[T], Optional[BaseException]]]:
+    """
+    Runs calls on a thread pool, started in input order, and collects
+    their results in input order
+
+    Args:
+        calls: Callables taking no arguments
+        max_workers: Maximum number of calls running at once
+        fail_fast: Do not start further calls after the first failure,
+            their result holds a CancelledError
+
+    Returns:
+        List of (result, error) tuples, with error None on success
+    """
+    results: List[Tuple[Optional[T], Optional[BaseException]]] = [
+        (None, CancelledError()) for _ in calls
+    ]
+    if not calls:
+        return results
+
+    workers = max(1, min(max_workers, len(calls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(call): i for i, call in enumerate(calls)}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                results[futures[future]] = (future.result(), None)
+                continue
+            results[futures[future]] = (None, error)
+            if fail_fast:
+                for pending in futures:
+                    pending.cancel()
+
+    return results
+
+
+def is_raw(auth: Any, raw: Optional[bool]) -> bool:
+    """
+    Resolves whether an endpoint call returns the decoded response
+    instead of building objects from it
+
+    Args:
+        auth: Authentication or KeyPool the call is made with
+        raw: Flag passed to the call, None defers to auth.raw
+
+    Returns:
+        True if no objects should be built
+    """
+    if raw is None:
+        return auth.raw
+    return raw
+
+
+def stream_records(
+    auth: Any,
+    endpoint: str,
+    payload: Dict[str, Any],
+    model: Callable[[Any, Dict[str, Any]], T],
+    raw: Optional[bool],
+    fields: Optional[Sequence[str]] = None,
+    lazy: bool = False,
+) -> Iterator[Any]:
+    """
+    Streams the records of a list-returning endpoint, building objects
+    from them as they arrive
+
+    Args:
+        auth: Authentication or KeyPool the call is made with
+        endpoint: Endpoint path e.g. "/v1/transfers"
+        payload: Data to pass into encoded payload
+        model: Class built from each record, e.g. Order
+        raw: Flag passed to the call, None defers to auth.raw
+        fields: Projection passed to the call, must be None
+        lazy: Lazy flag passed to the call, must be False
+
+    Returns:
+        Iterator of objects, or of records in raw mode
+    """
+    if fields is not None or lazy:
+        raise ValueError("stream cannot be combined with fields or lazy")
+    records = auth.stream_request(endpoint, payload)
+    if is_raw(auth, raw):
+        return records
+    return map(partial(model, auth), records)
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+
+from gemini_api.instrumentation import Instrumentation, get_instrumentation
+
+logger = logging.getLogger(__name__)
+
+PING_PATH = "/v1/pubticker/btcusd"
+
+# socket and opening time of each connection a warm-up request used
+_opened_at: WeakKeyDictionary[Any, Tuple[int, float]] = WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+class PoolStats(NamedTuple):
+    """
+    State of the connection pool of a session for one host after a
+    warm-up round
+
+    Attributes:
+        idle: Number of open connections the round left in the pool
+        opened: Number of connections the pool has created, not
+            counting connections opened again
+        ages: Seconds each of those connections has been open, oldest
+            first
+    """
+
+    idle: int
+    opened: int
+    ages: Tuple[float, ...]
+
+    @property
+    def max_age(self) -> float:
+        """
+        Property for the age of the oldest idle connection
+
+        Returns:
+            Seconds, 0.0 if no connection is idle
+        """
+        return self.ages[0] if self.ages else 0.0
+
+
+def connection_pool(session: requests.Session, url: str) -> HTTPConnectionPool:
+    """
+    Gets the urllib3 connection pool a session sends requests to a URL
+    through
+
+    Args:
+        session: HTTP session
+        url: URL on the host, e.g. "https://api.gemini.com/v1/symbols"
+
+    Returns:
+        HTTPConnectionPool of the host
+
+    Raises:
+        TypeError: The session sends requests to the URL through an
+            adapter other than an HTTPAdapter
+    """
+    adapter = session.get_adapter(url)
+    if not isinstance(adapter, HTTPAdapter):
+        raise TypeError(f"No HTTPAdapter is mounted for {url}")
+    # the settings requests sends with, so the pool key matches
+    settings = session.merge_environment_settings(
+        url, {}, None, session.verify, session.cert
+    )
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        request = requests.Request("GET", url).prepare()
+        return adapter.get_connection_with_tls_context(
+            request,
+            settings["verify"],
+            settings["proxies"],
+            settings["cert"],
+        )
+    return adapter.get_connection(url, settings["proxies"])
+
+
+def warm_up(
+    session: requests.Session,
+    url: str,
+    connections: int = 4,
+    timeout: Optional[float] = None,
+    instrumentation: Optional[Instrumentation] = None,
+) -> int:
+    """
+    Resolves the host of a URL and sends concurrent GET requests to it,
+    so the pool of the session opens connections ahead of the first
+    requests, which then skip DNS, TCP and TLS setup
+
+    Each request holds its connection until every request has a
+    response, so they go through different connections, which are then
+    left idle in the pool. Connections already open are reused, and
+    dropped ones are opened again.
+
+    Args:
+        session: HTTP session
+        url: URL of a cheap GET endpoint on the host, e.g.
+            "https://api.gemini.com/v1/pubticker/btcusd"
+        connections: Connections to have open, at most the pool size
+        timeout: Seconds to wait for each request, None waits forever
+        instrumentation: Instrumentation receiving the pool gauges,
+            defaults to the shared one
+
+    Returns:
+        Number of open connections left in the pool
+    """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    instrumentation = instrumentation or get_instrumentation()
+    return _round(session, url, connections, timeout, instrumentation).idle
+
+
+class KeepWarm:
+    """
+    Class keeping pooled connections to a host open from a background
+    thread.
+
+    Servers and load balancers close connections left idle, so the
+    first request after a quiet period pays for a new connection.
+    Every interval a round of concurrent GET requests to the ping URL
+    goes through the idle connections, and opens dropped ones again up
+    to the target number. Pool gauges are updated on every round, and
+    "pool.<host>.pings", ".connects" and ".failures" counted.
+
+    Connections are held by the round until every request of it has a
+    response, so requests sent meanwhile may open extra connections.
+
+    Example:
+        keeper = auth.keep_warm(interval=30.0)
+        ...
+        keeper.stop()
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        connections: int = 4,
+        interval: float = 30.0,
+        timeout: Optional[float] = 5.0,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        Initialise KeepWarm
+
+        Args:
+            session: HTTP session whose pool is kept warm
+            url: URL of a cheap GET endpoint on the host, e.g.
+                "https://api.gemini.com/v1/pubticker/btcusd"
+            connections: Connections to keep open, at most the pool size
+            interval: Seconds between rounds, below the idle timeout of
+                the server
+            timeout: Seconds to wait for each ping or connection
+            instrumentation: Instrumentation receiving the pool gauges
+                and ping counters, defaults to the shared one
+        """
+        self._session: requests.Session = session
+        self._url: str = url
+        self._connections: int = connections
+        self._interval: float = interval
+        self._timeout: Optional[float] = timeout
+        self._instrumentation: Instrumentation = (
+            instrumentation or get_instrumentation()
+        )
+        self._rounds: int = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def rounds(self) -> int:
+        """
+        Property for the number of rounds completed
+
+        Returns:
+            Number of rounds
+        """
+        return self._rounds
+
+    def start(self) -> KeepWarm:
+        """
+        Method to start the background thread
+
+        Returns:
+            The keeper itself
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method to stop the background thread
+
+        Args:
+            timeout: Seconds to wait for the thread to finish
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def warm(self) -> PoolStats:
+        """
+        Method to send a round of requests through the idle connections
+        and open dropped ones right away
+
+        Returns:
+            PoolStats after the round
+        """
+        stats = _round(
+            self._session,
+            self._url,
+            self._connections,
+            self._timeout,
+            self._instrumentation,
+        )
+        self._rounds += 1
+        return stats
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            try:
+                self.warm()
+            except Exception:
+                logger.exception("Keeping connections to %s failed", self._url)
+
+
+def _is_open(conn: Any) -> bool:
+    return conn is not None and getattr(conn, "sock", None) is not None
+
+
+def _round(
+    session: requests.Session,
+    url: str,
+    connections: int,
+    timeout: Optional[float],
+    instrumentation: Instrumentation,
+) -> PoolStats:
+    count = max(connections, 1)
+    barrier = threading.Barrier(count)
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        outcomes = list(
+            executor.map(
+                lambda _: _ping(session, url, timeout, barrier), range(count)
+            )
+        )
+    prefix = "pool." + urlsplit(url).netloc
+    conns: List[Any] = []
+    for conn, outcome in outcomes:
+        instrumentation.increment(prefix + outcome)
+        if conn is not None:
+            conns.append(conn)
+
+    now = time.monotonic()
+    with _lock:
+        ages = [
+            now - _opened_at[conn][1]
+            for conn in set(conns)
+            if _is_open(conn) and conn in _opened_at
+        ]
+    stats = PoolStats(
+        len(ages),
+        connection_pool(session, url).num_connections,
+        tuple(sorted(ages, reverse=True)),
+    )
+    instrumentation.set_gauge(prefix + ".idle", stats.idle)
+    instrumentation.set_gauge(prefix + ".opened", stats.opened)
+    instrumentation.set_gauge(prefix + ".max_age", stats.max_age)
+    return stats
+
+
+def _ping(
+    session: requests.Session,
+    url: str,
+    timeout: Optional[float],
+    barrier: threading.Barrier,
+) -> Tuple[Any, str]:
+    try:
+        _wait(barrier, timeout)
+        response = session.get(url, timeout=timeout, stream=True)
+    except Exception:
+        logger.debug("Warming connection failed", exc_info=True)
+        barrier.abort()
+        return None, ".failures"
+    with response:
+        conn = response.raw.connection
+        sock = getattr(conn, "sock", None)
+        # keep the connection until every request has one of its own
+        _wait(barrier, timeout)
+        response.content
+    if sock is None:
+        return None, ".pings"
+    with _lock:
+        known = _opened_at.get(conn)
+        if known is not None and known[0] == id(sock):
+            return conn, ".pings"
+        # first seen, or opened again after it was dropped
+        _opened_at[conn] = (id(sock), time.monotonic())
+    return conn, ".connects"
+
+
+def _wait(barrier: threading.Barrier, timeout: Optional[float]) -> None:
+    try:
+        barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        # another request failed, carry on without it
+        pass
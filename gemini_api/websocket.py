@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import threading
+from typing import BinaryIO, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_ACCEPT_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketError(Exception):
+    """
+    Raised when a WebSocket handshake or frame is invalid
+    """
+
+
+class WebSocketClosed(WebSocketError):
+    """
+    Raised when the WebSocket connection has been closed
+    """
+
+
+def accept_key(key: str) -> str:
+    """
+    Computes the Sec-WebSocket-Accept value for a handshake key
+
+    Args:
+        key: Sec-WebSocket-Key sent by the client
+
+    Returns:
+        Expected Sec-WebSocket-Accept header value
+    """
+    digest = hashlib.sha1(key.encode("ascii") + _ACCEPT_GUID).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    length = len(payload)
+    if not length:
+        return payload
+    mask = (key * (length // 4 + 1))[:length]
+    masked = int.from_bytes(payload, "big") ^ int.from_bytes(mask, "big")
+    return masked.to_bytes(length, "big")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    """
+    Encodes a single final WebSocket frame
+
+    Args:
+        opcode: Frame opcode
+        payload: Frame payload
+        mask: True for client to server frames, which must be masked
+
+    Returns:
+        Encoded frame
+    """
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+def _read_exact(reader: BinaryIO, size: int) -> bytes:
+    data = reader.read(size)
+    if data is None or len(data) < size:
+        raise WebSocketClosed("Connection closed by peer")
+    return data
+
+
+def read_frame(reader: BinaryIO) -> Tuple[bool, int, bytes]:
+    """
+    Reads a single WebSocket frame
+
+    Args:
+        reader: Buffered binary file wrapping the socket
+
+    Returns:
+        Tuple of (final fragment flag, opcode, unmasked payload)
+    """
+    first, second = _read_exact(reader, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", _read_exact(reader, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", _read_exact(reader, 8))[0]
+    key = _read_exact(reader, 4) if second & 0x80 else None
+    payload = _read_exact(reader, length)
+    if key is not None:
+        payload = _apply_mask(payload, key)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+def read_http_head(reader: BinaryIO) -> Tuple[str, Dict[str, str]]:
+    """
+    Reads the start line and headers of an HTTP/1.1 message
+
+    Args:
+        reader: Buffered binary file wrapping the socket
+
+    Returns:
+        Tuple of (start line, headers with lower case names)
+    """
+    start_line = reader.readline().decode("latin-1").strip()
+    if not start_line:
+        raise WebSocketClosed("Connection closed during handshake")
+    headers = {}
+    while True:
+        line = reader.readline().decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return start_line, headers
+
+
+class WebSocket:
+    """
+    Class for a minimal blocking WebSocket client connection.
+
+    Implements the parts of RFC 6455 needed by Gemini's WebSocket APIs:
+    text messages, fragmentation, ping/pong and the closing handshake.
+    Reads are expected to happen on a single thread while sends may
+    come from any thread.
+    """
+
+    __slots__ = [
+        "_url",
+        "_headers",
+        "_timeout",
+        "_sock",
+        "_reader",
+        "_send_lock",
+    ]
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Initialise WebSocket
+
+        Args:
+            url: ws:// or wss:// URL to connect to
+            headers: Extra headers to send with the opening handshake
+            timeout: Timeout in seconds for connecting and handshaking
+        """
+        self._url: str = url
+        self._headers: Dict[str, str] = headers or {}
+        self._timeout: float = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[BinaryIO] = None
+        self._send_lock: threading.Lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """
+        Property for the URL of the connection
+
+        Returns:
+            URL
+        """
+        return self._url
+
+    @property
+    def connected(self) -> bool:
+        """
+        Property for the connection status
+
+        Returns:
+            True if the opening handshake completed and the connection
+            has not been closed
+        """
+        return self._sock is not None
+
+    def connect(self) -> None:
+        """
+        Method to open the connection and perform the opening handshake
+        """
+        parts = urlsplit(self._url)
+        secure = parts.scheme == "wss"
+        if parts.scheme not in ("ws", "wss") or not parts.hostname:
+            raise WebSocketError(f"Invalid WebSocket URL: {self._url}")
+        host = parts.hostname
+        port = parts.port or (443 if secure else 80)
+
+        sock = socket.create_connection((host, port), timeout=self._timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if secure:
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=host)
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {parts.netloc}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+        ]
+        lines.extend(
+            f"{name}: {value}" for name, value in self._headers.items()
+        )
+
+        try:
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            reader = sock.makefile("rb")
+            status, headers = read_http_head(reader)
+            if status.split(" ")[1:2] != ["101"]:
+                raise WebSocketError(f"WebSocket handshake failed: {status}")
+            if headers.get("sec-websocket-accept") != accept_key(key):
+                raise WebSocketError("Invalid Sec-WebSocket-Accept header")
+        except BaseException:
+            sock.close()
+            raise
+
+        sock.settimeout(None)
+        self._sock = sock
+        self._reader = reader
+
+    def send(self, message: str) -> None:
+        """
+        Method to send a text message
+
+        Args:
+            message: Text to send
+        """
+        self._send_frame(OP_TEXT, message.encode("utf-8"))
+
+    def ping(self, payload: bytes = b"") -> None:
+        """
+        Method to send a ping frame
+
+        Args:
+            payload: Application data echoed back in the pong
+        """
+        self._send_frame(OP_PING, payload)
+
+    def recv(self) -> str:
+        """
+        Method to block until the next text message arrives, answering
+        pings and close frames along the way
+
+        Returns:
+            Text of the message
+        """
+        reader = self._reader
+        if reader is None:
+            raise WebSocketClosed("WebSocket is not connected")
+        fragments = []
+        while True:
+            try:
+                fin, opcode, payload = read_frame(reader)
+            except (OSError, ValueError) as exc:
+                self._drop()
+                raise WebSocketClosed(str(exc)) from exc
+            except WebSocketClosed:
+                self._drop()
+                raise
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                code = struct.unpack("!H", payload[:2])[0] if payload else 0
+                self.close(code or 1000)
+                raise WebSocketClosed(f"Connection closed with code {code}")
+            fragments.append(payload)
+            if fin:
+                return b"".join(fragments).decode("utf-8")
+
+    def close(self, code: int = 1000) -> None:
+        """
+        Method to send a close frame and release the socket
+
+        Args:
+            code: WebSocket close status code
+        """
+        if self._sock is None:
+            return
+        try:
+            self._send_frame(OP_CLOSE, struct.pack("!H", code))
+        except (OSError, WebSocketError):
+            pass
+        self._drop()
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        sock = self._sock
+        if sock is None:
+            raise WebSocketClosed("WebSocket is not connected")
+        frame = encode_frame(opcode, payload, mask=True)
+        try:
+            with self._send_lock:
+                sock.sendall(frame)
+        except OSError as exc:
+            self._drop()
+            raise WebSocketClosed(str(exc)) from exc
+
+    def _drop(self) -> None:
+        sock, self._sock = self._sock, None
+        self._reader = None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
@@ -0,0 +1,54 @@
+from typing import Any, Dict
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+from gemini_api.key_pool import KeyPool
+from gemini_api.testing import LocalRestServer
+
+
+def order(request: Dict[str, Any]) -> Dict[str, Any]:
+    payload = request["payload"]
+    return {
+        "order_id": payload.get("order_id", payload.get("price")),
+        "symbol": "btcusd",
+        "is_live": request["path"] == "/v1/order/new",
+        "is_cancelled": request["path"] == "/v1/order/cancel",
+        "timestampms": 0,
+    }
+
+
+def test_places_and_cancels_orders_through_key_pool() -> None:
+    routes = {"/v1/order/new": order, "/v1/order/cancel": order}
+    with LocalRestServer(routes) as server:
+        trading = Authentication("trading", "secret", url=server.url)
+        reporting = Authentication("reporting", "secret", url=server.url)
+        pool = KeyPool([reporting], order_auth=trading)
+
+        placed = Order.place_orders(
+            pool,
+            [
+                {
+                    "symbol": "btcusd",
+                    "amount": "1",
+                    "price": str(price),
+                    "side": "buy",
+                }
+                for price in (100, 101, 102)
+            ],
+        )
+        cancelled = Order.cancel_orders(pool, order_ids=["1", "2"])
+
+    assert [result.error for result in placed] == [None] * 3
+    assert [result.order.order_id for result in placed] == [
+        "100",
+        "101",
+        "102",
+    ]
+    assert {key: result.error for key, result in cancelled.items()} == {
+        "1": None,
+        "2": None,
+    }
+    keys = {
+        request["headers"]["X-GEMINI-APIKEY"] for request in server.requests
+    }
+    assert keys == {"trading"}
@@ -0,0 +1,159 @@
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from gemini_api.endpoints.public import Public
+from gemini_api.market_data import MarketDataClient
+from gemini_api.testing import (
+    LocalRestServer,
+    LocalWebSocketServer,
+    ServerConnection,
+)
+
+SNAPSHOT = {
+    "bids": [{"price": "99", "amount": "5", "timestamp": "0"}],
+    "asks": [{"price": "101", "amount": "5", "timestamp": "0"}],
+}
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def full_book(connection: ServerConnection, message: str) -> None:
+    connection.send(
+        {
+            "type": "l2_updates",
+            "symbol": "BTCUSD",
+            "socket_sequence": 0,
+            "changes": [["buy", "100", "1"], ["sell", "102", "2"]],
+            "trades": [],
+        }
+    )
+
+
+def delta(sequence: int, changes: List[List[str]]) -> Dict[str, Any]:
+    return {
+        "type": "l2_updates",
+        "symbol": "BTCUSD",
+        "socket_sequence": sequence,
+        "changes": changes,
+    }
+
+
+def levels(client: MarketDataClient) -> Dict[str, Any]:
+    book = client.book("BTCUSD")
+    return {"bids": book.bids.levels(), "asks": book.asks.levels()}
+
+
+def test_applies_full_book_and_deltas() -> None:
+    with LocalWebSocketServer(handler=full_book) as server:
+        client = MarketDataClient(["BTCUSD"], url=server.url)
+        client.start()
+        try:
+            wait_until(lambda: "BTCUSD" in client.books)
+            server.send_all(
+                delta(1, [["buy", "100", "0"], ["buy", "98", "3"]])
+            )
+            wait_until(
+                lambda: levels(client)["bids"] == [(Decimal(98), Decimal(3))]
+            )
+            assert levels(client)["asks"] == [(Decimal(102), Decimal(2))]
+        finally:
+            client.stop(timeout=5)
+
+
+def test_book_returns_copy() -> None:
+    with LocalWebSocketServer(handler=full_book) as server:
+        client = MarketDataClient(["BTCUSD"], url=server.url)
+        client.start()
+        try:
+            wait_until(lambda: "BTCUSD" in client.books)
+            book = client.book("BTCUSD")
+            server.send_all(delta(1, [["buy", "100", "0"]]))
+            wait_until(lambda: client.book("BTCUSD").best_bid is None)
+            assert book.best_bid == Decimal(100)
+        finally:
+            client.stop(timeout=5)
+
+
+def test_gap_resyncs_and_replays_deltas_onto_snapshot() -> None:
+    requested = threading.Event()
+    release = threading.Event()
+
+    def snapshot(request: Dict[str, Any]) -> Dict[str, Any]:
+        requested.set()
+        release.wait(5)
+        return SNAPSHOT
+
+    with LocalRestServer({"/v1/book/btcusd": snapshot}) as rest:
+        with LocalWebSocketServer(handler=full_book) as server:
+            client = MarketDataClient(
+                ["BTCUSD"],
+                url=server.url,
+                public=Public(url=rest.url + "/v1"),
+            )
+            client.start()
+            try:
+                wait_until(lambda: "BTCUSD" in client.books)
+                # socket_sequence jumps from 0 to 5
+                server.send_all(delta(5, [["buy", "100", "7"]]))
+                assert requested.wait(5)
+                # may be newer than the snapshot, so kept for replay
+                server.send_all(delta(6, [["sell", "101", "9"]]))
+                time.sleep(0.1)
+                assert client.resyncs == 0
+                release.set()
+                wait_until(lambda: client.resyncs == 1)
+                assert levels(client) == {
+                    "bids": [
+                        (Decimal(100), Decimal(7)),
+                        (Decimal(99), Decimal(5)),
+                    ],
+                    "asks": [(Decimal(101), Decimal(9))],
+                }
+                server.send_all(delta(7, [["buy", "100", "0"]]))
+                wait_until(
+                    lambda: levels(client)["bids"]
+                    == [(Decimal(99), Decimal(5))]
+                )
+                assert client.resyncs == 1
+            finally:
+                client.stop(timeout=5)
+
+
+def test_messages_without_socket_sequence_never_resync() -> None:
+    def unsequenced(connection: ServerConnection, message: str) -> None:
+        connection.send(
+            {
+                "type": "l2_updates",
+                "symbol": "BTCUSD",
+                "changes": [["buy", "100", "1"]],
+                "trades": [],
+            }
+        )
+
+    with LocalRestServer({}) as rest:
+        with LocalWebSocketServer(handler=unsequenced) as server:
+            client = MarketDataClient(
+                ["BTCUSD"],
+                url=server.url,
+                public=Public(url=rest.url + "/v1"),
+            )
+            client.start()
+            try:
+                wait_until(lambda: "BTCUSD" in client.books)
+                update = delta(0, [["buy", "98", "2"]])
+                del update["socket_sequence"]
+                server.send_all(update)
+                server.send_all({"type": "heartbeat", "timestamp": 0})
+                wait_until(lambda: len(levels(client)["bids"]) == 2)
+                time.sleep(0.1)
+                assert client.resyncs == 0
+                assert rest.requests == []
+            finally:
+                client.stop(timeout=5)
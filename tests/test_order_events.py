@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from gemini_api.authentication import Authentication
+from gemini_api.order_events import OrderEventsClient
+from gemini_api.testing import (
+    LocalRestServer,
+    OrderEventsStubServer,
+    ServerConnection,
+)
+
+SECRET = "secret"
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def event(kind: str, order_id: str, **fields: Any) -> Dict[str, Any]:
+    data = {"type": kind, "order_id": order_id, "symbol": "btcusd"}
+    data.update(fields)
+    return data
+
+
+def active(order_ids: List[str]) -> Callable[[Dict[str, Any]], Any]:
+    def orders(request: Dict[str, Any]) -> Any:
+        return [
+            {"order_id": order_id, "symbol": "btcusd", "is_live": True}
+            for order_id in order_ids
+        ]
+
+    return orders
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, str, bool]] = []
+        self.connects = 0
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        self.events.append(
+            (event["type"], event["order_id"], "reconciled" in event)
+        )
+
+    def on_connect(self, connection: ServerConnection) -> None:
+        self.connects += 1
+
+
+def client_for(
+    rest: LocalRestServer, server: OrderEventsStubServer, **kwargs: Any
+) -> OrderEventsClient:
+    auth = Authentication("key", SECRET, url=rest.url)
+    return OrderEventsClient(
+        auth, url=server.url, reconnect_delay=0.05, **kwargs
+    )
+
+
+def test_reconnect_reconciles_and_suppresses_initial_events() -> None:
+    recorder = Recorder()
+    with LocalRestServer({"/v1/orders": active(["2"])}) as rest:
+        with OrderEventsStubServer(
+            SECRET, on_connect=recorder.on_connect
+        ) as server:
+            client = client_for(rest, server, on_event=recorder.on_event)
+            client.start()
+            try:
+                wait_until(lambda: recorder.connects == 1)
+                server.push([event("initial", "1")])
+                wait_until(lambda: len(recorder.events) == 1)
+
+                server.drop_all()
+                wait_until(lambda: recorder.connects == 2)
+                wait_until(lambda: len(recorder.events) == 3)
+                # sent by the server for the order reconcile reported
+                server.push([event("initial", "2")])
+                server.push([event("booked", "2")])
+                wait_until(lambda: len(recorder.events) == 4)
+            finally:
+                client.stop(timeout=5)
+
+    assert recorder.events == [
+        ("initial", "1", False),
+        ("closed", "1", True),
+        ("initial", "2", True),
+        ("booked", "2", False),
+    ]
+    assert list(client.open_orders) == ["2"]
+
+
+def test_gap_reconciles_without_blocking_events() -> None:
+    recorder = Recorder()
+    requested = threading.Event()
+    release = threading.Event()
+
+    def orders(request: Dict[str, Any]) -> Any:
+        requested.set()
+        release.wait(5)
+        return [{"order_id": "3", "symbol": "btcusd", "is_live": True}]
+
+    with LocalRestServer({"/v1/orders": orders}) as rest:
+        with OrderEventsStubServer(
+            SECRET, on_connect=recorder.on_connect
+        ) as server:
+            client = client_for(rest, server, on_event=recorder.on_event)
+            client.start()
+            try:
+                wait_until(lambda: recorder.connects == 1)
+                server.push([event("booked", "1", socket_sequence=0)])
+                # socket_sequence jumps from 0 to 5
+                server.push([event("booked", "2", socket_sequence=5)])
+                assert requested.wait(5)
+                server.push([event("closed", "2", socket_sequence=6)])
+                wait_until(lambda: len(recorder.events) == 3)
+                release.set()
+                wait_until(lambda: len(recorder.events) == 5)
+            finally:
+                client.stop(timeout=5)
+
+    assert recorder.events == [
+        ("booked", "1", False),
+        ("booked", "2", False),
+        ("closed", "2", False),
+        ("closed", "1", True),
+        ("initial", "3", True),
+    ]
+
+
+def test_max_queued_drops_oldest_events() -> None:
+    recorder = Recorder()
+    with LocalRestServer({}) as rest:
+        with OrderEventsStubServer(
+            SECRET, on_connect=recorder.on_connect
+        ) as server:
+            client = client_for(rest, server, max_queued=2)
+            client.start()
+            try:
+                wait_until(lambda: recorder.connects == 1)
+                server.push([event("booked", str(i)) for i in range(4)])
+                wait_until(lambda: len(client.open_orders) == 4)
+                assert client.get(timeout=1)["order_id"] == "2"
+                assert client.get(timeout=1)["order_id"] == "3"
+                with pytest.raises(queue.Empty):
+                    client.get(timeout=0.1)
+            finally:
+                client.stop(timeout=5)
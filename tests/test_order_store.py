@@ -0,0 +1,63 @@
+import time
+from typing import Any, Dict
+
+from gemini_api.order_store import OrderStore
+
+
+def order(order_id: str, **fields: Any) -> Dict[str, Any]:
+    data = {
+        "order_id": order_id,
+        "symbol": "btcusd",
+        "side": "buy",
+        "is_live": True,
+        "is_cancelled": False,
+        "remaining_amount": "1",
+        "timestampms": 1000,
+    }
+    data.update(fields)
+    return data
+
+
+def test_cancelled_order_is_not_made_live_by_older_response() -> None:
+    store = OrderStore()
+    store.update(order("1"))
+    store.update(order("1", is_live=False, is_cancelled=True))
+    # e.g. an order status response sent before the cancel
+    store.update(order("1"))
+    assert store.open_orders() == []
+    assert store.get("1").is_cancelled
+
+
+def test_filled_order_is_not_made_live_by_older_response() -> None:
+    store = OrderStore()
+    store.update(order("1", is_live=False, remaining_amount="0"))
+    store.update(order("1"))
+    assert store.open_orders() == []
+
+
+def test_response_with_earlier_timestampms_is_ignored() -> None:
+    store = OrderStore()
+    store.update(order("1", remaining_amount="0.5", timestampms=2000))
+    store.update(order("1", remaining_amount="1", timestampms=1000))
+    assert store.get("1").remaining_amount == "0.5"
+
+
+def test_replace_active_keeps_orders_placed_during_request() -> None:
+    store = OrderStore()
+    store.update(order("1"), ["primary"])
+    requested_at = time.monotonic()
+    store.update(order("2"), ["primary"])
+    # the list was produced before order 2 was placed
+    store.replace_active([], ["primary"], requested_at)
+    assert [o.order_id for o in store.open_orders()] == ["2"]
+
+
+def test_replace_active_keeps_orders_updated_during_request() -> None:
+    store = OrderStore()
+    store.update(order("1", remaining_amount="1"), ["primary"])
+    requested_at = time.monotonic()
+    store.update(order("1", is_live=False, remaining_amount="0.5"))
+    # the list still holds the order as it was before the update
+    store.replace_active([order("1")], ["primary"], requested_at)
+    assert store.open_orders() == []
+    assert store.get("1").remaining_amount == "0.5"
@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.order import Order
+from gemini_api.rate_limit import RateLimiter
+from gemini_api.testing import LocalRestServer
+
+
+def test_nonces_arrive_in_increasing_order() -> None:
+    nonces: List[int] = []
+    lock = threading.Lock()
+
+    def new_order(request: Dict[str, Any]) -> Any:
+        nonce = int(request["payload"]["nonce"])
+        with lock:
+            if nonces and nonce <= nonces[-1]:
+                return 400, {"result": "error", "reason": "InvalidNonce"}
+            nonces.append(nonce)
+        time.sleep(0.01)
+        return {"order_id": str(nonce), "is_live": True}
+
+    with LocalRestServer({"/v1/order/new": new_order}) as server:
+        auth = Authentication(
+            "key",
+            "secret",
+            url=server.url,
+            rate_limiter=RateLimiter(rate=1000, burst=100),
+            millisecond_nonce=True,
+        )
+        results = Order.place_orders(
+            auth,
+            [
+                {
+                    "symbol": "btcusd",
+                    "amount": "1",
+                    "price": "1",
+                    "side": "buy",
+                }
+                for _ in range(20)
+            ],
+            max_workers=10,
+        )
+
+    assert [result.error for result in results] == [None] * 20
+    assert len(server.requests) == 20
+    assert nonces == sorted(nonces)
@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import List
+
+from gemini_api.rate_limit import AdaptiveLimiter
+from gemini_api.scheduler import PRIORITY_CANCEL, PRIORITY_REPORTING
+
+
+def test_adaptive_limiter_admits_cancels_ahead_of_waiting_reports() -> None:
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_limit=1)
+    order: List[str] = []
+
+    def run(name: str, priority: int) -> None:
+        assert limiter.acquire(timeout=5, priority=priority)
+        order.append(name)
+        limiter.release()
+
+    assert limiter.acquire(priority=PRIORITY_REPORTING)
+    threads = []
+    for name, priority in [
+        ("report 1", PRIORITY_REPORTING),
+        ("cancel", PRIORITY_CANCEL),
+    ]:
+        thread = threading.Thread(target=run, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    limiter.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["cancel", "report 1"]
@@ -0,0 +1,36 @@
+import threading
+import time
+from typing import List
+
+from gemini_api.scheduler import (
+    PRIORITY_CANCEL,
+    PRIORITY_REPORTING,
+    PriorityLock,
+)
+
+
+def test_priority_lock_hands_cancels_ahead_of_waiting_reports() -> None:
+    lock = PriorityLock()
+    order: List[str] = []
+
+    def run(name: str, priority: int) -> None:
+        lock.acquire(priority)
+        order.append(name)
+        lock.release()
+
+    lock.acquire(PRIORITY_REPORTING)
+    threads = []
+    for name, priority in [
+        ("report 1", PRIORITY_REPORTING),
+        ("report 2", PRIORITY_REPORTING),
+        ("cancel", PRIORITY_CANCEL),
+    ]:
+        thread = threading.Thread(target=run, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    lock.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["cancel", "report 1", "report 2"]
@@ -0,0 +1,42 @@
+from gemini_api.authentication import Authentication
+from gemini_api.endpoints.public import Public
+from gemini_api.instrumentation import Instrumentation
+from gemini_api.testing import LocalRestServer
+from gemini_api.warm_up import KeepWarm
+
+ROUTES = {"/v1/pubticker/btcusd": lambda request: {"bid": "1"}}
+
+
+def test_warm_up_opens_connections_reused_by_requests() -> None:
+    with LocalRestServer(ROUTES) as server:
+        public = Public(url=server.url + "/v1")
+        assert public.warm_up(4) == 4
+        assert server.connections == 4
+        public.get_ticker("btcusd")
+        assert public.warm_up(4) == 4
+        assert server.connections == 4
+
+
+def test_keep_warm_reopens_dropped_connections() -> None:
+    instrumentation = Instrumentation()
+    with LocalRestServer(ROUTES) as server:
+        auth = Authentication(
+            "key", "secret", url=server.url, instrumentation=instrumentation
+        )
+        assert auth.warm_up(2) == 2
+        auth.session.close()
+        keeper = KeepWarm(
+            auth.session,
+            server.url + "/v1/pubticker/btcusd",
+            connections=2,
+            instrumentation=instrumentation,
+        )
+        stats = keeper.warm()
+        host = "pool." + server.url.split("//")[1]
+
+    assert stats.idle == 2
+    assert stats.opened == 2
+    assert len(stats.ages) == 2
+    assert server.connections == 4
+    assert instrumentation.counters()[host + ".connects"] == 4
+    assert instrumentation.gauges()[host + ".idle"] == 2